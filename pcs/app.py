@@ -1,26 +1,12 @@
 import getopt
+import importlib
 import os
 import sys
 import logging
 
 from pcs import (
-    acl,
-    alert,
-    booth,
-    client,
-    cluster,
-    config,
-    constraint,
-    host,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
+    run,
     settings,
-    status,
-    stonith,
     usage,
     utils,
 )
@@ -30,17 +16,43 @@ from pcs.cli.common import (
     completion,
     parse_args,
 )
+from pcs.lib import agent_metadata_cache
+from pcs.lib.pacemaker import cib_cache
 
 
+# Command modules are imported only when they are used. Importing all of them
+# would slow down pcs start-up for every command.
+COMMAND_MAP = {
+    "resource": ("pcs.resource", "resource_cmd"),
+    "cluster": ("pcs.cluster", "cluster_cmd"),
+    "stonith": ("pcs.stonith", "stonith_cmd"),
+    "property": ("pcs.prop", "property_cmd"),
+    "constraint": ("pcs.constraint", "constraint_cmd"),
+    "acl": ("pcs.acl", "acl_cmd"),
+    "status": ("pcs.status", "status_cmd"),
+    "config": ("pcs.config", "config_cmd"),
+    "pcsd": ("pcs.pcsd", "pcsd_cmd"),
+    "node": ("pcs.node", "node_cmd"),
+    "quorum": ("pcs.quorum", "quorum_cmd"),
+    "qdevice": ("pcs.qdevice", "qdevice_cmd"),
+    "alert": ("pcs.alert", "alert_cmd"),
+    "booth": ("pcs.booth", "booth_cmd"),
+    "host": ("pcs.host", "host_cmd"),
+    "client": ("pcs.client", "client_cmd"),
+    "batch": ("pcs.batch", "batch_cmd"),
+    "shell": ("pcs.shell", "shell_cmd"),
+}
+
+def _get_command(command):
+    module_name, function_name = COMMAND_MAP[command]
+    return getattr(importlib.import_module(module_name), function_name)
+
 logging.basicConfig()
 usefile = False
 filename = ""
 def main(argv=None):
     if completion.has_applicable_environment(os.environ):
-        print(completion.make_suggestions(
-            os.environ,
-            usage.generate_completion_tree_from_usage()
-        ))
+        run.print_completion_suggestions(os.environ)
         sys.exit()
 
     argv = argv if argv else sys.argv[1:]
@@ -48,6 +60,11 @@ def main(argv=None):
     global filename, usefile
     orig_argv = argv[:]
     utils.pcs_options = {}
+    # main may be called repeatedly in one process (pcs shell)
+    usefile = False
+    filename = ""
+    utils.usefile = usefile
+    utils.filename = filename
 
     # we want to support optional arguments for --wait, so if an argument
     # is specified with --wait (ie. --wait=30) then we use them
@@ -132,6 +149,22 @@ def main(argv=None):
                         "a positive integer"
                     ).format(a)
                 )
+        elif o == "--request-parallelism":
+            request_parallelism_valid = False
+            try:
+                parallelism = int(a)
+                if parallelism > 0:
+                    utils.pcs_options[o] = parallelism
+                    request_parallelism_valid = True
+            except ValueError:
+                pass
+            if not request_parallelism_valid:
+                utils.err(
+                    (
+                        "'{0}' is not a valid --request-parallelism value, use "
+                        "a positive integer"
+                    ).format(a)
+                )
 
     if len(argv) == 0:
         usage.main()
@@ -147,31 +180,17 @@ def main(argv=None):
     if (command == "-h" or command == "help"):
         usage.main()
         return
-    cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": acl.acl_cmd,
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": node.node_cmd,
-        "quorum": quorum.quorum_cmd,
-        "qdevice": qdevice.qdevice_cmd,
-        "alert": alert.alert_cmd,
-        "booth": booth.booth_cmd,
-        "host": host.host_cmd,
-        "client": client.client_cmd,
-    }
-    if command not in cmd_map:
+    if command not in COMMAND_MAP:
         usage.main()
         sys.exit(1)
     # root can run everything directly, also help can be displayed,
     # working on a local file also do not need to run under root
     if (os.getuid() == 0) or (argv and argv[0] == "help") or usefile:
-        cmd_map[command](
+        if not usefile:
+            cib_cache.enable()
+        if settings.agent_metadata_cache_dir:
+            agent_metadata_cache.enable(settings.agent_metadata_cache_dir)
+        _get_command(command)(
             utils.get_library_wrapper(),
             argv,
             utils.get_input_modifiers(),
@@ -232,7 +251,7 @@ def main(argv=None):
                 sys.stderr.write(std_err)
             sys.exit(exitcode)
             return
-    cmd_map[command](
+    _get_command(command)(
         utils.get_library_wrapper(),
         argv,
         utils.get_input_modifiers(),
@@ -0,0 +1,172 @@
+import json
+
+from pcs import usage, utils
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.lib.commands import (
+    acl as lib_acl,
+    alert as lib_alert,
+    fencing_topology as lib_fencing_topology,
+    resource as lib_resource,
+)
+from pcs.lib.errors import LibraryError
+
+
+def _acl_cib_version(dummy_params):
+    return lib_acl.REQUIRED_CIB_VERSION
+
+def _alert_cib_version(dummy_params):
+    return lib_alert.REQUIRED_CIB_VERSION
+
+def _bundle_cib_version(dummy_params):
+    return lib_resource.BUNDLE_REQUIRED_CIB_VERSION
+
+def _bundle_create_cib_version(params):
+    return lib_resource.get_bundle_create_required_cib_version(
+        params.get("container_type"), params.get("container_options") or {}
+    )
+
+def _bundle_update_cib_version(params):
+    return lib_resource.get_bundle_update_required_cib_version(
+        params.get("container_options")
+    )
+
+def _fencing_level_cib_version(params):
+    return lib_fencing_topology.get_add_level_required_cib_version(
+        params.get("target_type")
+    )
+
+# Commands which only modify the CIB and do not check the cluster after the CIB
+# has been pushed. Other commands cannot be run in a batch as the CIB is not
+# pushed until the whole batch finishes.
+# Upgrading the CIB means pushing it, so it cannot be done in the middle of
+# a batch. Each command is mapped to a function returning the CIB version the
+# command needs for its parameters or to None if the command does not need any
+# specific version. The CIB is upgraded before the batch starts.
+BATCH_COMMANDS = {
+    "acl.add_permission": _acl_cib_version,
+    "acl.assign_role_not_specific": _acl_cib_version,
+    "acl.assign_role_to_group": _acl_cib_version,
+    "acl.assign_role_to_target": _acl_cib_version,
+    "acl.create_group": _acl_cib_version,
+    "acl.create_role": _acl_cib_version,
+    "acl.create_target": _acl_cib_version,
+    "acl.remove_group": _acl_cib_version,
+    "acl.remove_permission": _acl_cib_version,
+    "acl.remove_role": _acl_cib_version,
+    "acl.remove_target": _acl_cib_version,
+    "acl.unassign_role_from_group": _acl_cib_version,
+    "acl.unassign_role_from_target": _acl_cib_version,
+    "acl.unassign_role_not_specific": _acl_cib_version,
+    "alert.add_recipient": _alert_cib_version,
+    "alert.create_alert": _alert_cib_version,
+    "alert.remove_alert": _alert_cib_version,
+    "alert.remove_recipient": _alert_cib_version,
+    "alert.update_alert": _alert_cib_version,
+    "alert.update_recipient": _alert_cib_version,
+    "cib_options.set_operations_defaults": None,
+    "cib_options.set_resources_defaults": None,
+    "constraint_colocation.set": None,
+    "constraint_order.set": None,
+    "constraint_ticket.add": None,
+    "constraint_ticket.remove": None,
+    "constraint_ticket.set": None,
+    "fencing_topology.add_level": _fencing_level_cib_version,
+    "fencing_topology.remove_all_levels": None,
+    "fencing_topology.remove_levels_by_params": None,
+    "resource.bundle_create": _bundle_create_cib_version,
+    "resource.bundle_update": _bundle_update_cib_version,
+    "resource.create": None,
+    "resource.create_as_clone": None,
+    "resource.create_in_group": None,
+    "resource.create_into_bundle": _bundle_cib_version,
+    "resource.disable": None,
+    "resource.enable": None,
+    "resource.manage": None,
+    "resource.unmanage": None,
+    "stonith.create": None,
+    "stonith.create_in_group": None,
+}
+
+def batch_cmd(lib, argv, modifiers):
+    """
+    Options:
+      * -f - CIB file
+      * --wait
+    """
+    try:
+        if argv and argv[0] == "help":
+            usage.batch(argv[1:])
+            return
+        modifiers.ensure_only_supported("-f", "--wait")
+        if len(argv) != 1:
+            raise CmdLineInputError()
+        command_list = load_batch_file(argv[0])
+        lib.run_batch(
+            command_list,
+            wait=modifiers.get("--wait"),
+            minimal_cib_version=get_required_cib_version(command_list),
+        )
+    except LibraryError as e:
+        utils.process_library_reports(e.args)
+    except CmdLineInputError as e:
+        utils.exit_on_cmdline_input_errror(e, "batch", "")
+
+def get_required_cib_version(command_list):
+    """
+    Return the highest CIB version needed by the commands or None
+
+    list command_list -- pairs of a command name and a dict of its parameters
+    """
+    required_version = None
+    for command, params in command_list:
+        get_version = BATCH_COMMANDS[command]
+        version = get_version(params) if get_version else None
+        if version is not None and (
+            required_version is None or version > required_version
+        ):
+            required_version = version
+    return required_version
+
+def load_batch_file(path):
+    """
+    Return a list of commands and their parameters read from a batch file
+
+    string path -- path to a JSON file with a list of commands, each command is
+        an object with a command name and a dict of its parameters, e.g.
+        {"command": "resource.create", "params": {...}}
+    """
+    try:
+        with open(path) as batch_file:
+            batch = json.load(batch_file)
+    except EnvironmentError as e:
+        raise CmdLineInputError(
+            "Unable to read file '{0}': {1}".format(path, e.strerror)
+        )
+    except ValueError as e:
+        raise CmdLineInputError(
+            "Unable to parse file '{0}': {1}".format(path, e)
+        )
+    if not isinstance(batch, list):
+        raise CmdLineInputError("The batch must be a list of commands")
+    return [_parse_batch_item(index, item) for index, item in enumerate(batch)]
+
+def _parse_batch_item(index, item):
+    if not isinstance(item, dict) or not isinstance(item.get("command"), str):
+        raise CmdLineInputError(
+            "Item {0} of the batch does not specify a command".format(index)
+        )
+    command = item["command"]
+    params = item.get("params", {})
+    if command not in BATCH_COMMANDS:
+        raise CmdLineInputError(
+            "Command '{0}' cannot be run in a batch".format(command)
+        )
+    if not isinstance(params, dict):
+        raise CmdLineInputError(
+            "Parameters of command '{0}' must be an object".format(command)
+        )
+    if "wait" in params:
+        raise CmdLineInputError(
+            "Commands in a batch cannot wait, use --wait for the whole batch"
+        )
+    return command, params
@@ -1,3 +1,28 @@
+import json
+import os
+import re
+
+
+# Placeholders in the usage which are completed by names found in the cluster
+# configuration instead of words from the usage.
+RESOURCE_ID = "<resource id>"
+NODE_NAME = "<node>"
+# Placeholders completed by names of agents with cached metadata.
+RESOURCE_AGENT = "<resource agent>"
+STONITH_AGENT = "<stonith agent>"
+DYNAMIC_KEY_LIST = (RESOURCE_ID, NODE_NAME, RESOURCE_AGENT, STONITH_AGENT)
+
+_RESOURCE_PLACEHOLDER_RE = re.compile(
+    r"resource|group id|clone id|bundle id|stonith id"
+)
+_NODE_PLACEHOLDER_LIST = ("node", "node name")
+_STONITH_AGENT_PLACEHOLDER_LIST = ("stonith agent", "stonith device type")
+_STONITH_PREFIX = "stonith:"
+_RESOURCE_ID_RE = re.compile(
+    r'<(?:primitive|group|clone|master|bundle)\b[^>]*?\sid="([^"]+)"'
+)
+_NODE_NAME_RE = re.compile(r'<node\b[^>]*?\suname="([^"]+)"')
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -14,10 +39,12 @@ def has_applicable_environment(environment):
         environment['COMP_CWORD'].isdigit()
     )
 
-def make_suggestions(environment, suggestion_tree):
+def make_suggestions(environment, suggestion_tree, get_dynamic_words=None):
     """
     dict environment - very likely os.environ
     dict suggestion_tree - {'acl': {'role': {'create': ...}}}...
+    callable get_dynamic_words - takes a key from DYNAMIC_KEY_LIST and returns
+        a list of words to complete instead of the key
     """
     if not has_applicable_environment(environment):
         raise EnvironmentError("Environment is not completion read")
@@ -33,9 +60,88 @@ def make_suggestions(environment, suggestion_tree):
     return "\n".join(_find_suggestions(
         suggestion_tree,
         typed_word_list,
-        int(environment['COMP_CWORD'])
+        int(environment['COMP_CWORD']),
+        get_dynamic_words,
     ))
 
+def get_suggestion_tree(cache_path, generate_tree):
+    """
+    Return a completion tree, generate it only if it has not been cached
+
+    string cache_path -- file to cache the tree in, None disables the cache
+    callable generate_tree -- returns a completion tree built from the usage
+    """
+    if cache_path:
+        try:
+            with open(cache_path) as cache_file:
+                return json.load(cache_file)
+        except (EnvironmentError, ValueError):
+            pass
+    suggestion_tree = generate_tree()
+    if cache_path:
+        _write_suggestion_tree(cache_path, suggestion_tree)
+    return suggestion_tree
+
+def _write_suggestion_tree(cache_path, suggestion_tree):
+    # The cache is an optimization only, completion works without it.
+    tmp_path = "{0}.{1}".format(cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), 0o700, exist_ok=True)
+        with open(tmp_path, "w") as tmp_file:
+            json.dump(suggestion_tree, tmp_file)
+        os.rename(tmp_path, cache_path)
+    except EnvironmentError:
+        try:
+            os.unlink(tmp_path)
+        except EnvironmentError:
+            pass
+
+def get_placeholder_key(placeholder):
+    """
+    Return a key from DYNAMIC_KEY_LIST matching a usage placeholder or None
+
+    string placeholder -- placeholder from the usage, e.g. "<resource id>..."
+    """
+    name = placeholder.strip("[]<>.").lower()
+    if name in _NODE_PLACEHOLDER_LIST:
+        return NODE_NAME
+    if name in _STONITH_AGENT_PLACEHOLDER_LIST:
+        return STONITH_AGENT
+    if name.startswith("standard>:"):
+        return RESOURCE_AGENT
+    if _RESOURCE_PLACEHOLDER_RE.search(name):
+        return RESOURCE_ID
+    return None
+
+def get_dynamic_words_from_cib(cib_xml):
+    """
+    Return a dict mapping keys from DYNAMIC_KEY_LIST to names found in a CIB
+
+    string cib_xml -- the CIB, regular expressions are good enough for
+        completion and much faster than parsing the whole document
+    """
+    return {
+        RESOURCE_ID: sorted(set(_RESOURCE_ID_RE.findall(cib_xml))),
+        NODE_NAME: sorted(set(_NODE_NAME_RE.findall(cib_xml))),
+    }
+
+def get_dynamic_words_from_agent_names(agent_name_list):
+    """
+    Return a dict mapping agent keys from DYNAMIC_KEY_LIST to agent names
+
+    iterable agent_name_list -- full names of resource and stonith agents
+    """
+    return {
+        RESOURCE_AGENT: sorted(
+            name for name in agent_name_list
+            if ":" in name and not name.startswith(_STONITH_PREFIX)
+        ),
+        STONITH_AGENT: sorted(
+            name[len(_STONITH_PREFIX):] for name in agent_name_list
+            if name.startswith(_STONITH_PREFIX)
+        ),
+    }
+
 def _split_words(joined_words, word_lengths):
     cursor_position = 0
     words_string_len = len(joined_words)
@@ -65,7 +171,10 @@ def _split_words(joined_words, word_lengths):
 
     return word_list
 
-def _find_suggestions(suggestion_tree, typed_word_list, word_under_cursor_idx):
+def _find_suggestions(
+    suggestion_tree, typed_word_list, word_under_cursor_idx,
+    get_dynamic_words=None
+):
     if not  1 <= word_under_cursor_idx <= len(typed_word_list):
         return []
 
@@ -77,7 +186,8 @@ def _find_suggestions(suggestion_tree, typed_word_list, word_under_cursor_idx):
 
     words_for_current_cursor_position = _get_subcommands(
         suggestion_tree,
-        typed_word_list[1:word_under_cursor_idx]
+        typed_word_list[1:word_under_cursor_idx],
+        get_dynamic_words,
     )
 
     return [
@@ -85,10 +195,27 @@ def _find_suggestions(suggestion_tree, typed_word_list, word_under_cursor_idx):
         if word.startswith(word_under_cursor)
     ]
 
-def _get_subcommands(suggestion_tree, previous_subcommand_list):
+def _get_subcommands(
+    suggestion_tree, previous_subcommand_list, get_dynamic_words=None
+):
     subcommand_tree = suggestion_tree
     for subcommand in previous_subcommand_list:
-        if subcommand not in subcommand_tree:
+        if subcommand in subcommand_tree:
+            subcommand_tree = subcommand_tree[subcommand]
+            continue
+        # the subcommand may be a name typed in place of a placeholder
+        dynamic_key_list = _get_dynamic_keys(subcommand_tree)
+        if not dynamic_key_list:
             return []
-        subcommand_tree = subcommand_tree[subcommand]
-    return sorted(list(subcommand_tree.keys()))
+        subcommand_tree = subcommand_tree[dynamic_key_list[0]]
+    word_list = [
+        word for word in subcommand_tree.keys()
+        if word not in DYNAMIC_KEY_LIST
+    ]
+    if get_dynamic_words:
+        for key in _get_dynamic_keys(subcommand_tree):
+            word_list.extend(get_dynamic_words(key))
+    return sorted(set(word_list))
+
+def _get_dynamic_keys(subcommand_tree):
+    return [key for key in DYNAMIC_KEY_LIST if key in subcommand_tree]
@@ -22,6 +22,7 @@ _type_articles = {
     "ACL permission": "an",
 }
 _file_role_translation = {
+    "AGENT_METADATA_CACHE": "agent metadata cache",
     "BOOTH_CONFIG": "Booth configuration",
     "BOOTH_KEY": "Booth key",
     "COROSYNC_AUTHKEY": "Corosync authkey",
@@ -1487,6 +1488,16 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         .format(**info)
     ,
 
+    codes.CIB_UPGRADE_IN_BATCH_NOT_POSSIBLE: lambda info:
+        (
+            "CIB needs to be upgraded to schema version {required_version} or"
+            " higher, current version is {current_version}. The CIB cannot be"
+            " upgraded in the middle of a batch, upgrade it using 'pcs cluster"
+            " cib-upgrade' and run the batch again."
+        )
+        .format(**info)
+    ,
+
     codes.FILE_ALREADY_EXISTS: lambda info:
         "{_node}{_file_role} file '{file_path}' already exists"
         .format(
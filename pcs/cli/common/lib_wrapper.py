@@ -1,37 +1,44 @@
+import inspect
 import logging
 import sys
 from collections import namedtuple
 
 from pcs.cli.common import middleware
+from pcs.cli.common.errors import CmdLineInputError
 from pcs.cli.common.reports import process_library_reports
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    stonith,
-    stonith_agent,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket
-)
+from pcs.common.tools import LazyModule
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryEnvError
 
 
-_CACHE = {}
+# Library commands are imported once they are used. Every pcs command needs
+# only a few of them, importing all of them would slow down pcs start-up.
+acl = LazyModule("pcs.lib.commands.acl")
+alert = LazyModule("pcs.lib.commands.alert")
+booth = LazyModule("pcs.lib.commands.booth")
+cib_options = LazyModule("pcs.lib.commands.cib_options")
+cluster = LazyModule("pcs.lib.commands.cluster")
+fencing_topology = LazyModule("pcs.lib.commands.fencing_topology")
+node = LazyModule("pcs.lib.commands.node")
+pcsd = LazyModule("pcs.lib.commands.pcsd")
+qdevice = LazyModule("pcs.lib.commands.qdevice")
+quorum = LazyModule("pcs.lib.commands.quorum")
+remote_node = LazyModule("pcs.lib.commands.remote_node")
+resource = LazyModule("pcs.lib.commands.resource")
+resource_agent = LazyModule("pcs.lib.commands.resource_agent")
+sbd = LazyModule("pcs.lib.commands.sbd")
+stonith = LazyModule("pcs.lib.commands.stonith")
+
+
+class UnknownLibraryModule(Exception):
+    """
+    There is no library module of the specified name
+    """
+stonith_agent = LazyModule("pcs.lib.commands.stonith_agent")
+constraint_colocation = LazyModule("pcs.lib.commands.constraint.colocation")
+constraint_order = LazyModule("pcs.lib.commands.constraint.order")
+constraint_ticket = LazyModule("pcs.lib.commands.constraint.ticket")
+
 
 def wrapper(dictionary):
     return namedtuple('wrapper', dictionary.keys())(**dictionary)
@@ -47,6 +54,8 @@ def cli_env_to_lib_env(cli_env):
         booth=cli_env.booth,
         known_hosts_getter=cli_env.known_hosts_getter,
         request_timeout=cli_env.request_timeout,
+        debug=cli_env.debug,
+        request_parallelism=cli_env.request_parallelism,
     )
 
 def lib_env_to_cli_env(lib_env, cli_env):
@@ -90,6 +99,8 @@ def bind(cli_env, run_with_middleware, run_library_command):
             #possibility to not exit - it will need deeper rethinking
             sys.exit(1)
 
+    # allows to run the command in a batch, see run_batch
+    decorated_run.library_command = run_library_command
     return decorated_run
 
 def bind_all(env, run_with_middleware, dictionary):
@@ -98,10 +109,10 @@ def bind_all(env, run_with_middleware, dictionary):
         for exposed_fn, library_fn in dictionary.items()
     ))
 
-def get_module(env, middleware_factory, name):
-    if name not in _CACHE:
-        _CACHE[name] = load_module(env, middleware_factory, name)
-    return _CACHE[name]
+def get_module(env, middleware_factory, name, cache):
+    if name not in cache:
+        cache[name] = load_module(env, middleware_factory, name)
+    return cache[name]
 
 
 def load_module(env, middleware_factory, name):
@@ -317,12 +328,16 @@ def load_module(env, middleware_factory, name):
             env,
             middleware.build(),
             {
+                "clear_metadata_cache": resource_agent.clear_metadata_cache,
                 "describe_agent": resource_agent.describe_agent,
+                "get_all_agents_with_metadata":
+                    resource_agent.get_all_agents_with_metadata,
                 "list_agents": resource_agent.list_agents,
                 "list_agents_for_standard_and_provider":
                     resource_agent.list_agents_for_standard_and_provider,
                 "list_ocf_providers": resource_agent.list_ocf_providers,
                 "list_standards": resource_agent.list_standards,
+                "refresh_metadata_cache": resource_agent.refresh_metadata_cache,
             }
         )
 
@@ -334,6 +349,7 @@ def load_module(env, middleware_factory, name):
                 middleware_factory.corosync_conf_existing,
             ),
             {
+                "bulk_create": resource.bulk_create,
                 "bundle_create": resource.bundle_create,
                 "bundle_update": resource.bundle_update,
                 "create": resource.create,
@@ -406,12 +422,80 @@ def load_module(env, middleware_factory, name):
             }
         )
 
-    raise Exception("No library part '{0}'".format(name))
+    raise UnknownLibraryModule("No library part '{0}'".format(name))
+
+def _get_batch_command(env, middleware_factory, name, kwargs):
+    module_name, _, command_name = name.partition(".")
+    try:
+        module = load_module(env, middleware_factory, module_name)
+    except UnknownLibraryModule:
+        raise CmdLineInputError("Unknown command '{0}'".format(name))
+    try:
+        bound_command = getattr(module, command_name)
+    except AttributeError:
+        raise CmdLineInputError("Unknown command '{0}'".format(name))
+    library_command = bound_command.library_command
+    try:
+        inspect.signature(library_command).bind(None, **kwargs)
+    except TypeError as e:
+        raise CmdLineInputError(
+            "Invalid parameters of command '{0}': {1}".format(name, e)
+        )
+    return library_command
+
+def run_batch(
+    cli_env, middleware_factory, command_list, wait=False,
+    minimal_cib_version=None
+):
+    """
+    Run library commands against one CIB and push it once all of them succeeded
+
+    list command_list -- pairs of a command name (e.g. "resource.create") and
+        a dict of the command's keyword arguments
+    mixed wait -- how many seconds to wait for pacemaker to process new CIB
+        or False for not waiting at all
+    pcs.common.tools.Version minimal_cib_version -- the highest CIB version
+        the commands need, the CIB is upgraded before the commands run
+    """
+    batch = [
+        (
+            _get_batch_command(cli_env, middleware_factory, name, kwargs),
+            kwargs
+        )
+        for name, kwargs in command_list
+    ]
+
+    def run(cli_env):
+        lib_env = cli_env_to_lib_env(cli_env)
+        with lib_env.cib_batch(wait, minimal_cib_version):
+            for library_command, kwargs in batch:
+                library_command(lib_env, **kwargs)
+        lib_env_to_cli_env(lib_env, cli_env)
+
+    try:
+        middleware.build(
+            middleware_factory.cib,
+            middleware_factory.corosync_conf_existing,
+        )(run, cli_env)
+    except LibraryEnvError as e:
+        process_library_reports(e.unprocessed)
+        sys.exit(1)
 
 class Library():
     def __init__(self, env, middleware_factory):
         self.env = env
         self.middleware_factory = middleware_factory
+        # Modules are bound to the env and middlewares of this instance. A
+        # process may run more commands with different options (pcs shell).
+        self.module_cache = {}
 
     def __getattr__(self, name):
-        return get_module(self.env, self.middleware_factory, name)
+        return get_module(
+            self.env, self.middleware_factory, name, self.module_cache
+        )
+
+    def run_batch(self, command_list, wait=False, minimal_cib_version=None):
+        run_batch(
+            self.env, self.middleware_factory, command_list, wait,
+            minimal_cib_version
+        )
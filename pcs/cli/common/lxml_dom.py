@@ -0,0 +1,295 @@
+"""
+A subset of the xml.dom.minidom interface implemented on top of lxml
+
+Legacy parts of the command line interface were written for minidom which is
+slow and uses a lot of memory when parsing big CIBs. The classes here let that
+code run on lxml trees without rewriting it. New code should work with lxml
+elements directly.
+
+Differences from minidom:
+  * text nodes are not exposed, childNodes contains only elements and comments
+  * the root element has no parentNode, documents are not nodes of the tree
+  * toxml does not produce an xml declaration
+"""
+from copy import deepcopy
+import xml.dom
+
+from lxml import etree
+
+from pcs.common.tools import xml_fromstring
+
+
+ELEMENT_NODE = xml.dom.Node.ELEMENT_NODE
+COMMENT_NODE = xml.dom.Node.COMMENT_NODE
+DOCUMENT_NODE = xml.dom.Node.DOCUMENT_NODE
+PROCESSING_INSTRUCTION_NODE = xml.dom.Node.PROCESSING_INSTRUCTION_NODE
+
+def parse_string(xml_string):
+    """
+    Parse an xml string to a Document, raise etree.XMLSyntaxError on failure
+
+    string xml_string -- xml to parse
+    """
+    return Document(xml_fromstring(xml_string))
+
+def wrap(node):
+    """
+    Return a minidom-like object for an lxml node or None
+
+    etree node -- an element or a comment
+    """
+    if node is None:
+        return None
+    if isinstance(node.tag, str):
+        return Element(node)
+    return _OtherNode(node)
+
+def unwrap(node):
+    """
+    Return the lxml element of a node created here, None for other objects
+    """
+    if isinstance(node, _Node):
+        return node.element
+    return None
+
+
+class NodeList(list):
+    @property
+    def length(self):
+        return len(self)
+
+
+class _Node(object):
+    ELEMENT_NODE = ELEMENT_NODE
+    COMMENT_NODE = COMMENT_NODE
+    DOCUMENT_NODE = DOCUMENT_NODE
+    PROCESSING_INSTRUCTION_NODE = PROCESSING_INSTRUCTION_NODE
+
+    def __init__(self, element):
+        self.element = element
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, _Node)
+            and
+            type(self) == type(other)
+            and
+            self.element is other.element
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.element)
+
+    @property
+    def parentNode(self):
+        return wrap(self.element.getparent())
+
+    @property
+    def ownerDocument(self):
+        return Document(self.element.getroottree().getroot())
+
+    @property
+    def nextSibling(self):
+        return wrap(self.element.getnext())
+
+    @property
+    def previousSibling(self):
+        return wrap(self.element.getprevious())
+
+    def toxml(self):
+        return etree.tostring(self.element, with_tail=False).decode()
+
+
+class _OtherNode(_Node):
+    @property
+    def nodeType(self):
+        if self.element.tag is etree.Comment:
+            return COMMENT_NODE
+        return PROCESSING_INSTRUCTION_NODE
+
+    @property
+    def nodeValue(self):
+        return self.element.text
+
+    data = nodeValue
+
+    def cloneNode(self, deep):
+        return _OtherNode(deepcopy(self.element))
+
+
+class _ParentNode(_Node):
+    @property
+    def childNodes(self):
+        return NodeList(wrap(child) for child in self.element)
+
+    @property
+    def firstChild(self):
+        for child in self.element:
+            return wrap(child)
+        return None
+
+    @property
+    def lastChild(self):
+        if len(self.element):
+            return wrap(self.element[-1])
+        return None
+
+    def hasChildNodes(self):
+        return len(self.element) > 0
+
+    def appendChild(self, node):
+        self.element.append(node.element)
+        return node
+
+    def insertBefore(self, new_node, ref_node):
+        if ref_node is None:
+            return self.appendChild(new_node)
+        ref_node.element.addprevious(new_node.element)
+        return new_node
+
+    def removeChild(self, node):
+        if node.element.getparent() is not self.element:
+            raise xml.dom.NotFoundErr()
+        # keep the text following the node in the tree
+        _remove_preserving_tail(node.element)
+        return node
+
+    def replaceChild(self, new_node, old_node):
+        self.insertBefore(new_node, old_node)
+        return self.removeChild(old_node)
+
+    def _get_elements_by_tag_name(self, tag_name, include_self):
+        if tag_name == "*":
+            element_iter = self.element.iter(etree.Element)
+        else:
+            element_iter = self.element.iter(tag_name)
+        return NodeList(
+            Element(element) for element in element_iter
+            if include_self or element is not self.element
+        )
+
+
+class Element(_ParentNode):
+    nodeType = ELEMENT_NODE
+
+    @property
+    def tagName(self):
+        return self.element.tag
+
+    nodeName = tagName
+    localName = tagName
+
+    @property
+    def attributes(self):
+        return _Attributes(self.element)
+
+    def getAttribute(self, name):
+        return self.element.get(name, "")
+
+    def hasAttribute(self, name):
+        return name in self.element.attrib
+
+    def setAttribute(self, name, value):
+        self.element.set(name, str(value))
+
+    def removeAttribute(self, name):
+        try:
+            del self.element.attrib[name]
+        except KeyError:
+            raise xml.dom.NotFoundErr()
+
+    def getElementsByTagName(self, tag_name):
+        return self._get_elements_by_tag_name(tag_name, include_self=False)
+
+    def cloneNode(self, deep):
+        if deep:
+            return Element(deepcopy(self.element))
+        return Element(etree.Element(self.element.tag, self.element.attrib))
+
+
+class Document(_ParentNode):
+    nodeType = DOCUMENT_NODE
+    parentNode = None
+    ownerDocument = None
+    nextSibling = None
+    previousSibling = None
+
+    @property
+    def documentElement(self):
+        return Element(self.element)
+
+    @property
+    def childNodes(self):
+        return NodeList([self.documentElement])
+
+    @property
+    def firstChild(self):
+        return self.documentElement
+
+    lastChild = firstChild
+
+    def hasChildNodes(self):
+        return True
+
+    def getElementsByTagName(self, tag_name):
+        return self._get_elements_by_tag_name(tag_name, include_self=True)
+
+    def createElement(self, tag_name):
+        return Element(etree.Element(tag_name))
+
+    def cloneNode(self, deep):
+        return Document(deepcopy(self.element))
+
+
+class _Attr(object):
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    nodeName = property(lambda self: self.name)
+    nodeValue = property(lambda self: self.value)
+
+
+class _Attributes(object):
+    def __init__(self, element):
+        self._element = element
+
+    def __len__(self):
+        return len(self._element.attrib)
+
+    length = property(__len__)
+
+    def __contains__(self, name):
+        return name in self._element.attrib
+
+    def __getitem__(self, name):
+        return _Attr(name, self._element.attrib[name])
+
+    def get(self, name, default=None):
+        if name in self._element.attrib:
+            return self[name]
+        return default
+
+    def keys(self):
+        return list(self._element.attrib.keys())
+
+    def items(self):
+        return list(self._element.attrib.items())
+
+    def values(self):
+        return [self[name] for name in self._element.attrib.keys()]
+
+
+def _remove_preserving_tail(element):
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+        element.tail = None
+    parent.remove(element)
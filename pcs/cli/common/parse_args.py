@@ -12,6 +12,7 @@ PCS_LONG_OPTIONS = [
     "force", "skip-offline", "interactive", "autodelete",
     "all", "full", "local", "wait", "config",
     "start", "enable", "disabled", "off", "request-timeout=",
+    "request-parallelism=",
     "pacemaker", "corosync",
     "no-default-ops", "defaults", "nodesc",
     "master", "name=", "group=", "node=",
@@ -342,6 +343,9 @@ class InputModifiers(object):
             "--group": options.get("--group", None),
             "--name": options.get("--name", None),
             "--node": options.get("--node", None),
+            "--request-parallelism": options.get(
+                "--request-parallelism", None
+            ),
             "--request-timeout": options.get("--request-timeout", None),
             "--to": options.get("--to", None),
             "--wait": options.get("--wait", False),
@@ -357,8 +361,9 @@ class InputModifiers(object):
 
     def ensure_only_supported(self, *supported_options):
         unsupported_options = (
-            # --debug is supported in all commands
-            self._defined_options - set(supported_options) - set(["--debug"])
+            # --debug and --request-parallelism are supported in all commands
+            self._defined_options - set(supported_options)
+            - set(["--debug", "--request-parallelism"])
         )
         if unsupported_options:
             raise CmdLineInputError(
@@ -1,9 +1,22 @@
-from unittest import TestCase
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import mock, TestCase
 
+from pcs import usage
 from pcs.cli.common.completion import (
     _find_suggestions,
+    get_dynamic_words_from_cib,
+    get_dynamic_words_from_agent_names,
+    get_placeholder_key,
+    get_suggestion_tree,
     has_applicable_environment,
     make_suggestions,
+    NODE_NAME,
+    RESOURCE_AGENT,
+    RESOURCE_ID,
+    STONITH_AGENT,
     _split_words,
 )
 
@@ -22,6 +35,26 @@ tree = {
     }
 }
 
+dynamic_tree = {
+    "resource": {
+        "enable": {
+            RESOURCE_ID: {},
+        },
+        "op": {
+            "add": {
+                RESOURCE_ID: {},
+            },
+            "defaults": {},
+        },
+    },
+}
+
+def get_dynamic_words(key):
+    return {
+        RESOURCE_ID: ["A", "B"],
+        NODE_NAME: ["node1"],
+    }[key]
+
 class SuggestionTest(TestCase):
     def test_suggest_nothing_when_cursor_on_first_word(self):
         self.assertEqual([], _find_suggestions(tree, ['pcs'], 0))
@@ -54,6 +87,178 @@ class SuggestionTest(TestCase):
             _find_suggestions(tree, ['pcs', 'invalid', 'c'], 2)
         )
 
+class DynamicSuggestionTest(TestCase):
+    def test_suggest_dynamic_words(self):
+        self.assertEqual(
+            ["A", "B"],
+            _find_suggestions(
+                dynamic_tree, ["pcs", "resource", "enable"], 3,
+                get_dynamic_words
+            )
+        )
+
+    def test_suggest_dynamic_words_with_static_ones(self):
+        self.assertEqual(
+            ["A"],
+            _find_suggestions(
+                dynamic_tree, ["pcs", "resource", "op", "add", "A"], 4,
+                get_dynamic_words
+            )
+        )
+
+    def test_dynamic_words_not_available(self):
+        self.assertEqual(
+            [],
+            _find_suggestions(dynamic_tree, ["pcs", "resource", "enable"], 3)
+        )
+
+    def test_suggest_after_dynamic_word(self):
+        self.assertEqual(
+            [],
+            _find_suggestions(
+                dynamic_tree, ["pcs", "resource", "enable", "A"], 4,
+                get_dynamic_words
+            )
+        )
+
+    def test_dynamic_words_not_needed(self):
+        get_words = mock.Mock()
+        self.assertEqual(
+            ["add", "defaults"],
+            _find_suggestions(
+                dynamic_tree, ["pcs", "resource", "op"], 3, get_words
+            )
+        )
+        get_words.assert_not_called()
+
+class GetPlaceholderKey(TestCase):
+    def test_resource(self):
+        for placeholder in (
+            "<resource id>", "<resource id>...", "[<resource id>]",
+            "<resource id | group id>", "<source resource id>",
+            "<stonith id>", "<group id>",
+        ):
+            self.assertEqual(RESOURCE_ID, get_placeholder_key(placeholder))
+
+    def test_node(self):
+        for placeholder in ("<node>", "<node name>", "[<node>]..."):
+            self.assertEqual(NODE_NAME, get_placeholder_key(placeholder))
+
+    def test_agent(self):
+        self.assertEqual(
+            RESOURCE_AGENT,
+            get_placeholder_key("[<standard>:[<provider>:]]<type>")
+        )
+        for placeholder in ("<stonith agent>", "<stonith device type>"):
+            self.assertEqual(STONITH_AGENT, get_placeholder_key(placeholder))
+
+    def test_other(self):
+        for placeholder in ("<group>", "<role id>", "<filename>"):
+            self.assertIsNone(get_placeholder_key(placeholder))
+
+    def test_usage_tree(self):
+        tree = usage.generate_tree("""
+Commands:
+    enable <resource id>... [--wait[=n]]
+    standby [<node>] [--wait]
+    describe [<standard>:[<provider>:]]<type>
+    op add <resource id> <operation action>
+    create <resource id> [<standard>:[<provider>:]]<type> [options]
+""")
+        self.assertEqual(
+            {
+                "enable": {RESOURCE_ID: {}},
+                "standby": {NODE_NAME: {}},
+                "describe": {RESOURCE_AGENT: {}},
+                "op": {"add": {RESOURCE_ID: {}}},
+                "create": {RESOURCE_ID: {RESOURCE_AGENT: {}}},
+            },
+            tree
+        )
+
+class GetDynamicWordsFromAgentNames(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            {
+                RESOURCE_AGENT: ["lsb:network", "ocf:heartbeat:Dummy"],
+                STONITH_AGENT: ["fence_xvm"],
+            },
+            get_dynamic_words_from_agent_names([
+                "ocf:heartbeat:Dummy", "pacemaker-fenced",
+                "stonith:fence_xvm", "lsb:network",
+            ])
+        )
+
+class GetDynamicWordsFromCib(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            {
+                RESOURCE_ID: ["A", "B", "G", "G-clone", "S"],
+                NODE_NAME: ["node1", "node2"],
+            },
+            get_dynamic_words_from_cib("""
+                <cib><configuration>
+                    <nodes>
+                        <node id="1" uname="node1"/>
+                        <node id="2" uname="node2"/>
+                    </nodes>
+                    <resources>
+                        <primitive class="stonith" id="S" type="fence_xvm"/>
+                        <clone id="G-clone">
+                            <group id="G">
+                                <primitive class="ocf" id="A" type="Dummy">
+                                    <operations>
+                                        <op id="A-monitor" name="monitor"/>
+                                    </operations>
+                                </primitive>
+                                <primitive id="B" class="ocf" type="Dummy"/>
+                            </group>
+                        </clone>
+                    </resources>
+                </configuration><status>
+                    <node_state id="1" uname="node3"/>
+                </status></cib>
+            """)
+        )
+
+class GetSuggestionTree(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache_path = os.path.join(self.tmp_dir, "cache", "tree.json")
+        self.generate = mock.Mock(return_value=tree)
+
+    def test_generated_and_cached(self):
+        self.assertEqual(tree, get_suggestion_tree(
+            self.cache_path, self.generate
+        ))
+        with open(self.cache_path) as cache_file:
+            self.assertEqual(tree, json.load(cache_file))
+        self.assertEqual(tree, get_suggestion_tree(
+            self.cache_path, self.generate
+        ))
+        self.generate.assert_called_once_with()
+
+    def test_cache_disabled(self):
+        self.assertEqual(tree, get_suggestion_tree(None, self.generate))
+        self.assertEqual(tree, get_suggestion_tree(None, self.generate))
+        self.assertEqual(2, self.generate.call_count)
+
+    def test_broken_cache(self):
+        os.mkdir(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "w") as cache_file:
+            cache_file.write("{")
+        self.assertEqual(tree, get_suggestion_tree(
+            self.cache_path, self.generate
+        ))
+        self.generate.assert_called_once_with()
+
+    def test_cache_not_writable(self):
+        cache_path = os.path.join(self.tmp_dir, "file", "tree.json")
+        with open(os.path.join(self.tmp_dir, "file"), "w"):
+            pass
+        self.assertEqual(tree, get_suggestion_tree(cache_path, self.generate))
+
 class HasCompletionEnvironmentTest(TestCase):
     def test_returns_false_if_environment_inapplicable(self):
         inapplicable_environments = [
@@ -1,6 +1,7 @@
 from unittest import mock, TestCase
 
-from pcs.cli.common.lib_wrapper import Library, bind
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.cli.common.lib_wrapper import Library, UnknownLibraryModule, bind
 from pcs.lib.errors import ReportItem
 from pcs.lib.errors import LibraryEnvError
 
@@ -8,7 +9,9 @@ class LibraryWrapperTest(TestCase):
     def test_raises_for_bad_path(self):
         mock_middleware_factory = mock.MagicMock()
         lib = Library('env', mock_middleware_factory)
-        self.assertRaises(Exception, lambda:lib.no_valid_library_part)
+        self.assertRaises(
+            UnknownLibraryModule, lambda:lib.no_valid_library_part
+        )
 
     @mock.patch('pcs.cli.common.lib_wrapper.constraint_order.create_with_set')
     @mock.patch('pcs.cli.common.lib_wrapper.cli_env_to_lib_env')
@@ -50,3 +53,72 @@ class BindTest(TestCase):
 
         self.assertRaises(SystemExit, lambda: binded(cli_env=None))
         mock_process_report.assert_called_once_with([report1, report3])
+
+@mock.patch("pcs.cli.common.lib_wrapper.cli_env_to_lib_env")
+class RunBatchTest(TestCase):
+    def setUp(self):
+        def dummy_middleware(next_in_line, env, *args, **kwargs):
+            return next_in_line(env, *args, **kwargs)
+        self.middleware_factory = mock.MagicMock()
+        self.middleware_factory.cib = dummy_middleware
+        self.middleware_factory.corosync_conf_existing = dummy_middleware
+
+    @mock.patch("pcs.cli.common.lib_wrapper.alert.remove_alert")
+    @mock.patch("pcs.cli.common.lib_wrapper.acl.create_role")
+    def test_run_in_one_env(
+        self, mock_create_role, mock_remove_alert, mock_cli_env_to_lib_env
+    ):
+        lib_env = mock.MagicMock()
+        lib_env.is_cib_live = True
+        lib_env.is_corosync_conf_live = True
+        mock_cli_env_to_lib_env.return_value = lib_env
+        cli_env = mock.MagicMock()
+        cli_env.booth = None
+
+        Library(cli_env, self.middleware_factory).run_batch(
+            [
+                ("acl.create_role", {"role_id": "R", "description": "D"}),
+                ("alert.remove_alert", {"alert_id_list": ["A"]}),
+            ],
+            wait="10"
+        )
+
+        mock_cli_env_to_lib_env.assert_called_once_with(cli_env)
+        lib_env.cib_batch.assert_called_once_with("10", None)
+        mock_create_role.assert_called_once_with(
+            lib_env, role_id="R", description="D"
+        )
+        mock_remove_alert.assert_called_once_with(lib_env, alert_id_list=["A"])
+
+    def test_unknown_command(self, mock_cli_env_to_lib_env):
+        with self.assertRaises(CmdLineInputError) as cm:
+            Library(mock.MagicMock(), self.middleware_factory).run_batch(
+                [("acl.no_such_command", {})]
+            )
+        self.assertEqual(
+            "Unknown command 'acl.no_such_command'", cm.exception.message
+        )
+        mock_cli_env_to_lib_env.assert_not_called()
+
+    def test_unknown_module(self, mock_cli_env_to_lib_env):
+        with self.assertRaises(CmdLineInputError) as cm:
+            Library(mock.MagicMock(), self.middleware_factory).run_batch(
+                [("no_such_module.create", {})]
+            )
+        self.assertEqual(
+            "Unknown command 'no_such_module.create'", cm.exception.message
+        )
+        mock_cli_env_to_lib_env.assert_not_called()
+
+    @mock.patch(
+        "pcs.cli.common.lib_wrapper.middleware.build",
+        side_effect=ImportError("broken"),
+    )
+    def test_module_error_not_hidden(
+        self, mock_build, mock_cli_env_to_lib_env
+    ):
+        with self.assertRaises(ImportError):
+            Library(mock.MagicMock(), self.middleware_factory).run_batch(
+                [("acl.create_role", {})]
+            )
+        mock_cli_env_to_lib_env.assert_not_called()
@@ -0,0 +1,151 @@
+from unittest import TestCase
+import xml.dom
+
+from lxml import etree
+
+from pcs.cli.common import lxml_dom
+from pcs.test.tools.assertions import assert_xml_equal
+
+
+CIB = """
+    <cib>
+        <configuration>
+            <resources>
+                <!-- a comment -->
+                <primitive id="A" class="ocf" type="Dummy"/>
+                <group id="G">
+                    <primitive id="B" class="ocf" type="Dummy"/>
+                    <primitive id="C" class="ocf" type="Dummy"/>
+                </group>
+            </resources>
+        </configuration>
+        <status/>
+    </cib>
+"""
+
+class Document(TestCase):
+    def setUp(self):
+        self.dom = lxml_dom.parse_string(CIB)
+
+    def test_document_element(self):
+        root = self.dom.documentElement
+        self.assertEqual(root.tagName, "cib")
+        self.assertEqual(root.ownerDocument, self.dom)
+        self.assertEqual(self.dom.childNodes, [root])
+        self.assertIsNone(root.parentNode)
+
+    def test_get_elements_by_tag_name(self):
+        self.assertEqual(
+            ["A", "B", "C"],
+            [
+                el.getAttribute("id")
+                for el in self.dom.getElementsByTagName("primitive")
+            ]
+        )
+        self.assertEqual(1, self.dom.getElementsByTagName("cib").length)
+        self.assertEqual(
+            0, self.dom.documentElement.getElementsByTagName("cib").length
+        )
+
+    def test_all_elements_skip_comments(self):
+        self.assertEqual(
+            [
+                "cib", "configuration", "resources", "primitive", "group",
+                "primitive", "primitive", "status",
+            ],
+            [el.tagName for el in self.dom.getElementsByTagName("*")]
+        )
+
+    def test_invalid_xml(self):
+        self.assertRaises(
+            etree.XMLSyntaxError, lxml_dom.parse_string, "<cib>"
+        )
+
+
+class Element(TestCase):
+    def setUp(self):
+        self.dom = lxml_dom.parse_string(CIB)
+        self.resources = self.dom.getElementsByTagName("resources")[0]
+        self.group = self.dom.getElementsByTagName("group")[0]
+
+    def test_child_nodes(self):
+        self.assertEqual(
+            [
+                lxml_dom.COMMENT_NODE,
+                lxml_dom.ELEMENT_NODE,
+                lxml_dom.ELEMENT_NODE,
+            ],
+            [child.nodeType for child in self.resources.childNodes]
+        )
+        self.assertEqual(" a comment ", self.resources.firstChild.data)
+        self.assertEqual(self.group, self.resources.lastChild)
+
+    def test_siblings_and_parent(self):
+        first, second = self.group.childNodes
+        self.assertEqual(second, first.nextSibling)
+        self.assertEqual(first, second.previousSibling)
+        self.assertIsNone(second.nextSibling)
+        self.assertEqual(self.group, first.parentNode)
+        self.assertEqual(1, len({first, first.nextSibling.previousSibling}))
+
+    def test_attributes(self):
+        primitive = self.group.firstChild
+        self.assertEqual("ocf", primitive.getAttribute("class"))
+        self.assertEqual("", primitive.getAttribute("provider"))
+        self.assertFalse(primitive.hasAttribute("provider"))
+        primitive.setAttribute("provider", "heartbeat")
+        self.assertEqual(
+            [
+                ("id", "B"), ("class", "ocf"), ("type", "Dummy"),
+                ("provider", "heartbeat"),
+            ],
+            primitive.attributes.items()
+        )
+        self.assertEqual("heartbeat", primitive.attributes["provider"].value)
+        primitive.removeAttribute("provider")
+        self.assertNotIn("provider", primitive.attributes)
+        self.assertRaises(
+            xml.dom.NotFoundErr, primitive.removeAttribute, "provider"
+        )
+
+    def test_modify_tree(self):
+        new_el = self.dom.createElement("primitive")
+        new_el.setAttribute("id", "D")
+        self.group.insertBefore(new_el, self.group.firstChild)
+        moved = self.group.removeChild(self.group.lastChild)
+        self.resources.appendChild(moved)
+        assert_xml_equal(
+            """
+            <resources>
+                <!-- a comment -->
+                <primitive id="A" class="ocf" type="Dummy"/>
+                <group id="G">
+                    <primitive id="D"/>
+                    <primitive id="B" class="ocf" type="Dummy"/>
+                </group>
+                <primitive id="C" class="ocf" type="Dummy"/>
+            </resources>
+            """,
+            self.resources.toxml()
+        )
+
+    def test_remove_not_a_child(self):
+        self.assertRaises(
+            xml.dom.NotFoundErr,
+            self.resources.removeChild,
+            self.group.firstChild
+        )
+
+    def test_clone_node(self):
+        clone = self.group.cloneNode(True)
+        self.assertIsNone(clone.parentNode)
+        self.assertEqual(2, len(clone.childNodes))
+        self.assertEqual(0, len(self.group.cloneNode(False).childNodes))
+        self.assertEqual("G", self.group.cloneNode(False).getAttribute("id"))
+
+    def test_unwrap(self):
+        self.assertIs(
+            lxml_dom.unwrap(self.dom), lxml_dom.unwrap(self.dom.documentElement)
+        )
+        self.assertEqual("group", lxml_dom.unwrap(self.group).tag)
+        self.assertIsNone(lxml_dom.unwrap("<cib/>"))
@@ -516,6 +516,7 @@ class InputModifiersTest(TestCase):
             "--group",
             "--name",
             "--node",
+            "--request-parallelism",
             "--request-timeout",
             "--to",
             # "--wait", # --wait is a special case, it has its own tests
@@ -576,6 +577,11 @@ class InputModifiersTest(TestCase):
     def test_debug_implicit(self):
         InputModifiers({"--debug": ""}).ensure_only_supported()
 
+    def test_request_parallelism_implicit(self):
+        InputModifiers(
+            {"--request-parallelism": "1"}
+        ).ensure_only_supported()
+
     def test_bool_options(self):
         for opt in self.bool_opts:
             with self.subTest(opt=opt):
@@ -1,3 +1,5 @@
+import json
+
 from pcs.cli.common.parse_args import group_by_keywords, prepare_options
 from pcs.cli.common.errors import CmdLineInputError
 
@@ -154,6 +156,50 @@ def parse_bundle_update_options(arg_list):
     }
     return parts
 
+def parse_bulk_create(document, use_yaml=False):
+    """
+    Return a list of resources to create described in a JSON or YAML document
+
+    string document -- JSON array or YAML list of resource descriptions
+    bool use_yaml -- parse the document as YAML instead of JSON
+    """
+    if use_yaml:
+        try:
+            import yaml
+        except ImportError:
+            raise CmdLineInputError(
+                "Unable to read YAML, python3-PyYAML is not installed"
+            )
+        try:
+            resource_list = yaml.safe_load(document)
+        except yaml.YAMLError as e:
+            raise CmdLineInputError("Unable to parse YAML: {0}".format(e))
+    else:
+        try:
+            resource_list = json.loads(document)
+        except ValueError as e:
+            raise CmdLineInputError("Unable to parse JSON: {0}".format(e))
+    if not isinstance(resource_list, list):
+        raise CmdLineInputError(
+            "The file must contain a list of resources to create"
+        )
+    return _stringify_values(resource_list)
+
+def _stringify_values(value):
+    # JSON and YAML numbers and booleans are CIB strings
+    if isinstance(value, dict):
+        return {
+            key: _stringify_values(item_value)
+            for key, item_value in value.items()
+        }
+    if isinstance(value, list):
+        return [_stringify_values(item) for item in value]
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return value
+
 def build_operations(op_group_list):
     """
     Return a list of dicts. Each dict represents one operation.
@@ -745,3 +745,50 @@ class BuildOperations(TestCase):
 
     def test_refuse_operation_without_name(self):
         self.assert_raises_cmdline([["interval=10s"]])
+
+
+class ParseBulkCreate(TestCase):
+    def test_json(self):
+        self.assertEqual(
+            [
+                {
+                    "type": "clone",
+                    "meta_attributes": {
+                        "clone-max": "2", "interleave": "true",
+                    },
+                    "resource": {
+                        "type": "primitive",
+                        "id": "A",
+                        "agent": "ocf:heartbeat:Dummy",
+                        "operations": [
+                            {"name": "monitor", "interval": "30"},
+                        ],
+                    },
+                },
+            ],
+            parse_args.parse_bulk_create("""
+                [{
+                    "type": "clone",
+                    "meta_attributes": {"clone-max": 2, "interleave": true},
+                    "resource": {
+                        "type": "primitive",
+                        "id": "A",
+                        "agent": "ocf:heartbeat:Dummy",
+                        "operations": [{"name": "monitor", "interval": 30}]
+                    }
+                }]
+            """)
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(CmdLineInputError) as cm:
+            parse_args.parse_bulk_create("[{")
+        self.assertTrue(cm.exception.message.startswith("Unable to parse JSON"))
+
+    def test_not_a_list(self):
+        with self.assertRaises(CmdLineInputError) as cm:
+            parse_args.parse_bulk_create('{"type": "primitive"}')
+        self.assertEqual(
+            "The file must contain a list of resources to create",
+            cm.exception.message
+        )
@@ -59,6 +59,7 @@ from pcs.lib.errors import (
 from pcs.lib.external import disable_service
 from pcs.lib.env import MIN_FEATURE_SET_VERSION_FOR_DIFF
 from pcs.lib.env_tools import get_existing_nodes_names
+from pcs.lib.pacemaker import cib_cache
 import pcs.lib.pacemaker.live as lib_pacemaker
 
 def cluster_cmd(lib, argv, modifiers):
@@ -1171,6 +1172,7 @@ def cluster_destroy(lib, argv, modifiers):
 
         # destroy full-stack nodes
         destroy_cluster(utils.get_corosync_conf_facade().get_nodes_names())
+        cib_cache.clear()
     else:
         print("Shutting down pacemaker/corosync services...")
         for service in ["pacemaker", "corosync-qdevice", "corosync"]:
@@ -1205,6 +1207,8 @@ def cluster_destroy(lib, argv, modifiers):
                 "find", "/var/lib/pacemaker", "-name", name,
                 "-exec", "rm", "-f", "{}", ";"
             ])
+        # a CIB of a new cluster may have the same version as a cached one
+        cib_cache.clear()
         try:
             qdevice_net.client_destroy()
         except:
@@ -1502,6 +1506,9 @@ def cluster_setup(lib, argv, modifiers):
     if modifiers.get("--force"):
         force_flags.append(report_codes.FORCE)
 
+    # the local node may not be a part of the new cluster, so its cached CIB is
+    # not forgotten by destroying the nodes' previous clusters
+    cib_cache.clear()
     lib.cluster.setup(
         cluster_name,
         nodes,
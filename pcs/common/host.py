@@ -1,4 +1,7 @@
 from collections import namedtuple
+import fcntl
+import json
+import os
 
 from pcs import settings
 
@@ -38,3 +41,173 @@ class PcsKnownHost(
         if self.dest_list:
             return self.dest_list[0]
         return Destination(self.name, settings.pcsd_default_port)
+
+
+KNOWN_HOSTS_FORMAT_VERSION = 1
+
+KnownHostsFile = namedtuple("KnownHostsFile", ["data_version", "known_hosts"])
+
+# path: ((inode, mtime, size), KnownHostsFile)
+_known_hosts_cache = {}
+
+def get_known_hosts_file_path():
+    """
+    Return the path of the known-hosts file of the user running pcs
+
+    Only the superuser's hosts are used for pcsd-to-pcsd communication, other
+    users have their own hosts in their home directories (same as in pcsd).
+    """
+    if os.getuid() == 0:
+        return settings.pcsd_known_hosts_location
+    return os.path.join(os.path.expanduser("~/.pcs"), "known-hosts")
+
+def read_known_hosts_file(path):
+    """
+    Return KnownHostsFile loaded from a known-hosts file
+
+    The file is parsed again only if it has changed since the last read. A
+    missing file is the same as a file with no hosts. Raises EnvironmentError
+    if the file cannot be read and ValueError if it cannot be parsed.
+
+    string path -- path to the known-hosts file
+    """
+    try:
+        file_version = _get_file_version(os.stat(path))
+    except FileNotFoundError:
+        return KnownHostsFile(0, {})
+    cached = _known_hosts_cache.get(path)
+    if cached is not None and cached[0] == file_version:
+        return _copy_known_hosts_file(cached[1])
+    with open(path) as known_hosts_file:
+        # pcsd reads config files with a shared lock, do the same
+        fcntl.flock(known_hosts_file.fileno(), fcntl.LOCK_SH)
+        try:
+            file_version = _get_file_version(
+                os.fstat(known_hosts_file.fileno())
+            )
+            known_hosts = parse_known_hosts(known_hosts_file.read())
+        finally:
+            fcntl.flock(known_hosts_file.fileno(), fcntl.LOCK_UN)
+    _known_hosts_cache[path] = (file_version, known_hosts)
+    return _copy_known_hosts_file(known_hosts)
+
+def update_known_hosts_file(path, add_host_list=(), remove_name_list=()):
+    """
+    Add and remove hosts in a known-hosts file, return the new KnownHostsFile
+
+    The file is locked for the whole update and its data version is increased
+    so the change wins when the file is synchronized in a cluster. The file is
+    rewritten in place under an exclusive lock, the same way pcsd saves its
+    config files, so pcs and pcsd lock the same file and do not overwrite each
+    other's changes.
+
+    string path -- path to the known-hosts file
+    iterable add_host_list -- PcsKnownHost to add or replace
+    iterable remove_name_list -- names of hosts to remove
+    """
+    os.makedirs(os.path.dirname(path), 0o700, exist_ok=True)
+    with _open_locked_for_update(path) as known_hosts_file:
+        try:
+            current = parse_known_hosts(known_hosts_file.read())
+            known_hosts = dict(current.known_hosts)
+            for name in remove_name_list:
+                known_hosts.pop(name, None)
+            for known_host in add_host_list:
+                known_hosts[known_host.name] = known_host
+            updated = KnownHostsFile(current.data_version + 1, known_hosts)
+            known_hosts_file.seek(0)
+            known_hosts_file.truncate()
+            known_hosts_file.write(export_known_hosts(updated))
+            known_hosts_file.flush()
+            os.fsync(known_hosts_file.fileno())
+            # The file may keep its size and mtime if it is rewritten quickly,
+            # so the cache would not notice the change.
+            _known_hosts_cache[path] = (
+                _get_file_version(os.fstat(known_hosts_file.fileno())),
+                _copy_known_hosts_file(updated),
+            )
+        finally:
+            fcntl.flock(known_hosts_file.fileno(), fcntl.LOCK_UN)
+    return updated
+
+def parse_known_hosts(text):
+    """
+    Return KnownHostsFile parsed from a text of a known-hosts file
+
+    Raises ValueError if the text is not a valid known-hosts file.
+
+    string text -- content of a known-hosts file
+    """
+    if not text.strip():
+        return KnownHostsFile(0, {})
+    try:
+        data = json.loads(text)
+        if data["format_version"] != KNOWN_HOSTS_FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported format version '{0}'".format(
+                    data["format_version"]
+                )
+            )
+        return KnownHostsFile(
+            data["data_version"],
+            {
+                name: PcsKnownHost.from_known_host_file_dict(name, host)
+                for name, host in data["known_hosts"].items()
+            }
+        )
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid known-hosts file: {0}".format(e))
+
+def export_known_hosts(known_hosts_file):
+    """
+    Return a text of a known-hosts file in the same format pcsd writes it
+
+    KnownHostsFile known_hosts_file -- hosts to export
+    """
+    return json.dumps(
+        {
+            "format_version": KNOWN_HOSTS_FORMAT_VERSION,
+            "data_version": known_hosts_file.data_version,
+            "known_hosts": {
+                name: {
+                    "dest_list": [
+                        {"addr": dest.addr, "port": dest.port}
+                        for dest in known_host.dest_list
+                    ],
+                    "token": known_host.token,
+                }
+                for name, known_host in sorted(
+                    known_hosts_file.known_hosts.items()
+                )
+            },
+        },
+        indent=2
+    )
+
+def _open_locked_for_update(path):
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        known_hosts_file = os.fdopen(fd, "r+")
+        # pcsd writes config files with an exclusive lock, do the same
+        fcntl.flock(known_hosts_file.fileno(), fcntl.LOCK_EX)
+        # The file may have been removed or replaced while waiting for the
+        # lock. The file currently at the path must be updated then.
+        try:
+            if (
+                os.fstat(known_hosts_file.fileno()).st_ino
+                ==
+                os.stat(path).st_ino
+            ):
+                return known_hosts_file
+        except FileNotFoundError:
+            pass
+        known_hosts_file.close()
+
+def _get_file_version(stat):
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def _copy_known_hosts_file(known_hosts_file):
+    # callers may modify the dict, keep the cached one intact
+    return KnownHostsFile(
+        known_hosts_file.data_version, dict(known_hosts_file.known_hosts)
+    )
@@ -1,7 +1,8 @@
 import base64
 import io
 import re
-from collections import namedtuple
+import time
+from collections import defaultdict, deque, namedtuple, OrderedDict
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -110,8 +111,8 @@ class Request(object):
         """
         self._target = request_target
         self._data = request_data
-        self._current_dest_iterator = iter(self._target.dest_list)
-        self._current_dest = None
+        self._dest_list = list(self._target.dest_list)
+        self._current_dest_index = -1
         self.next_dest()
 
     def next_dest(self):
@@ -119,24 +120,33 @@ class Request(object):
         Move to the next available host connection. Raises StopIteration when
         there is no connection to use.
         """
-        self._current_dest = next(self._current_dest_iterator)
+        if self._current_dest_index + 1 >= len(self._dest_list):
+            raise StopIteration()
+        self._current_dest_index += 1
+
+    def prefer_dest(self, dest):
+        """
+        Use the specified host connection first, the other connections are
+        kept as fallbacks. Has no effect once the request moved to the next
+        host connection.
+
+        Destination dest -- one of the host connections of the request target
+        """
+        if self._current_dest_index != 0 or dest not in self._dest_list:
+            return
+        self._dest_list.remove(dest)
+        self._dest_list.insert(0, dest)
 
     @property
     def url(self):
         """
         URL representing request using current host.
         """
-        addr = self.dest.addr
-        port = self.dest.port
-        return "https://{host}:{port}/{request}".format(
-            host="[{0}]".format(addr) if ":" in addr else addr,
-            port=(port if port else settings.pcsd_default_port),
-            request=self._data.action
-        )
+        return _get_url(self.dest, self._data.action)
 
     @property
     def dest(self):
-        return self._current_dest
+        return self._dest_list[self._current_dest_index]
 
     @property
     def host_label(self):
@@ -178,6 +188,9 @@ class Response(object):
         self._error_msg = error_msg
         self._data = None
         self._debug = None
+        self._request = None
+        self._response_code = None
+        self._is_detached = False
 
     @classmethod
     def connection_successful(cls, handle):
@@ -199,8 +212,22 @@ class Response(object):
         """
         return cls(handle, False, errno, error_msg)
 
+    def detach_handle(self):
+        """
+        Load everything needed from the handle so the handle can be reused for
+        another request while this response is still in use.
+        """
+        self._request = self.request
+        self._response_code = self.response_code
+        # load buffers
+        self.data # pylint: disable=pointless-statement
+        self.debug # pylint: disable=pointless-statement
+        self._is_detached = True
+
     @property
     def request(self):
+        if self._is_detached:
+            return self._request
         return self._handle.request_obj
 
     @property
@@ -228,13 +255,21 @@ class Response(object):
     @property
     def debug(self):
         if self._debug is None:
-            self._debug = self._handle.debug_buffer.getvalue().decode("utf-8")
+            if self._handle.debug_buffer is None:
+                # debug info has not been gathered
+                self._debug = ""
+            else:
+                self._debug = (
+                    self._handle.debug_buffer.getvalue().decode("utf-8")
+                )
         return self._debug
 
     @property
     def response_code(self):
         if not self.was_connected:
             return None
+        if self._is_detached:
+            return self._response_code
         return self._handle.getinfo(pycurl.RESPONSE_CODE)
 
     def __repr__(self):
@@ -250,30 +285,162 @@ class Response(object):
             self.response_code,
         )
 
+class CurlHandlePool(object):
+    """
+    This class keeps curl easy handles of finished requests per destination so
+    they can be reused for next requests to the same destination. All handles
+    share one curl share handle, so TLS sessions, DNS records and connections
+    are reused among them (and among communicators using the same pool).
+    Handles not used for idle_timeout seconds are closed.
+    """
+    idle_timeout_default = 60 # in seconds
+
+    def __init__(self, idle_timeout=None, now=time.monotonic):
+        self._idle_timeout = (
+            idle_timeout if idle_timeout is not None
+            else self.idle_timeout_default
+        )
+        self._now = now
+        self._share_handle = _create_share_handle()
+        # dest -> list of (last usage time, handle)
+        self._idle_handles = defaultdict(list)
+
+    def get(self, dest):
+        """
+        Return an idle handle for the destination or a new one
+
+        Destination dest -- where the handle will be connected to
+        """
+        self.evict_idle()
+        if self._idle_handles[dest]:
+            dummy_last_used, handle = self._idle_handles[dest].pop()
+            # reset keeps the share handle as well as live connections
+            handle.reset()
+        else:
+            handle = pycurl.Curl()
+            handle.setopt(pycurl.SHARE, self._share_handle)
+        return handle
+
+    def put(self, dest, handle):
+        """
+        Return a handle of a finished request to the pool
+
+        Destination dest -- where the handle has been connected to
+        pycurl.Curl handle -- curl easy handle
+        """
+        self._idle_handles[dest].append((self._now(), handle))
+
+    def evict_idle(self):
+        """
+        Close handles which have not been used for longer than idle_timeout
+        """
+        oldest_allowed = self._now() - self._idle_timeout
+        for dest in list(self._idle_handles.keys()):
+            kept_handles = []
+            for last_used, handle in self._idle_handles[dest]:
+                if last_used >= oldest_allowed:
+                    kept_handles.append((last_used, handle))
+                else:
+                    handle.close()
+            if kept_handles:
+                self._idle_handles[dest] = kept_handles
+            else:
+                del self._idle_handles[dest]
+
+
 class NodeCommunicatorFactory(object):
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout, debug=False,
+        request_parallelism=None,
+    ):
+        """
+        bool debug -- gather curl debug info of requests
+        int request_parallelism -- max number of requests running at once
+        """
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._debug = debug
+        self._request_parallelism = request_parallelism
+        self._handle_pool = CurlHandlePool()
+        # host label -> Destination which has been connected successfully
+        self._preferred_dest_map = {}
+        # Destination -> (errno, error_msg) of a failed connection
+        self._unreachable_dest_map = {}
+
+    def get_communicator(self, request_timeout=None, retry_unreachable=False):
+        return self.get_simple_communicator(
+            request_timeout=request_timeout,
+            retry_unreachable=retry_unreachable,
+        )
 
-    def get_communicator(self, request_timeout=None):
-        return self.get_simple_communicator(request_timeout=request_timeout)
-
-    def get_simple_communicator(self, request_timeout=None):
+    def get_simple_communicator(
+        self, request_timeout=None, retry_unreachable=False
+    ):
+        """
+        bool retry_unreachable -- send requests also to addresses which were
+            not reachable by previous requests
+        """
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._handle_pool, debug=self._debug,
+            request_parallelism=self._request_parallelism,
+            unreachable_dest_map=self._unreachable_dest_map,
+            retry_unreachable=retry_unreachable,
         )
 
-    def get_multiaddress_communicator(self, request_timeout=None):
+    def get_multiaddress_communicator(
+        self, request_timeout=None, retry_unreachable=False
+    ):
+        """
+        bool retry_unreachable -- send requests also to addresses which were
+            not reachable by previous requests
+        """
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
-
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._handle_pool, debug=self._debug,
+            request_parallelism=self._request_parallelism,
+            unreachable_dest_map=self._unreachable_dest_map,
+            retry_unreachable=retry_unreachable,
+            address_racing_stagger=settings.address_racing_stagger,
+            preferred_dest_map=self._preferred_dest_map,
         )
 
 
+class _FairRequestQueue(object):
+    """
+    Queue of requests waiting to be started. Requests are taken from hosts in
+    turns, so many requests to one host do not delay requests to other hosts.
+    """
+    def __init__(self):
+        # host label -> deque of requests
+        self._host_queues = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def put(self, request):
+        if request.host_label not in self._host_queues:
+            self._host_queues[request.host_label] = deque()
+        self._host_queues[request.host_label].append(request)
+        self._size += 1
+
+    def get(self):
+        host_label, host_queue = next(iter(self._host_queues.items()))
+        request = host_queue.popleft()
+        if host_queue:
+            # let other hosts go first
+            self._host_queues.move_to_end(host_label)
+        else:
+            del self._host_queues[host_label]
+        self._size -= 1
+        return request
+
+
 class Communicator(object):
     """
     This class provides simple interface for making parallel requests.
@@ -281,8 +448,27 @@ class Communicator(object):
     only in a single thread. Use an unique instance for each thread.
     """
     curl_multi_select_timeout_default = 0.8 # in seconds
-
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    # the parallelism is lowered when connections fail, but not below
+    # max parallelism divided by this value
+    parallelism_min_divisor = 4
+
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        handle_pool=None, debug=False, request_parallelism=None,
+        unreachable_dest_map=None, retry_unreachable=False,
+    ):
+        """
+        CurlHandlePool handle_pool -- reuse curl handles (and connections)
+            from this pool, create new handles for each request if None
+        bool debug -- gather curl debug info of requests, it is expensive for
+            big requests and responses so it is off by default
+        int request_parallelism -- max number of requests running at once,
+            other requests wait in a queue
+        dict unreachable_dest_map -- Destination: (errno, error_msg), addresses
+            which could not be connected, to be shared among communicators
+        bool retry_unreachable -- send requests to unreachable addresses
+            anyway, otherwise such requests fail right away
+        """
         self._logger = communicator_logger
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
@@ -290,8 +476,25 @@ class Communicator(object):
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._handle_pool = handle_pool
+        self._debug = debug
+        self._max_parallelism = (
+            request_parallelism
+            if request_parallelism is not None
+            else settings.default_request_parallelism
+        )
+        self._min_parallelism = max(
+            1, self._max_parallelism // self.parallelism_min_divisor
+        )
+        self._parallelism = self._max_parallelism
         self._multi_handle = pycurl.CurlMulti()
         self._is_running = False
+        self._request_queue = _FairRequestQueue()
+        self._unreachable_dest_map = (
+            unreachable_dest_map if unreachable_dest_map is not None else {}
+        )
+        self._retry_unreachable = retry_unreachable
+        self._fail_fast_response_list = []
         # This is used just for storing references of curl easy handles.
         # We need to have references for all the handles, so they don't be
         # cleaned up by the garbage collector.
@@ -309,13 +512,107 @@ class Communicator(object):
         list request_list -- Request objects to add to the queue
         """
         for request in request_list:
+            self._request_queue.put(request)
+        if self._is_running:
+            self.__start_queued_requests()
+
+    def __start_queued_requests(self):
+        self._start_probes()
+        while (
+            self._request_queue
+            and
+            len(self._easy_handle_list) < self._parallelism
+        ):
+            request = self._request_queue.get()
+            if self._is_known_unreachable(request.dest):
+                self._logger.log_request_start(request)
+                self._fail_fast_response_list.append(
+                    self._create_unreachable_response(request)
+                )
+                continue
             handle = _create_request_handle(
                 request, self._auth_cookies, self._request_timeout,
+                handle=(
+                    None if self._handle_pool is None
+                    else self._handle_pool.get(request.dest)
+                ),
+                debug=self._debug,
             )
             self._easy_handle_list.append(handle)
             self._multi_handle.add_handle(handle)
-            if self._is_running:
-                self._logger.log_request_start(request)
+            self._logger.log_request_start(request)
+
+    def _start_probes(self):
+        """
+        Start connection probes which are due, used by MultiaddressCommunicator
+        """
+
+    def _get_probe_timeout(self):
+        """
+        Return seconds until the next connection probe is due or None
+        """
+        return None
+
+    def _process_probe_response(self, response):
+        """
+        Process a finished connection probe
+
+        Response response -- response of the probe
+        """
+        raise AssertionError("Unexpected connection probe")
+
+    def _is_known_unreachable(self, dest):
+        return (
+            not self._retry_unreachable
+            and
+            dest in self._unreachable_dest_map
+        )
+
+    def _get_unreachable_error(self, dest):
+        errno, error_msg = self._unreachable_dest_map[dest]
+        return (
+            errno,
+            "{0} (not retried, the address was unreachable before)".format(
+                error_msg
+            ),
+        )
+
+    def _create_unreachable_response(self, request):
+        """
+        Return a failed response without sending the request as its
+        destination could not be connected before
+        """
+        return Response.connection_failure(
+            _create_request_handle(
+                request, self._auth_cookies, self._request_timeout,
+                debug=self._debug,
+            ),
+            *self._get_unreachable_error(request.dest)
+        )
+
+    def _update_reachability(self, dest, was_connected, errno, error_msg):
+        if was_connected:
+            self._unreachable_dest_map.pop(dest, None)
+        elif errno in (
+            pycurl.E_COULDNT_CONNECT,
+            pycurl.E_COULDNT_RESOLVE_HOST,
+            pycurl.E_OPERATION_TIMEDOUT,
+        ):
+            self._unreachable_dest_map[dest] = (errno, error_msg)
+
+    def __adapt_parallelism(self, response):
+        # Slow down when nodes cannot be reached in time, there may be too many
+        # connections opened at once. Speed up again when requests succeed.
+        if response.was_connected:
+            self._parallelism = min(
+                self._max_parallelism, self._parallelism + 1
+            )
+        elif response.errno in (
+            pycurl.E_OPERATION_TIMEDOUT, pycurl.E_COULDNT_CONNECT
+        ):
+            self._parallelism = max(
+                self._min_parallelism, self._parallelism // 2
+            )
 
     def start_loop(self):
         """
@@ -343,27 +640,77 @@ class Communicator(object):
         if self._is_running:
             raise AssertionError("Method start_loop already running")
         self._is_running = True
-        for handle in self._easy_handle_list:
-            self._logger.log_request_start(handle.request_obj)
-
-        finished_count = 0
-        while finished_count < len(self._easy_handle_list):
-            self.__multi_perform()
-            self.__wait_for_multi_handle()
-            response_list = self.__get_all_ready_responses()
+        self.__start_queued_requests()
+
+        while self._easy_handle_list or self._fail_fast_response_list:
+            if self._fail_fast_response_list:
+                response_list = self._fail_fast_response_list
+                self._fail_fast_response_list = []
+            else:
+                self._start_probes()
+                self.__multi_perform()
+                self.__wait_for_multi_handle()
+                response_list = []
+                probe_finished = False
+                for response in self.__get_all_ready_responses():
+                    if response.handle not in self._easy_handle_list:
+                        # a connection probe stopped as another address won
+                        continue
+                    # free up memory for next usage of this Communicator
+                    # instance
+                    self._multi_handle.remove_handle(response.handle)
+                    self._easy_handle_list.remove(response.handle)
+                    self.__adapt_parallelism(response)
+                    if getattr(response.handle, "is_probe", False):
+                        self._process_probe_response(response)
+                        probe_finished = True
+                        continue
+                    self._update_response_reachability(
+                        response, response.request.dest
+                    )
+                    response_list.append(response)
+                if probe_finished:
+                    # start requests to hosts whose race has just been won and
+                    # probes of the next addresses of hosts whose probe failed
+                    self.__start_queued_requests()
             for response in response_list:
-                # free up memory for next usage of this Communicator instance
-                self._multi_handle.remove_handle(response.handle)
                 self._logger.log_response(response)
+                # MultiaddressCommunicator moves the request to the next
+                # destination when processing the response
+                dest = response.request.dest
                 yield response
-                # if something was added to the queue in the meantime, run it
-                # immediately, so we don't need to wait until all responses will
-                # be processed
+                self.__release_handle(response, dest)
+                # if something was added to the queue in the meantime or there
+                # is a free slot for a waiting request, run it immediately, so
+                # we don't need to wait until all responses will be processed
+                self.__start_queued_requests()
                 self.__multi_perform()
-            finished_count += len(response_list)
-        self._easy_handle_list = []
         self._is_running = False
 
+    def _update_response_reachability(self, response, dest):
+        if (
+            response.errno == pycurl.E_OPERATION_TIMEDOUT
+            and
+            response.handle.getinfo(pycurl.CONNECT_TIME)
+        ):
+            # connected but the request took too long, the node is reachable
+            return
+        self._update_reachability(
+            dest,
+            response.was_connected,
+            response.errno,
+            response.error_msg,
+        )
+
+    def __release_handle(self, response, dest):
+        if self._handle_pool is None:
+            return
+        response.detach_handle()
+        if response.was_connected:
+            self._handle_pool.put(dest, response.handle)
+        else:
+            response.handle.close()
+
     def __get_all_ready_responses(self):
         response_list = []
         repeat = True
@@ -402,21 +749,221 @@ class Communicator(object):
                 # curl don't have timeout set, so we can use our default
                 else self.curl_multi_select_timeout_default
             )
+            probe_timeout = self._get_probe_timeout()
+            if probe_timeout is not None and probe_timeout < timeout:
+                # do not wait longer than until the next probe is due
+                if probe_timeout > 0:
+                    self._multi_handle.select(probe_timeout)
+                return
             # when value returned from select is -1, it timed out, so we can
             # wait
             need_to_wait = (self._multi_handle.select(timeout) == -1)
 
 
+class _AddressRace(object):
+    """
+    Connection probes to addresses of one host and requests waiting for the
+    address which connects first
+    """
+    def __init__(self, host_label):
+        self.host_label = host_label
+        self.request_list = []
+        # addresses not probed yet
+        self.pending_dest_list = deque()
+        # time when the next pending address may be probed
+        self.next_start = time.monotonic()
+        self.running_handle_list = []
+        # Destination -> (errno, error_msg) of a failed probe
+        self.failure_map = {}
+
+
 class MultiaddressCommunicator(Communicator):
     """
     Class with same interface as Communicator. In difference with Communicator,
     it takes advantage of multiple hosts in RequestTarget. So if it is not
     possible to connect to target using first hostname, it will use next one
     until connection will be successful or there is no host left.
+
+    In the address racing mode, all addresses of a target are probed by a
+    light-weight HEAD request, one address after another with a short stagger,
+    before the target's requests are sent. The requests are then sent to the
+    address which answered first, reusing the probe's connection. This
+    prevents waiting for a connection timeout when the first address is not
+    reachable. The probes run in the same loop as the requests, so racing
+    addresses of one target does not hold requests to other targets.
     """
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        handle_pool=None, debug=False, request_parallelism=None,
+        unreachable_dest_map=None, retry_unreachable=False,
+        address_racing_stagger=None, preferred_dest_map=None,
+    ):
+        """
+        float address_racing_stagger -- delay in seconds between probing
+            addresses of a target, None disables the address racing mode
+        dict preferred_dest_map -- host label: Destination, addresses which
+            were connected successfully, to be shared among communicators
+        """
+        super(MultiaddressCommunicator, self).__init__(
+            communicator_logger, user, groups, request_timeout=request_timeout,
+            handle_pool=handle_pool, debug=debug,
+            request_parallelism=request_parallelism,
+            unreachable_dest_map=unreachable_dest_map,
+            retry_unreachable=retry_unreachable,
+        )
+        self._address_racing_stagger = address_racing_stagger
+        self._preferred_dest_map = (
+            preferred_dest_map if preferred_dest_map is not None else {}
+        )
+        self._unreachable_host_set = set()
+        # host label -> _AddressRace
+        self._race_map = OrderedDict()
+
+    def add_requests(self, request_list):
+        queue_request_list = []
+        for request in request_list:
+            if request.host_label in self._preferred_dest_map:
+                request.prefer_dest(
+                    self._preferred_dest_map[request.host_label]
+                )
+            elif request.host_label in self._race_map:
+                self._race_map[request.host_label].request_list.append(
+                    request
+                )
+                continue
+            elif self.__needs_racing(request):
+                self.__start_race(request)
+                continue
+            queue_request_list.append(request)
+        super(MultiaddressCommunicator, self).add_requests(queue_request_list)
+
+    def __needs_racing(self, request):
+        return (
+            self._address_racing_stagger is not None
+            and
+            len(request.target.dest_list) > 1
+            and
+            request.host_label not in self._unreachable_host_set
+            and
+            not all(
+                self._is_known_unreachable(dest)
+                for dest in request.target.dest_list
+            )
+        )
+
+    def __start_race(self, request):
+        race = _AddressRace(request.host_label)
+        race.request_list.append(request)
+        for dest in request.target.dest_list:
+            if self._is_known_unreachable(dest):
+                race.failure_map[dest] = self._get_unreachable_error(dest)
+            else:
+                race.pending_dest_list.append(dest)
+        self._race_map[request.host_label] = race
+
+    def _start_probes(self):
+        now = time.monotonic()
+        for race in self._race_map.values():
+            while (
+                race.pending_dest_list
+                and
+                race.next_start <= now
+                and
+                len(self._easy_handle_list) < self._parallelism
+            ):
+                dest = race.pending_dest_list.popleft()
+                handle = _create_probe_handle(
+                    race.host_label, dest, self._request_timeout,
+                    handle=(
+                        None if self._handle_pool is None
+                        else self._handle_pool.get(dest)
+                    ),
+                )
+                race.running_handle_list.append(handle)
+                self._easy_handle_list.append(handle)
+                self._multi_handle.add_handle(handle)
+                race.next_start = now + self._address_racing_stagger
+
+    def _get_probe_timeout(self):
+        if len(self._easy_handle_list) >= self._parallelism:
+            # probes cannot be started until a running request finishes
+            return None
+        start_list = [
+            race.next_start for race in self._race_map.values()
+            if race.pending_dest_list
+        ]
+        if not start_list:
+            return None
+        return min(start_list) - time.monotonic()
+
+    def _process_probe_response(self, response):
+        handle = response.handle
+        race = self._race_map[handle.host_label]
+        race.running_handle_list.remove(handle)
+        self._update_response_reachability(response, handle.dest)
+        if response.was_connected:
+            self.__win_race(race, handle)
+            return
+        handle.close()
+        race.failure_map[handle.dest] = (response.errno, response.error_msg)
+        if race.pending_dest_list:
+            # no need to wait for the stagger, probe the next address of the
+            # host right away
+            race.next_start = time.monotonic()
+        elif not race.running_handle_list:
+            self.__lose_race(race)
+
+    def __win_race(self, race, handle):
+        del self._race_map[race.host_label]
+        for other_handle in race.running_handle_list:
+            self._multi_handle.remove_handle(other_handle)
+            self._easy_handle_list.remove(other_handle)
+            other_handle.close()
+        self._preferred_dest_map[race.host_label] = handle.dest
+        if self._handle_pool is None:
+            handle.close()
+        else:
+            # the first request to the address gets the handle back from the
+            # pool together with its live connection
+            self._handle_pool.put(handle.dest, handle)
+        for request in race.request_list:
+            request.prefer_dest(handle.dest)
+        super(MultiaddressCommunicator, self).add_requests(race.request_list)
+
+    def __lose_race(self, race):
+        del self._race_map[race.host_label]
+        self._unreachable_host_set.add(race.host_label)
+        for request in race.request_list:
+            self._logger.log_request_start(request)
+            # The request is not sent, the responses only carry the errors of
+            # probing the request target.
+            handle = _create_request_handle(
+                request, self._auth_cookies, self._request_timeout,
+                debug=self._debug,
+            )
+            for dummy_index in range(len(request.target.dest_list) - 1):
+                response = Response.connection_failure(
+                    handle, *race.failure_map[request.dest]
+                )
+                self._logger.log_response(response)
+                previous_dest = request.dest
+                request.next_dest()
+                self._logger.log_retry(response, previous_dest)
+            # the response to the last address is returned by start_loop
+            # which logs it as the other responses
+            self._fail_fast_response_list.append(
+                Response.connection_failure(
+                    handle, *race.failure_map[request.dest]
+                )
+            )
+
     def start_loop(self):
         for response in super(MultiaddressCommunicator, self).start_loop():
             if response.was_connected:
+                if len(response.request.target.dest_list) > 1:
+                    self._preferred_dest_map[response.request.host_label] = (
+                        response.request.dest
+                    )
                 yield response
                 continue
             try:
@@ -466,13 +1013,74 @@ def _get_auth_cookies(user, group_list):
     return cookies
 
 
-def _create_request_handle(request, cookies, timeout):
+def _get_url(dest, action):
+    addr = dest.addr
+    port = dest.port
+    return "https://{host}:{port}/{request}".format(
+        host="[{0}]".format(addr) if ":" in addr else addr,
+        port=(port if port else settings.pcsd_default_port),
+        request=action
+    )
+
+
+def _create_probe_handle(host_label, dest, timeout, handle=None):
+    """
+    Returns Curl object (easy handle) which only sends a HEAD request to the
+    destination to find out if it is reachable
+
+    string host_label -- label of the host the destination belongs to
+    Destination dest -- where to connect
+    int timeout -- probe timeout
+    pycurl.Curl handle -- reset handle to set up, a new one is created if None
+    """
+    # A connect-only handle would be simpler, but libcurl never reuses
+    # connect-only connections. The connection of a finished HEAD request is
+    # kept alive and reused by the next request to the destination.
+    if handle is None:
+        handle = pycurl.Curl()
+    handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
+    handle.setopt(pycurl.URL, _get_url(dest, "").encode("utf-8"))
+    handle.setopt(pycurl.NOBODY, 1)
+    handle.setopt(pycurl.TIMEOUT, timeout)
+    handle.setopt(pycurl.SSL_VERIFYHOST, 0)
+    handle.setopt(pycurl.SSL_VERIFYPEER, 0)
+    handle.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
+    handle.is_probe = True
+    handle.host_label = host_label
+    handle.dest = dest
+    return handle
+
+
+def _create_share_handle():
+    """
+    Returns CurlShare object sharing everything useful for connecting to nodes
+    """
+    share_handle = pycurl.CurlShare()
+    for lock_data in (
+        pycurl.LOCK_DATA_SSL_SESSION,
+        pycurl.LOCK_DATA_DNS,
+        pycurl.LOCK_DATA_CONNECT,
+    ):
+        try:
+            share_handle.setopt(pycurl.SH_SHARE, lock_data)
+        except pycurl.error:
+            # not supported by libcurl (e.g. connections sharing is available
+            # since libcurl 7.57), it is only an optimization
+            pass
+    return share_handle
+
+
+def _create_request_handle(
+    request, cookies, timeout, handle=None, debug=False
+):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
+    pycurl.Curl handle -- reset handle to set up, a new one is created if None
+    bool debug -- gather debug info of the request in handle.debug_buffer
     """
     # it is not possible to take this callback out of this function, because of
     # curl API
@@ -491,15 +1099,19 @@ def _create_request_handle(request, cookies, timeout):
                 debug_output.write(b"\n")
 
     output = io.BytesIO()
-    debug_output = io.BytesIO()
+    debug_output = io.BytesIO() if debug else None
     cookies.update(request.cookies)
-    handle = pycurl.Curl()
+    if handle is None:
+        handle = pycurl.Curl()
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if debug:
+        # The callback copies all the data sent and received, only do that
+        # when someone is interested in them.
+        handle.setopt(pycurl.VERBOSE, 1)
+        handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
@@ -517,6 +1129,7 @@ def _create_request_handle(request, cookies, timeout):
     # pycurl after they've been processed
     # similar usage is in pycurl example:
     # https://github.com/pycurl/pycurl/blob/REL_7_19_0_3/examples/retriever-multi.py
+    handle.is_probe = False
     handle.request_obj = request
     handle.output_buffer = output
     handle.debug_buffer = debug_output
@@ -8,6 +8,8 @@ required_constants = {
     "PROTOCOLS": 181,
     "PROTO_HTTPS": 2,
     "E_OPERATION_TIMEDOUT": 28,
+    # see https://curl.haxx.se/libcurl/c/CURLSHOPT_SHARE.html
+    "LOCK_DATA_CONNECT": 5,
     # these are types of debug messages
     # see https://curl.haxx.se/libcurl/c/CURLOPT_DEBUGFUNCTION.html
     "DEBUG_TEXT": 0,
@@ -77,6 +77,7 @@ CIB_PUSH_ERROR = "CIB_PUSH_ERROR"
 CIB_SAVE_TMP_ERROR = "CIB_SAVE_TMP_ERROR"
 CIB_UPGRADE_FAILED = "CIB_UPGRADE_FAILED"
 CIB_UPGRADE_FAILED_TO_MINIMAL_REQUIRED_VERSION = "CIB_UPGRADE_FAILED_TO_MINIMAL_REQUIRED_VERSION"
+CIB_UPGRADE_IN_BATCH_NOT_POSSIBLE = "CIB_UPGRADE_IN_BATCH_NOT_POSSIBLE"
 CIB_UPGRADE_SUCCESSFUL = "CIB_UPGRADE_SUCCESSFUL"
 CLUSTER_DESTROY_STARTED = "CLUSTER_DESTROY_STARTED"
 CLUSTER_DESTROY_SUCCESS = "CLUSTER_DESTROY_SUCCESS"
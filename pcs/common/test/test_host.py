@@ -1,4 +1,9 @@
-from unittest import TestCase
+import os
+import shutil
+import stat
+import tempfile
+from textwrap import dedent
+from unittest import mock, TestCase
 
 from pcs import settings
 from pcs.common import host
@@ -90,3 +95,179 @@ class PcsKnownHost(TestCase):
         self.assertEqual(
             self.default_dest, host.PcsKnownHost(self.name, None, []).dest
         )
+
+
+KNOWN_HOSTS_TEXT = dedent("""\
+    {
+      "format_version": 1,
+      "data_version": 3,
+      "known_hosts": {
+        "node1": {
+          "dest_list": [
+            {
+              "addr": "10.0.0.1",
+              "port": 2224
+            }
+          ],
+          "token": "token1"
+        },
+        "node2": {
+          "dest_list": [
+            {
+              "addr": "node2",
+              "port": 2225
+            }
+          ],
+          "token": "token2"
+        }
+      }
+    }""")
+
+def fixture_host(name, token="token", addr=None, port=2224):
+    return host.PcsKnownHost(
+        name, token, [host.Destination(addr or name, port)]
+    )
+
+class ParseKnownHosts(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            host.KnownHostsFile(
+                3,
+                {
+                    "node1": fixture_host("node1", "token1", "10.0.0.1"),
+                    "node2": fixture_host("node2", "token2", port=2225),
+                }
+            ),
+            host.parse_known_hosts(KNOWN_HOSTS_TEXT)
+        )
+
+    def test_empty(self):
+        self.assertEqual(
+            host.KnownHostsFile(0, {}), host.parse_known_hosts("  \n")
+        )
+
+    def test_invalid(self):
+        for text in (
+            "{",
+            "[]",
+            '{"format_version": 1}',
+            '{"format_version": 2, "data_version": 1, "known_hosts": {}}',
+            '{"format_version": 1, "data_version": 1, "known_hosts": '
+                '{"node1": {"token": "token1"}}}',
+        ):
+            with self.assertRaises(ValueError):
+                host.parse_known_hosts(text)
+
+    def test_export(self):
+        self.assertEqual(
+            KNOWN_HOSTS_TEXT,
+            host.export_known_hosts(host.parse_known_hosts(KNOWN_HOSTS_TEXT))
+        )
+
+class KnownHostsFileTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "pcs", "known-hosts")
+        host._known_hosts_cache.clear()
+        self.addCleanup(host._known_hosts_cache.clear)
+
+    def write(self, text):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as known_hosts_file:
+            known_hosts_file.write(text)
+
+    def test_read_missing(self):
+        self.assertEqual(
+            host.KnownHostsFile(0, {}), host.read_known_hosts_file(self.path)
+        )
+
+    def test_read_cached_until_changed(self):
+        self.write(KNOWN_HOSTS_TEXT)
+        with mock.patch(
+            "pcs.common.host.parse_known_hosts",
+            wraps=host.parse_known_hosts
+        ) as mock_parse:
+            first = host.read_known_hosts_file(self.path)
+            second = host.read_known_hosts_file(self.path)
+            self.assertEqual(1, mock_parse.call_count)
+            self.assertEqual(first, second)
+            second.known_hosts.clear()
+            self.assertEqual(2, len(host.read_known_hosts_file(self.path)[1]))
+
+            self.write(KNOWN_HOSTS_TEXT.replace('"token1"', '"new_token"'))
+            self.assertEqual(
+                "new_token",
+                host.read_known_hosts_file(self.path).known_hosts["node1"].token
+            )
+            self.assertEqual(2, mock_parse.call_count)
+
+    def test_read_invalid(self):
+        self.write("{")
+        with self.assertRaises(ValueError):
+            host.read_known_hosts_file(self.path)
+
+    def test_update_missing_file(self):
+        updated = host.update_known_hosts_file(
+            self.path, add_host_list=[fixture_host("node1")]
+        )
+        self.assertEqual(
+            host.KnownHostsFile(1, {"node1": fixture_host("node1")}),
+            updated
+        )
+        self.assertEqual(updated, host.read_known_hosts_file(self.path))
+        self.assertEqual(
+            0o600, stat.S_IMODE(os.stat(self.path).st_mode)
+        )
+        self.assertEqual(
+            0o700,
+            stat.S_IMODE(os.stat(os.path.dirname(self.path)).st_mode)
+        )
+
+    def test_update(self):
+        self.write(KNOWN_HOSTS_TEXT)
+        inode = os.stat(self.path).st_ino
+        host.read_known_hosts_file(self.path)
+        host.update_known_hosts_file(
+            self.path,
+            add_host_list=[fixture_host("node3"), fixture_host("node2")],
+            remove_name_list=["node1", "nodeX"],
+        )
+        self.assertEqual(
+            host.KnownHostsFile(
+                4,
+                {
+                    "node2": fixture_host("node2"),
+                    "node3": fixture_host("node3"),
+                }
+            ),
+            host.read_known_hosts_file(self.path)
+        )
+        self.assertEqual(
+            ["known-hosts"], os.listdir(os.path.dirname(self.path))
+        )
+        # written in place as pcsd does, so both lock the same file
+        self.assertEqual(inode, os.stat(self.path).st_ino)
+
+    def test_update_invalid(self):
+        self.write("{")
+        with self.assertRaises(ValueError):
+            host.update_known_hosts_file(self.path, remove_name_list=["a"])
+        with open(self.path) as known_hosts_file:
+            self.assertEqual("{", known_hosts_file.read())
+
+@mock.patch("pcs.common.host.os.getuid")
+class GetKnownHostsFilePath(TestCase):
+    def test_root(self, mock_getuid):
+        mock_getuid.return_value = 0
+        self.assertEqual(
+            settings.pcsd_known_hosts_location,
+            host.get_known_hosts_file_path()
+        )
+
+    @mock.patch("pcs.common.host.os.path.expanduser", lambda path: "/home/u")
+    def test_user(self, mock_getuid):
+        mock_getuid.return_value = 1000
+        self.assertEqual(
+            "/home/u/known-hosts", host.get_known_hosts_file_path()
+        )
@@ -197,6 +197,31 @@ class RequestHostTest(TestCase):
             else:
                 request.next_dest()
 
+    def test_prefer_dest(self):
+        hosts = ["host1", "host2", "host3"]
+        request = self._get_request(lib.RequestTarget(
+            "label", dest_list=_addr_list_to_dest(hosts)
+        ))
+        request.prefer_dest(Destination("host2", None))
+        for host in ["host2", "host1", "host3"]:
+            self.assertEqual(Destination(host, None), request.dest)
+            if host == "host3":
+                self.assertRaises(StopIteration, request.next_dest)
+            else:
+                request.next_dest()
+
+    def test_prefer_dest_after_next_dest(self):
+        hosts = ["host1", "host2", "host3"]
+        request = self._get_request(lib.RequestTarget(
+            "label", dest_list=_addr_list_to_dest(hosts)
+        ))
+        request.next_dest()
+        request.prefer_dest(Destination("host3", None))
+        self.assertEqual(Destination("host2", None), request.dest)
+        request.next_dest()
+        self.assertEqual(Destination("host3", None), request.dest)
+        self.assertRaises(StopIteration, request.next_dest)
+
 
 class RequestCookiesTest(TestCase):
     def _get_request(self, token=None):
@@ -289,7 +314,7 @@ class CreateRequestHandleTest(TestCase):
             "name1": "val1",
             "name2": "val2",
         }
-        handle = lib._create_request_handle(request, cookies, 1)
+        handle = lib._create_request_handle(request, cookies, 1, debug=True)
         expected_opts = {
             pycurl.TIMEOUT: 1,
             pycurl.URL: request.url.encode("utf-8"),
@@ -318,7 +343,7 @@ class CreateRequestHandleTest(TestCase):
         request = lib.Request(
             lib.RequestTarget("label"), lib.RequestData("action")
         )
-        handle = lib._create_request_handle(request, {}, 10)
+        handle = lib._create_request_handle(request, {}, 10, debug=True)
         expected_opts = {
             pycurl.TIMEOUT: 10,
             pycurl.URL: request.url.encode("utf-8"),
@@ -336,6 +361,25 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
+    def test_no_debug(self, mock_curl):
+        mock_curl.return_value = MockCurl(
+            None, b"output", [(pycurl.DEBUG_TEXT, b"debug")]
+        )
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle = lib._create_request_handle(request, {}, 10)
+        self.assertFalse(pycurl.VERBOSE in handle.opts)
+        self.assertFalse(pycurl.DEBUGFUNCTION in handle.opts)
+        self.assertIsNone(handle.debug_buffer)
+        handle.perform()
+        self.assertEqual(
+            "output", handle.output_buffer.getvalue().decode("utf-8")
+        )
+        self.assertEqual(
+            "", lib.Response.connection_successful(handle).debug
+        )
+
 
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
@@ -374,7 +418,8 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         self.assertIs(handle, response.handle)
         self.assertIs(request, response.request)
         mock_create_handle.assert_called_once_with(
-            request, {}, settings.default_request_timeout
+            request, {}, settings.default_request_timeout, handle=None,
+            debug=False,
         )
         return response
 
@@ -411,8 +456,8 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
     )
     def test_call_start_loop_multiple_times(self, _,  mock_create_handle):
         com = self.get_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
-            request=request
+        mock_create_handle.side_effect = (
+            lambda request, *args, **kwargs: MockCurl(request=request)
         )
         com.add_requests([fixture_request(i) for i in range(2)])
         next(com.start_loop())
@@ -505,7 +550,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             expected_response_list.append(response)
             return response
 
-        def _mock_create_request_handle(request, _, __):
+        def _mock_create_request_handle(request, *args, **kwargs):
             counter["counter"] += 1
             return(
                 MockCurl(request=request)
@@ -538,7 +583,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(3, mock_create_handle.call_count)
         self.assertEqual(3, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout, handle=None,
+                debug=False,
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -569,7 +617,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
 
         mock_con_failure.side_effect = _con_failure
         com = self.get_multiaddress_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, *args, **kwargs: MockCurl(
             error=(pycurl.E_SEND_ERROR, "reason"), request=request,
         )
         request = lib.Request(
@@ -592,7 +640,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         mock_con_successful.assert_not_called()
         self.assertEqual(4, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout, handle=None,
+                debug=False,
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -616,3 +667,467 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         )
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         com._multi_handle.assert_no_handle_left()
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorRacingTest(CommunicatorBaseTest):
+    def setUp(self):
+        super(MultiaddressCommunicatorRacingTest, self).setUp()
+        self.dest_list = _addr_list_to_dest(["host1", "host2"])
+        self.request = lib.Request(
+            lib.RequestTarget("label", dest_list=self.dest_list),
+            lib.RequestData("action"),
+        )
+        self.preferred_dest_map = {}
+
+    def run_communicator(
+        self, mock_create_handle, mock_curl, probe_list, performed_list,
+        request_list=None, address_racing_stagger=0, handle_pool=None,
+    ):
+        def _create_handle(request, *args, **kwargs):
+            handle = kwargs.get("handle") or MockCurl()
+            handle.is_probe = False
+            handle.request_obj = request
+            handle.output_buffer = io.BytesIO()
+            handle.debug_buffer = None
+            return handle
+
+        mock_curl.side_effect = probe_list
+        mock_create_handle.side_effect = _create_handle
+        multi_handle = MockCurlMulti(performed_list)
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            return_value=multi_handle,
+        ):
+            com = lib.MultiaddressCommunicator(
+                self.mock_com_log, None, None,
+                address_racing_stagger=address_racing_stagger,
+                preferred_dest_map=self.preferred_dest_map,
+                handle_pool=handle_pool,
+            )
+            com.add_requests(request_list or [self.request])
+            response_list = list(com.start_loop())
+        multi_handle.assert_no_handle_left()
+        return response_list
+
+    def test_use_connected_address(self, mock_create_handle, mock_curl):
+        probe_list = [
+            MockCurl(error=(pycurl.E_COULDNT_CONNECT, "refused")),
+            MockCurl(),
+        ]
+        response_list = self.run_communicator(
+            mock_create_handle, mock_curl, probe_list, [2, 1]
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        self.assertEqual(self.dest_list[1], self.request.dest)
+        self.assertEqual(
+            {"label": self.dest_list[1]}, self.preferred_dest_map
+        )
+        self.assertEqual(0, self.mock_com_log.log_retry.call_count)
+        for probe in probe_list:
+            self.assertEqual(1, probe.opts[pycurl.NOBODY])
+
+    def test_reuse_connection_of_probe(self, mock_create_handle, mock_curl):
+        probe_list = [
+            MockCurl(error=(pycurl.E_COULDNT_CONNECT, "refused")),
+            MockCurl(),
+        ]
+        handle_pool = mock.Mock(spec_set=lib.CurlHandlePool)
+        handle_pool.get.side_effect = probe_list + [probe_list[1]]
+        response_list = self.run_communicator(
+            mock_create_handle, mock_curl, [], [2, 1],
+            handle_pool=handle_pool,
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        mock_curl.assert_not_called()
+        handle_pool.get.assert_has_calls([
+            mock.call(self.dest_list[0]),
+            mock.call(self.dest_list[1]),
+            mock.call(self.dest_list[1]),
+        ])
+        handle_pool.put.assert_any_call(self.dest_list[1], probe_list[1])
+        mock_create_handle.assert_called_once_with(
+            self.request, {}, settings.default_request_timeout,
+            handle=probe_list[1], debug=False,
+        )
+
+    def test_other_hosts_not_blocked(self, mock_create_handle, mock_curl):
+        # The second address is probed right after the first one fails, not
+        # after the stagger. A request to another host finishes meanwhile.
+        other_request = lib.Request(
+            lib.RequestTarget(
+                "other", dest_list=_addr_list_to_dest(["host3"])
+            ),
+            lib.RequestData("action"),
+        )
+        response_list = self.run_communicator(
+            mock_create_handle,
+            mock_curl,
+            [MockCurl(error=(pycurl.E_COULDNT_CONNECT, "refused")), MockCurl()],
+            [2, 1, 1],
+            request_list=[self.request, other_request],
+            address_racing_stagger=100,
+        )
+        self.assertEqual(
+            [other_request, self.request],
+            [response.request for response in response_list]
+        )
+        self.assertTrue(response_list[1].was_connected)
+        self.assertEqual(self.dest_list[1], self.request.dest)
+
+    def test_no_address_connected(self, mock_create_handle, mock_curl):
+        response_list = self.run_communicator(
+            mock_create_handle,
+            mock_curl,
+            [
+                MockCurl(error=(pycurl.E_COULDNT_CONNECT, "refused1")),
+                MockCurl(error=(pycurl.E_OPERATION_TIMEDOUT, "timeout2")),
+            ],
+            [2],
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertFalse(response.was_connected)
+        self.assertEqual(pycurl.E_OPERATION_TIMEDOUT, response.errno)
+        self.assertEqual("timeout2", response.error_msg)
+        self.assertEqual({}, self.preferred_dest_map)
+        self.mock_com_log.log_request_start.assert_called_once_with(
+            self.request
+        )
+        self.assertEqual(2, self.mock_com_log.log_response.call_count)
+        self.assertEqual(1, self.mock_com_log.log_retry.call_count)
+        retry_response, previous_dest = (
+            self.mock_com_log.log_retry.call_args[0]
+        )
+        self.assertEqual(self.dest_list[0], previous_dest)
+        self.assertEqual(pycurl.E_COULDNT_CONNECT, retry_response.errno)
+        self.mock_com_log.log_no_more_addresses.assert_called_once_with(
+            response
+        )
+
+    def test_preferred_address_known(self, mock_create_handle, mock_curl):
+        self.preferred_dest_map["label"] = self.dest_list[1]
+        mock_create_handle.side_effect = (
+            lambda request, *args, **kwargs: MockCurl(request=request)
+        )
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            side_effect=lambda: MockCurlMulti([1]),
+        ):
+            com = lib.MultiaddressCommunicator(
+                self.mock_com_log, None, None, address_racing_stagger=0,
+                preferred_dest_map=self.preferred_dest_map,
+            )
+            com.add_requests([self.request])
+            response_list = list(com.start_loop())
+        self.assertEqual(1, len(response_list))
+        self.assertEqual(self.dest_list[1], response_list[0].request.dest)
+        mock_curl.assert_not_called()
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorUnreachableTest(CommunicatorBaseTest):
+    def setUp(self):
+        super(CommunicatorUnreachableTest, self).setUp()
+        self.unreachable_dest_map = {}
+
+    def run_communicator(
+        self, mock_create_handle, handle_list, request_list,
+        multi_handle=None, retry_unreachable=False, communicator_class=None,
+    ):
+        handle_list = list(handle_list)
+        def _create_handle(request, *args, **kwargs):
+            handle = handle_list.pop(0)
+            handle.request_obj = request
+            return handle
+        mock_create_handle.side_effect = _create_handle
+        multi_handle = multi_handle if multi_handle else MockCurlMulti([])
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            return_value=multi_handle,
+        ):
+            com = (communicator_class or lib.Communicator)(
+                self.mock_com_log, None, None,
+                unreachable_dest_map=self.unreachable_dest_map,
+                retry_unreachable=retry_unreachable,
+            )
+        com.add_requests(request_list)
+        response_list = list(com.start_loop())
+        multi_handle.assert_no_handle_left()
+        return response_list
+
+    def test_remember_unreachable(self, mock_create_handle):
+        request_list = [fixture_request(i) for i in range(4)]
+        self.unreachable_dest_map[request_list[3].dest] = (
+            pycurl.E_COULDNT_CONNECT, "refused"
+        )
+        self.run_communicator(
+            mock_create_handle,
+            [
+                MockCurl(error=(pycurl.E_COULDNT_CONNECT, "refused")),
+                MockCurl(error=(pycurl.E_SEND_ERROR, "reason")),
+                MockCurl(
+                    error=(pycurl.E_OPERATION_TIMEDOUT, "timeout"),
+                    info={pycurl.CONNECT_TIME: 0.1},
+                ),
+                MockCurl(),
+            ],
+            request_list,
+            multi_handle=MockCurlMulti([3]),
+        )
+        self.assertEqual(
+            {
+                request_list[0].dest: (pycurl.E_COULDNT_CONNECT, "refused"),
+                request_list[3].dest: (pycurl.E_COULDNT_CONNECT, "refused"),
+            },
+            self.unreachable_dest_map
+        )
+
+    def test_fail_fast(self, mock_create_handle):
+        request = fixture_request(0)
+        self.unreachable_dest_map[request.dest] = (
+            pycurl.E_COULDNT_CONNECT, "refused"
+        )
+        response_list = self.run_communicator(
+            mock_create_handle, [MockCurl()], [request]
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertIs(request, response.request)
+        self.assertFalse(response.was_connected)
+        self.assertEqual(pycurl.E_COULDNT_CONNECT, response.errno)
+        self.assertEqual(
+            "refused (not retried, the address was unreachable before)",
+            response.error_msg
+        )
+        self.mock_com_log.log_request_start.assert_called_once_with(request)
+        self.mock_com_log.log_response.assert_called_once_with(response)
+
+    def test_retry_unreachable(self, mock_create_handle):
+        request = fixture_request(0)
+        self.unreachable_dest_map[request.dest] = (
+            pycurl.E_COULDNT_CONNECT, "refused"
+        )
+        response_list = self.run_communicator(
+            mock_create_handle,
+            [MockCurl()],
+            [request],
+            multi_handle=MockCurlMulti([1]),
+            retry_unreachable=True,
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        self.assertEqual({}, self.unreachable_dest_map)
+
+    def test_multiaddress_skip_unreachable(self, mock_create_handle):
+        dest_list = _addr_list_to_dest(["host1", "host2"])
+        request = lib.Request(
+            lib.RequestTarget("label", dest_list=dest_list),
+            lib.RequestData("action"),
+        )
+        self.unreachable_dest_map[dest_list[0]] = (
+            pycurl.E_COULDNT_CONNECT, "refused"
+        )
+        response_list = self.run_communicator(
+            mock_create_handle,
+            [MockCurl(), MockCurl()],
+            [request],
+            multi_handle=MockCurlMulti([1]),
+            communicator_class=lib.MultiaddressCommunicator,
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        self.assertEqual(dest_list[1], response_list[0].request.dest)
+        self.assertEqual(1, self.mock_com_log.log_retry.call_count)
+
+
+class FairRequestQueueTest(TestCase):
+    def test_take_hosts_in_turns(self):
+        request_list = [
+            fixture_request(0, "a1"),
+            fixture_request(0, "a2"),
+            fixture_request(0, "a3"),
+            fixture_request(1, "b1"),
+            fixture_request(2, "c1"),
+            fixture_request(2, "c2"),
+        ]
+        queue = lib._FairRequestQueue()
+        for request in request_list:
+            queue.put(request)
+        self.assertEqual(6, len(queue))
+        order = []
+        while queue:
+            order.append(queue.get().action)
+        self.assertEqual(["a1", "b1", "c1", "a2", "c2", "a3"], order)
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorParallelismTest(CommunicatorBaseTest):
+    def get_communicator(self, request_parallelism=None):
+        return lib.Communicator(
+            self.mock_com_log, None, None,
+            request_parallelism=request_parallelism,
+        )
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1, 1])
+    )
+    def test_limit_running_requests(self, _, mock_create_handle):
+        running_count_list = []
+        def _create_handle(request, *args, **kwargs):
+            return MockCurl(request=request)
+        mock_create_handle.side_effect = _create_handle
+        com = self.get_communicator(request_parallelism=2)
+        com.add_requests([
+            fixture_request(0, "a1"),
+            fixture_request(0, "a2"),
+            fixture_request(0, "a3"),
+            fixture_request(1, "b1"),
+        ])
+        response_list = []
+        for response in com.start_loop():
+            running_count_list.append(len(com._multi_handle._handle_list))
+            response_list.append(response)
+        self.assertEqual(
+            ["a1", "b1", "a2", "a3"],
+            [
+                call[0][0].action
+                for call in self.mock_com_log.log_request_start.call_args_list
+            ]
+        )
+        self.assertEqual(
+            ["a1", "b1", "a2", "a3"],
+            [response.request.action for response in response_list]
+        )
+        self.assertEqual([1, 1, 1, 0], running_count_list)
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1, 1, 1, 1])
+    )
+    def test_adapt_to_failures(self, _, mock_create_handle):
+        error_list = [
+            (pycurl.E_OPERATION_TIMEDOUT, "timeout"),
+            (pycurl.E_COULDNT_CONNECT, "refused"),
+            (pycurl.E_COULDNT_CONNECT, "refused"),
+            (pycurl.E_SEND_ERROR, "reason"),
+            None,
+            None,
+        ]
+        def _create_handle(request, *args, **kwargs):
+            return MockCurl(request=request, error=error_list.pop(0))
+        mock_create_handle.side_effect = _create_handle
+        com = self.get_communicator(request_parallelism=8)
+        com.add_requests([fixture_request(i) for i in range(6)])
+        parallelism_list = []
+        for dummy_response in com.start_loop():
+            parallelism_list.append(com._parallelism)
+        self.assertEqual([4, 2, 2, 2, 3, 4], parallelism_list)
+
+
+@mock.patch("pcs.common.node_communicator._create_share_handle")
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CurlHandlePoolTest(TestCase):
+    def setUp(self):
+        self.now = 100
+        self.dest = Destination("addr", 2224)
+
+    def get_pool(self):
+        return lib.CurlHandlePool(idle_timeout=10, now=lambda: self.now)
+
+    def test_new_handle(self, mock_curl, mock_share):
+        pool = self.get_pool()
+        handle = pool.get(self.dest)
+        self.assertIs(mock_curl.return_value, handle)
+        handle.setopt.assert_called_once_with(
+            pycurl.SHARE, mock_share.return_value
+        )
+
+    def test_reuse_handle_of_the_same_dest(self, mock_curl, _):
+        pool = self.get_pool()
+        handle = mock.Mock()
+        pool.put(self.dest, handle)
+        self.assertIs(handle, pool.get(self.dest))
+        handle.reset.assert_called_once_with()
+        mock_curl.assert_not_called()
+
+    def test_do_not_reuse_handle_of_another_dest(self, mock_curl, _):
+        pool = self.get_pool()
+        handle = mock.Mock()
+        pool.put(Destination("addr", 2225), handle)
+        self.assertIs(mock_curl.return_value, pool.get(self.dest))
+        handle.reset.assert_not_called()
+
+    def test_close_idle_handles(self, mock_curl, _):
+        pool = self.get_pool()
+        old_handle = mock.Mock()
+        pool.put(self.dest, old_handle)
+        self.now = 105
+        handle = mock.Mock()
+        pool.put(self.dest, handle)
+        self.now = 111
+        pool.evict_idle()
+        old_handle.close.assert_called_once_with()
+        handle.close.assert_not_called()
+        self.assertIs(handle, pool.get(self.dest))
+        self.assertIs(mock_curl.return_value, pool.get(self.dest))
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1])
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorHandlePoolTest(CommunicatorBaseTest):
+    def get_response(self, mock_create_handle, handle):
+        handle_pool = mock.Mock(spec_set=lib.CurlHandlePool)
+        pool_handle = mock.Mock()
+        handle_pool.get.return_value = pool_handle
+        request = fixture_request(0, "action")
+        handle.request_obj = request
+        handle.output_buffer = io.BytesIO(b"data")
+        handle.debug_buffer = io.BytesIO(b"debug")
+        mock_create_handle.return_value = handle
+        com = lib.Communicator(
+            self.mock_com_log, None, None, handle_pool=handle_pool
+        )
+        com.add_requests([request])
+        response_list = list(com.start_loop())
+        handle_pool.get.assert_called_once_with(request.dest)
+        mock_create_handle.assert_called_once_with(
+            request, {}, settings.default_request_timeout, handle=pool_handle,
+            debug=False,
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        # response is usable even if its handle is used by another request
+        handle.request_obj = None
+        handle.output_buffer = io.BytesIO()
+        self.assertIs(request, response.request)
+        self.assertEqual("data", response.data)
+        self.assertEqual("debug", response.debug)
+        return handle_pool, request, response
+
+    def test_return_handle_to_pool(self, mock_create_handle, _):
+        handle = MockCurl(info={pycurl.RESPONSE_CODE: 200})
+        handle_pool, request, response = self.get_response(
+            mock_create_handle, handle
+        )
+        handle._info = {}
+        self.assertEqual(200, response.response_code)
+        handle_pool.put.assert_called_once_with(request.dest, handle)
+
+    def test_do_not_return_failed_handle_to_pool(self, mock_create_handle, _):
+        handle = MockCurl(error=(pycurl.E_SEND_ERROR, "reason"))
+        handle.close = mock.Mock()
+        handle_pool, dummy_request, response = self.get_response(
+            mock_create_handle, handle
+        )
+        self.assertIsNone(response.response_code)
+        handle_pool.put.assert_not_called()
+        handle.close.assert_called_once_with()
@@ -1,6 +1,6 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from pcs.common.tools import Version
+from pcs.common.tools import LazyModule, map_parallel, Version
 
 
 class VersionTest(TestCase):
@@ -114,3 +114,38 @@ class VersionTest(TestCase):
         self.assert_lt_tuple((2, 0), (3, 5, 1))
         self.assert_lt_tuple((2, 5), (3, 5, 1))
         self.assert_lt_tuple((3, 5), (3, 5, 1))
+
+
+@mock.patch("pcs.common.tools.importlib.import_module")
+class LazyModuleTest(TestCase):
+    def test_imported_on_first_use(self, mock_import):
+        mock_import.return_value.attr = "value"
+        module = LazyModule("some.module")
+        mock_import.assert_not_called()
+        self.assertEqual("value", module.attr)
+        self.assertEqual("value", module.attr)
+        mock_import.assert_called_once_with("some.module")
+
+    def test_missing_attribute(self, mock_import):
+        mock_import.return_value = mock.Mock(spec_set=[])
+        with self.assertRaises(AttributeError):
+            LazyModule("some.module").attr
+
+
+class MapParallelTest(TestCase):
+    def test_results_in_order(self):
+        self.assertEqual(
+            [1, 4, 9, 16, 25],
+            map_parallel(lambda x: x * x, iter([1, 2, 3, 4, 5]), 2)
+        )
+
+    def test_no_items(self):
+        self.assertEqual([], map_parallel(lambda x: x, [], 8))
+
+    def test_exception_raised(self):
+        def func(item):
+            if item == 2:
+                raise ValueError(item)
+            return item
+        with self.assertRaises(ValueError):
+            map_parallel(func, [1, 2, 3], 8)
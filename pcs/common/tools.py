@@ -1,4 +1,6 @@
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import importlib
 from lxml import etree
 import threading
 
@@ -13,6 +15,21 @@ def run_parallel(worker, data_list):
     for thread in thread_list:
         thread.join()
 
+def map_parallel(func, item_list, max_workers):
+    """
+    Call func for each item in threads, return results in the items' order
+
+    callable func -- function taking an item as its only argument
+    iterable item_list -- items to call func for
+    int max_workers -- max number of threads running at once
+    """
+    item_list = list(item_list)
+    if len(item_list) < 2 or max_workers < 2:
+        return [func(item) for item in item_list]
+    with ThreadPoolExecutor(min(max_workers, len(item_list))) as executor:
+        # an exception raised by func is raised here when getting its result
+        return list(executor.map(func, item_list))
+
 def format_environment_error(e):
     if e.filename:
         return "{0}: '{1}'".format(e.strerror, e.filename)
@@ -35,6 +52,25 @@ def xml_fromstring(xml):
         etree.XMLParser(huge_tree=True)
     )
 
+class LazyModule(object):
+    """
+    A module imported when any of its attributes is accessed for the first time
+
+    Allows to refer to modules at a module level without paying for importing
+    them until they are really used.
+    """
+    def __init__(self, name):
+        """
+        string name -- absolute name of the module, e.g. "pcs.lib.commands.acl"
+        """
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attr)
+
 class Version(namedtuple("Version", ["major", "minor", "revision"])):
     def __new__(cls, major, minor=None, revision=None):
         return super(Version, cls).__new__(cls, major, minor, revision)
@@ -39,6 +39,7 @@ from pcs import (
 )
 from pcs.lib.errors import LibraryError
 from pcs.lib.commands import quorum as lib_quorum
+from pcs.lib.pacemaker import cib_cache
 import pcs.cli.constraint_colocation.command as colocation_command
 import pcs.cli.constraint_order.command as order_command
 import pcs.cli.constraint_ticket.command as ticket_command
@@ -455,6 +456,9 @@ def config_restore_local(infile_name, infile_obj):
     except EnvironmentError as e:
         utils.err("unable to remove %s: %s" % (sig_path, e))
 
+    # the restored CIB may have the same version as a cached one
+    cib_cache.clear()
+
 def config_backup_path_list(with_uid_gid=False):
     """
     Commandline options: no option
@@ -1,7 +1,6 @@
 import sys
 import xml.dom.minidom
 from collections import defaultdict
-from xml.dom.minidom import parseString
 
 from pcs import (
     rule as rule_utils,
@@ -12,7 +11,7 @@ from pcs.cli import (
     constraint_colocation,
     constraint_order,
 )
-from pcs.cli.common import parse_args
+from pcs.cli.common import lxml_dom, parse_args
 from pcs.cli.common.console_report import error, warn
 from pcs.cli.common.errors import CmdLineInputError
 import pcs.cli.constraint_colocation.command as colocation_command
@@ -20,6 +19,7 @@ import pcs.cli.constraint_order.command as order_command
 from pcs.cli.constraint_ticket import command as ticket_command
 from pcs.lib.cib.constraint import resource_set
 from pcs.lib.cib.constraint.order import ATTRIB as order_attrib
+from pcs.lib.cib.tools import get_constraints
 from pcs.lib.env_tools import get_existing_nodes_names
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import sanitize_id
@@ -132,7 +132,7 @@ def constraint_cmd(lib, argv, modifiers):
                     e, "constraint", f"colocation {sub_cmd2}"
                 )
         elif sub_cmd in ["remove", "delete"]:
-            constraint_rm(lib, argv, modifiers)
+            constraint_remove_cmd(lib, argv, modifiers)
         elif (sub_cmd in ("show", "list")):
             # all these commands accept -f and --full therefore there is no
             # need to change something here
@@ -330,7 +330,7 @@ def colocation_find_duplicates(dom, constraint_el):
         other_el
         for other_el in dom.getElementsByTagName("rsc_colocation")
         if not other_el.getElementsByTagName("resource_set")
-            and constraint_el is not other_el
+            and constraint_el != other_el
             and normalized_el == normalize(other_el)
     ]
 
@@ -537,7 +537,7 @@ def order_find_duplicates(dom, constraint_el):
         other_el
         for other_el in dom.getElementsByTagName("rsc_order")
         if not other_el.getElementsByTagName("resource_set")
-            and constraint_el is not other_el
+            and constraint_el != other_el
             and normalized_el == normalize(other_el)
     ]
 
@@ -1094,7 +1094,7 @@ def location_rule_find_duplicates(dom, constraint_el):
         other_el
         for other_el in dom.getElementsByTagName("rsc_location")
         if other_el.getElementsByTagName("rule")
-            and constraint_el is not other_el
+            and constraint_el != other_el
             and normalized_el == normalize(other_el)
     ]
 
@@ -1112,11 +1112,55 @@ def getCurrentConstraints(passed_dom=None):
             utils.err("unable to process cib")
         # Verify current constraint doesn't already exist
         # If it does we replace it with the new constraint
-        dom = parseString(current_constraints_xml)
+        dom = lxml_dom.parse_string(current_constraints_xml)
 
     constraintsElement = dom.getElementsByTagName('constraints')[0]
     return (dom, constraintsElement)
 
+def constraint_remove_cmd(dummy_lib, argv, modifiers):
+    """
+    Options:
+      * -f - CIB file
+    """
+    modifiers.ensure_only_supported("-f")
+    if not argv:
+        raise CmdLineInputError()
+
+    lib_env, cib = utils.get_lib_env_with_cib()
+    constraints_el = get_constraints(cib)
+    not_found_list = [
+        c_id for c_id in argv
+        if not cib_remove_constraint(constraints_el, c_id)
+    ]
+    if len(not_found_list) < len(argv):
+        utils.push_lib_env_cib(lib_env)
+    for c_id in not_found_list:
+        utils.err("Unable to find constraint - '%s'" % c_id, False)
+    if not_found_list:
+        sys.exit(1)
+
+def cib_remove_constraint(constraints_el, c_id):
+    """
+    Remove a constraint or a constraint rule, return False if not found
+
+    Commandline options: no options
+
+    etree constraints_el -- constraints section of a CIB
+    string c_id -- id of a constraint or a rule to remove
+    """
+    for constraint_el in constraints_el:
+        if constraint_el.get("id") == c_id:
+            constraints_el.remove(constraint_el)
+            return True
+    for rule_el in constraints_el.iter("rule"):
+        if rule_el.get("id") == c_id:
+            parent_el = rule_el.getparent()
+            parent_el.remove(rule_el)
+            if parent_el.find(".//rule") is None:
+                parent_el.getparent().remove(parent_el)
+            return True
+    return False
+
 # If returnStatus is set, then we don't error out, we just print the error
 # and return false
 def constraint_rm(
@@ -1290,25 +1334,64 @@ def find_constraints_containing(resource_id, passed_dom=None):
     set_constraints = list(set(set_constraints))
     return constraints_found,set_constraints
 
-def remove_constraints_containing_node(dom, node, output=False):
+def cib_remove_constraints_containing(cib, resource_id, output=False):
     """
+    Remove constraints and constraint set members referencing a resource
+
     Commandline options: no options
+
+    etree cib -- the whole CIB to remove the constraints from
+    string resource_id -- id of a resource the constraints reference
+    bool output -- print what is being removed
     """
-    for constraint in find_constraints_containing_node(dom, node):
+    constraints_el = get_constraints(cib)
+    attr_to_match = ["rsc", "first", "then", "with-rsc"]
+    for constraint_el in list(constraints_el):
+        if constraint_el.tag not in (
+            "rsc_colocation", "rsc_location", "rsc_order", "rsc_ticket"
+        ):
+            continue
+        if any(constraint_el.get(attr) == resource_id for attr in attr_to_match):
+            if output:
+                print("Removing Constraint - " + constraint_el.get("id"))
+            constraints_el.remove(constraint_el)
+
+    # If resource id is in a set, remove it from the set, if the set is empty,
+    # then we remove the set, if the parent of the set is empty then we remove
+    # it
+    for ref_el in list(constraints_el.iter("resource_ref")):
+        if ref_el.get("id") != resource_id:
+            continue
+        set_el = ref_el.getparent()
+        set_el.remove(ref_el)
         if output:
-            print("Removing Constraint - %s" % constraint.getAttribute("id"))
-        constraint.parentNode.removeChild(constraint)
-    return dom
-
-def find_constraints_containing_node(dom, node):
+            print("Removing %s from set %s" % (resource_id, set_el.get("id")))
+        if set_el.find("resource_ref") is None:
+            if output:
+                print("Removing set %s" % set_el.get("id"))
+            constraint_el = set_el.getparent()
+            constraint_el.remove(set_el)
+            if constraint_el.find("resource_set") is None:
+                if output:
+                    print("Removing constraint %s" % constraint_el.get("id"))
+                constraints_el.remove(constraint_el)
+
+def cib_remove_constraints_containing_node(cib, node, output=False):
     """
+    Remove location constraints of a node
+
     Commandline options: no options
+
+    etree cib -- the whole CIB to remove the constraints from
+    string node -- name of a node the constraints reference
+    bool output -- print what is being removed
     """
-    return [
-        constraint
-        for constraint in dom.getElementsByTagName("rsc_location")
-            if constraint.getAttribute("node") == node
-    ]
+    constraints_el = get_constraints(cib)
+    for constraint_el in constraints_el.findall("rsc_location"):
+        if constraint_el.get("node") == node:
+            if output:
+                print("Removing Constraint - %s" % constraint_el.get("id"))
+            constraints_el.remove(constraint_el)
 
 # Re-assign any constraints referencing a resource to its parent (a clone
 # or master)
@@ -1,9 +1,13 @@
+import json
+
+from tornado.ioloop import IOLoop
 from tornado.locks import Lock
 
-from pcs.daemon import ruby_pcsd
+from pcs.daemon import ruby_pcsd, remote_native
 from pcs.daemon.app_common import Sinatra
 from pcs.daemon.http_server import HttpsServerManage
 from pcs.daemon.auth import authorize_user
+from pcs.lib.errors import LibraryError
 
 class SinatraRemote(Sinatra):
     """
@@ -77,16 +81,86 @@ class Auth(SinatraRemote):
     async def get(self, *args, **kwargs):
         await self.auth()
 
+class NativeRemote(SinatraRemote):
+    """
+    NativeRemote is base class for handlers which serve read-only requests of
+    the superuser without the Sinatra. Other requests (and requests which
+    cannot be served natively) are directed to the Sinatra.
+    """
+    async def handle_sinatra_request(self):
+        cookies = {
+            name: cookie.value for name, cookie in self.request.cookies.items()
+        }
+        if not remote_native.is_superuser_request(cookies):
+            await super().handle_sinatra_request()
+            return
+        try:
+            result = await self.get_native_result()
+        except LibraryError:
+            await super().handle_sinatra_request()
+            return
+        self.write(json.dumps(result))
+
+    async def get_native_result(self):
+        raise NotImplementedError()
+
+class CheckAuth(SinatraRemote):
+    """
+    CheckAuth only confirms the token is valid, it is the same for all users.
+    """
+    async def handle_sinatra_request(self):
+        if remote_native.get_token_user(self.get_cookie("token")) is None:
+            self.set_status(401)
+            self.write('{"notauthorized":"true"}')
+            return
+        self.write('{"success":true}')
+
+class PacemakerNodeStatus(NativeRemote):
+    def initialize(
+        self,
+        ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
+        result_cache: remote_native.ResultCache
+    ):
+        #pylint: disable=arguments-differ
+        super().initialize(ruby_pcsd_wrapper)
+        self.__result_cache = result_cache
+
+    async def get_native_result(self):
+        return await self.__result_cache.get(
+            "pacemaker_node_status",
+            remote_native.get_pacemaker_node_status,
+        )
+
+class GetConfigs(NativeRemote):
+    async def get_native_result(self):
+        return await IOLoop.current().run_in_executor(
+            None,
+            remote_native.get_configs,
+            self.get_argument("cluster_name", None),
+        )
+
 def get_routes(
     ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
     sync_config_lock: Lock,
     https_server_manage: HttpsServerManage,
+    node_status_cache_ttl=0,
 ):
     ruby_wrapper = dict(ruby_pcsd_wrapper=ruby_pcsd_wrapper)
     lock = dict(sync_config_lock=sync_config_lock)
     server_manage = dict(https_server_manage=https_server_manage)
+    result_cache = dict(
+        result_cache=remote_native.ResultCache(node_status_cache_ttl)
+    )
 
     return [
+        # Read-only urls served natively for the superuser.
+        (r"/remote/check_auth", CheckAuth, ruby_wrapper),
+        (
+            r"/remote/pacemaker_node_status",
+            PacemakerNodeStatus,
+            {**ruby_wrapper, **result_cache}
+        ),
+        (r"/remote/get_configs", GetConfigs, ruby_wrapper),
         # Urls protected by tokens. It is still done by ruby pcsd.
         (r"/run_pcs", SinatraRemote, ruby_wrapper),
         (r"/remote/set_certs", SetCerts, {**ruby_wrapper, **server_manage}),
@@ -1,10 +1,12 @@
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
 import grp
 import pwd
+from time import monotonic
 
 from tornado.gen import coroutine
 
@@ -162,6 +164,69 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 
     return check_user_groups_sync(username, LoginLogger())
 
+class GroupsCache:
+    """
+    GroupsCache keeps results of user groups checks for a short time.
+    """
+    def __init__(self, ttl, now=monotonic):
+        """
+        float ttl -- number of seconds a result is valid
+        callable now -- returns current time in seconds
+        """
+        self.__ttl = ttl
+        self.__now = now
+        self.__results = {}
+
+    def get(self, username):
+        expires, user_auth_info = self.__results.get(username, (0, None))
+        if expires <= self.__now():
+            self.__results.pop(username, None)
+            return None
+        return user_auth_info
+
+    def set(self, username, user_auth_info: UserAuthInfo):
+        self.__results[username] = (self.__now() + self.__ttl, user_auth_info)
+
+class AuthPool:
+    """
+    AuthPool holds the long-lived process pool for authentication tasks. The
+    pool is started by the daemon. Without the started pool a new process is
+    created for every task. A pool broken by a died process is replaced.
+    """
+    #pylint: disable=too-few-public-methods
+    executor = None
+    max_workers = None
+    groups_cache = None
+
+def start_auth_pool(max_workers, groups_cache_ttl=0):
+    """
+    int max_workers -- maximal number of processes running authentication
+    float groups_cache_ttl -- number of seconds user groups are cached for,
+        0 means no cache
+    """
+    AuthPool.max_workers = max_workers
+    AuthPool.executor = ProcessPoolExecutor(max_workers=max_workers)
+    AuthPool.groups_cache = (
+        GroupsCache(groups_cache_ttl) if groups_cache_ttl > 0 else None
+    )
+
+def replace_broken_auth_pool(broken_executor):
+    """
+    ProcessPoolExecutor refuses all tasks once one of its processes died (e.g.
+    it has been killed by the OOM killer), so it must be replaced by a new one.
+
+    ProcessPoolExecutor broken_executor -- the pool which failed a task
+    """
+    if AuthPool.executor is not broken_executor:
+        # already replaced because of another task failed by the same pool
+        return
+    log.pcsd.error(
+        "An authentication process terminated unexpectedly, restarting the "
+        "authentication processes"
+    )
+    broken_executor.shutdown(wait=False)
+    AuthPool.executor = ProcessPoolExecutor(max_workers=AuthPool.max_workers)
+
 # TODO async/await version - how to do it?
 # When async/await is used then the problem is:
 # "TypeError: object Future can't be used in 'await' expression" is raised even
@@ -169,6 +234,14 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 # http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
 @coroutine
 def run_in_process(sync_fn, *args):
+    if AuthPool.executor is not None:
+        executor = AuthPool.executor
+        try:
+            result = yield executor.submit(sync_fn, *args)
+        except BrokenProcessPool:
+            replace_broken_auth_pool(executor)
+            result = yield AuthPool.executor.submit(sync_fn, *args)
+        return result
     pool = ProcessPoolExecutor(max_workers=1)
     result = yield pool.submit(sync_fn, *args)
     pool.shutdown()
@@ -177,9 +250,17 @@ def run_in_process(sync_fn, *args):
 @coroutine
 def authorize_user(username, password) -> UserAuthInfo:
     user = yield run_in_process(authorize_user_sync, username, password)
+    if AuthPool.groups_cache is not None and user.is_authorized:
+        AuthPool.groups_cache.set(username, user)
     return user
 
 @coroutine
 def check_user_groups(username) -> UserAuthInfo:
+    if AuthPool.groups_cache is not None:
+        user = AuthPool.groups_cache.get(username)
+        if user is not None:
+            return user
     user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+    if AuthPool.groups_cache is not None:
+        AuthPool.groups_cache.set(username, user)
     return user
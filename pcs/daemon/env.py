@@ -26,6 +26,8 @@ NOTIFY_SOCKET = "NOTIFY_SOCKET"
 PCSD_DEBUG = "PCSD_DEBUG"
 PCSD_DISABLE_GUI = "PCSD_DISABLE_GUI"
 PCSD_SESSION_LIFETIME = "PCSD_SESSION_LIFETIME"
+PCSD_RUBY_WORKERS = "PCSD_RUBY_WORKERS"
+PCSD_RUBY_WORKER_MAX_REQUESTS = "PCSD_RUBY_WORKER_MAX_REQUESTS"
 GEM_HOME = "GEM_HOME"
 PCSD_DEV = "PCSD_DEV"
 PCSD_CMDLINE_ENTRY = "PCSD_CMDLINE_ENTRY"
@@ -42,6 +44,8 @@ Env = namedtuple("Env", [
     PCSD_DEBUG,
     PCSD_DISABLE_GUI,
     PCSD_SESSION_LIFETIME,
+    PCSD_RUBY_WORKERS,
+    PCSD_RUBY_WORKER_MAX_REQUESTS,
     GEM_HOME,
     PCSD_CMDLINE_ENTRY,
     PCSD_STATIC_FILES_DIR,
@@ -62,6 +66,8 @@ def prepare_env(environ, logger=None):
         loader.pcsd_debug(),
         loader.pcsd_disable_gui(),
         loader.session_lifetime(),
+        loader.ruby_workers(),
+        loader.ruby_worker_max_requests(),
         loader.gem_home(),
         loader.pcsd_cmdline_entry(),
         loader.pcsd_static_files_dir(),
@@ -170,6 +176,18 @@ class EnvLoader:
             )
             return session_lifetime
 
+    def ruby_workers(self):
+        return self.__non_negative_integer(
+            PCSD_RUBY_WORKERS,
+            settings.pcsd_ruby_workers,
+        )
+
+    def ruby_worker_max_requests(self):
+        return self.__non_negative_integer(
+            PCSD_RUBY_WORKER_MAX_REQUESTS,
+            settings.pcsd_ruby_worker_max_requests,
+        )
+
     def pcsd_debug(self):
         return self.__has_true_in_environ(PCSD_DEBUG)
 
@@ -217,5 +235,18 @@ class EnvLoader:
             self.errors.append(f"{description} '{in_pcsd_path}' does not exist")
         return in_pcsd_path
 
+    def __non_negative_integer(self, environ_key, default):
+        value = self.environ.get(environ_key, default)
+        try:
+            if int(value) >= 0:
+                return int(value)
+        except ValueError:
+            pass
+        self.errors.append(
+            f"Invalid {environ_key} value '{value}'"
+            " (it must be a non-negative integer)"
+        )
+        return value
+
     def __has_true_in_environ(self, environ_key):
         return self.environ.get(environ_key, "").lower() == "true"
@@ -0,0 +1,154 @@
+"""
+Python implementation of some read-only remote (node to node) pcsd functions.
+
+Only requests of the superuser are served here. Requests of other users need
+a permission check which is still done by ruby pcsd.
+"""
+import fcntl
+import json
+import os.path
+from time import monotonic
+
+from tornado.ioloop import IOLoop
+
+from pcs import settings
+from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.live import get_local_node_status
+from pcs.daemon import log
+
+
+SUPERUSER = settings.pacemaker_uname
+PCSD_SETTINGS_CONF = "pcs_settings.conf"
+PCSD_KNOWN_HOSTS = "known-hosts"
+
+class ResultCache:
+    """
+    ResultCache keeps results of blocking calls for a short time. Concurrent
+    requests for the same key share one call.
+    """
+    def __init__(self, ttl, now=monotonic):
+        """
+        float ttl -- number of seconds a result is valid
+        callable now -- returns current time in seconds
+        """
+        self.__ttl = ttl
+        self.__now = now
+        self.__results = {}
+
+    def get(self, key, sync_fn, *args):
+        """
+        Return a future with the result of sync_fn(*args) run in a thread
+
+        hashable key -- identifier of the result
+        """
+        expires, future = self.__results.get(key, (0, None))
+        if (
+            future is None
+            or
+            expires <= self.__now()
+            or
+            (future.done() and future.exception() is not None)
+        ):
+            future = IOLoop.current().run_in_executor(None, sync_fn, *args)
+            self.__results[key] = (self.__now() + self.__ttl, future)
+        return future
+
+class _LogReportProcessor:
+    # CommandRunner reports only debug information about running processes.
+    # pylint: disable=no-self-use
+    def process(self, report_item):
+        log.pcsd.debug("%s: %s", report_item.code, report_item.info)
+
+def get_token_user(token):
+    """
+    Return the name of the user owning the token or None if the token is invalid
+    """
+    if not token:
+        return None
+    try:
+        with open(settings.pcsd_users_conf_location) as users_file:
+            users = json.load(users_file)
+    except (EnvironmentError, ValueError):
+        return None
+    for user in users:
+        if user.get("token") == token:
+            return user.get("username")
+    return None
+
+def is_superuser_request(cookies):
+    """
+    Check the request is authenticated as the superuser. The superuser can act
+    on behalf of another user specified in the CIB_user cookie, such request
+    is not considered to be a superuser request.
+
+    dict cookies -- request cookies (name: value)
+    """
+    return (
+        get_token_user(cookies.get("token")) == SUPERUSER
+        and
+        not cookies.get("CIB_user", "").strip()
+    )
+
+def get_pacemaker_node_status():
+    runner = CommandRunner(
+        log.pcsd,
+        _LogReportProcessor(),
+        {"LC_ALL": "C"},
+    )
+    return get_local_node_status(runner)
+
+def _read_config_file(path):
+    # Ruby pcsd reads config files with a shared lock, do the same.
+    with open(path) as config_file:
+        fcntl.flock(config_file.fileno(), fcntl.LOCK_SH)
+        try:
+            return config_file.read()
+        finally:
+            fcntl.flock(config_file.fileno(), fcntl.LOCK_UN)
+
+def _read_sync_config(path, default_on_error):
+    if not os.path.exists(path):
+        return None
+    try:
+        return _read_config_file(path)
+    except EnvironmentError as e:
+        log.pcsd.warning("Cannot read config '%s': %s", path, e)
+        return default_on_error
+
+def get_local_cluster_name():
+    if not os.path.exists(settings.corosync_conf_file):
+        return ""
+    return CorosyncConfigFacade.from_string(
+        _read_config_file(settings.corosync_conf_file)
+    ).get_cluster_name()
+
+def get_configs(cluster_name):
+    """
+    Return synchronized configs in the same structure as ruby pcsd does
+
+    string cluster_name -- cluster name the requesting node belongs to
+    """
+    local_cluster_name = get_local_cluster_name()
+    if not local_cluster_name:
+        return {"status": "not_in_cluster"}
+    if cluster_name != local_cluster_name:
+        return {"status": "wrong_cluster_name"}
+    return {
+        "status": "ok",
+        "cluster_name": local_cluster_name,
+        "configs": {
+            PCSD_SETTINGS_CONF: {
+                "type": "file",
+                "text": _read_sync_config(
+                    settings.pcsd_settings_conf_location, ""
+                ),
+            },
+            PCSD_KNOWN_HOSTS: {
+                "type": "file",
+                "text": _read_sync_config(
+                    settings.pcsd_known_hosts_location, None
+                ),
+            },
+        },
+    }
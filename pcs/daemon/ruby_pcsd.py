@@ -3,9 +3,18 @@ import logging
 import os.path
 from base64 import b64decode
 from collections import namedtuple
+from datetime import timedelta
 from time import time as now
 
-from tornado.gen import Task, multi, convert_yielded
+from tornado.gen import (
+    Task,
+    TimeoutError as TornadoTimeoutError,
+    convert_yielded,
+    multi,
+    with_timeout,
+)
+from tornado.iostream import StreamClosedError
+from tornado.queues import Queue
 from tornado.web import HTTPError
 from tornado.httputil import split_host_and_port, HTTPServerRequest
 from tornado.process import Subprocess
@@ -63,12 +72,130 @@ def log_communication(request_json, stdout, stderr):
     log.pcsd.debug("Response stdout from ruby pcsd wrapper: '%s'", stdout)
     log.pcsd.debug("Response stderr from ruby pcsd wrapper: '%s'", stderr)
 
+class RubyWorker:
+    """
+    RubyWorker is a long-lived ruby pcsd process. It reads json requests from
+    stdin and writes json responses to stdout, one per line.
+    """
+    def __init__(self, cmdline, env):
+        self.__process = Subprocess(
+            cmdline,
+            stdin=Subprocess.STREAM,
+            stdout=Subprocess.STREAM,
+            env={**env, "PCSD_RUBY_WORKER": "true"},
+        )
+        self.request_count = 0
+
+    @property
+    def is_alive(self):
+        return self.__process.proc.poll() is None
+
+    async def communicate(self, request_json):
+        """
+        Return the response line or an empty bytes when the worker died.
+
+        string request_json -- json request without newlines
+        """
+        self.request_count += 1
+        try:
+            await self.__process.stdin.write(str.encode(request_json) + b"\n")
+            return await self.__process.stdout.read_until(b"\n")
+        except StreamClosedError:
+            log.pcsd.error("Ruby pcsd worker terminated unexpectedly")
+            return b""
+
+    def stop(self):
+        if self.is_alive:
+            self.__process.proc.terminate()
+
+    def kill(self):
+        if self.is_alive:
+            self.__process.proc.kill()
+
+class RubyWorkerPool:
+    """
+    RubyWorkerPool multiplexes requests over a limited number of ruby workers.
+    Workers are started on demand and recycled after max_requests requests or
+    when they die. A worker not answering in request_timeout seconds is killed
+    and replaced. Requests exceeding the capacity are queued; when the queue
+    is full, the request is refused.
+    """
+    def __init__(
+        self, spawn_worker, size, max_requests, max_queued,
+        request_timeout=None
+    ):
+        self.__spawn_worker = spawn_worker
+        self.__max_requests = max_requests
+        self.__max_queued = max_queued
+        self.__request_timeout = request_timeout
+        self.__waiting = 0
+        # None in the queue is a free slot for a worker which is not running.
+        self.__idle = Queue()
+        for _ in range(size):
+            self.__idle.put_nowait(None)
+
+    async def communicate(self, request_json):
+        if self.__waiting >= self.__max_queued:
+            log.pcsd.error(
+                "Too many requests waiting for ruby pcsd workers (%s)",
+                self.__waiting
+            )
+            raise HTTPError(503)
+
+        self.__waiting += 1
+        try:
+            worker = await self.__idle.get()
+        finally:
+            self.__waiting -= 1
+
+        response = b""
+        try:
+            if worker is None or not worker.is_alive:
+                worker = self.__spawn_worker()
+            response = await self.__communicate(worker, request_json)
+            return response
+        finally:
+            if worker is not None and (
+                not response or worker.request_count >= self.__max_requests
+            ):
+                worker.stop()
+                worker = None
+            self.__idle.put_nowait(worker)
+
+    async def __communicate(self, worker, request_json):
+        if self.__request_timeout is None:
+            return await worker.communicate(request_json)
+        try:
+            return await with_timeout(
+                timedelta(seconds=self.__request_timeout),
+                convert_yielded(worker.communicate(request_json)),
+            )
+        except TornadoTimeoutError:
+            log.pcsd.error(
+                "Ruby pcsd worker did not respond in %s seconds, killing it",
+                self.__request_timeout
+            )
+            worker.kill()
+            return b""
+
 class Wrapper:
     # pylint: disable=too-many-instance-attributes
     def __init__(
         self, pcsd_cmdline_entry, gem_home=None, debug=False,
-        ruby_executable="ruby", https_proxy=None, no_proxy=None
+        ruby_executable="ruby", https_proxy=None, no_proxy=None,
+        worker_pool_size=0, worker_max_requests=1, worker_max_queued=0,
+        worker_request_timeout=None,
     ):
+        """
+        int worker_pool_size -- number of long-lived ruby workers, 0 means
+            a new ruby process for every request
+        int worker_max_requests -- a worker is restarted after this number of
+            requests
+        int worker_max_queued -- number of requests allowed to wait for a free
+            worker
+        int worker_request_timeout -- seconds after which a worker not
+            responding is killed, None means no limit
+        """
         self.__gem_home = gem_home
         self.__pcsd_cmdline_entry = pcsd_cmdline_entry
         self.__pcsd_dir = os.path.dirname(pcsd_cmdline_entry)
@@ -76,6 +203,15 @@ class Wrapper:
         self.__debug = debug
         self.__https_proxy = https_proxy
         self.__no_proxy = no_proxy
+        self.__worker_pool = None
+        if worker_pool_size > 0:
+            self.__worker_pool = RubyWorkerPool(
+                lambda: RubyWorker(self.__get_cmdline(), self.__get_env()),
+                worker_pool_size,
+                worker_max_requests,
+                worker_max_queued,
+                worker_request_timeout,
+            )
 
     def get_sinatra_request(self, request: HTTPServerRequest):
         host, port = split_host_and_port(request.host)
@@ -101,7 +237,7 @@ class Wrapper:
             "rack.input": request.body.decode("utf8"),
         }}
 
-    async def send_to_ruby(self, request_json):
+    def __get_env(self):
         env = {
             "PCSD_DEBUG": "true" if self.__debug else "false"
         }
@@ -112,17 +248,27 @@ class Wrapper:
             env["NO_PROXY"] = self.__no_proxy
         if self.__https_proxy is not None:
             env["HTTPS_PROXY"] = self.__https_proxy
+        return env
+
+    def __get_cmdline(self):
+        return [
+            self.__ruby_executable, "-I",
+            self.__pcsd_dir,
+            self.__pcsd_cmdline_entry
+        ]
+
+    async def send_to_ruby(self, request_json):
+        if self.__worker_pool is not None:
+            # Worker's stderr is not captured per request, it goes to the
+            # daemon's stderr.
+            return await self.__worker_pool.communicate(request_json), b""
 
         pcsd_ruby = Subprocess(
-            [
-                self.__ruby_executable, "-I",
-                self.__pcsd_dir,
-                self.__pcsd_cmdline_entry
-            ],
+            self.__get_cmdline(),
             stdin=Subprocess.STREAM,
             stdout=Subprocess.STREAM,
             stderr=Subprocess.STREAM,
-            env=env
+            env=self.__get_env()
         )
         await Task(pcsd_ruby.stdin.write, str.encode(request_json))
         pcsd_ruby.stdin.close()
@@ -9,7 +9,9 @@ from tornado.web import Application
 
 from pcs import settings
 from pcs.common.system import is_systemd
-from pcs.daemon import log, systemd, session, ruby_pcsd, app_remote, app_gui,ssl
+from pcs.daemon import (
+    log, systemd, session, ruby_pcsd, app_remote, app_gui, ssl, auth
+)
 from pcs.daemon.env import prepare_env
 from pcs.daemon.http_server import HttpsServerManage
 
@@ -57,6 +59,7 @@ def configure_app(
             ruby_pcsd_wrapper,
             sync_config_lock,
             https_server_manage,
+            settings.pcsd_node_status_cache_ttl,
         )
 
         if not disable_gui:
@@ -85,6 +88,10 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    auth.start_auth_pool(
+        settings.pcsd_auth_workers,
+        settings.pcsd_auth_groups_cache_ttl,
+    )
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         pcsd_cmdline_entry=env.PCSD_CMDLINE_ENTRY,
@@ -93,6 +100,10 @@ def main():
         ruby_executable=settings.ruby_executable,
         https_proxy=env.HTTPS_PROXY,
         no_proxy=env.NO_PROXY,
+        worker_pool_size=env.PCSD_RUBY_WORKERS,
+        worker_max_requests=env.PCSD_RUBY_WORKER_MAX_REQUESTS,
+        worker_max_queued=settings.pcsd_ruby_worker_max_queued,
+        worker_request_timeout=settings.pcsd_ruby_worker_request_timeout,
     )
     make_app = configure_app(
         session.Storage(env.PCSD_SESSION_LIFETIME),
@@ -1,3 +1,4 @@
+import json
 import logging
 import re
 from urllib.parse import urlencode
@@ -7,6 +8,8 @@ from tornado.locks import Lock
 
 from pcs.daemon import ruby_pcsd, app_remote, http_server
 from pcs.daemon.test import fixtures_app
+from pcs.daemon.test.fixtures_app import USER
+from pcs.lib.errors import LibraryError
 from pcs.test.tools.misc import create_setup_patch_mixin
 
 # Don't write errors to test output.
@@ -113,3 +116,86 @@ class SyncConfigMutualExclusive(AppTest):
 
     def test_post_locked(self):
         self.check_locked("POST")
+
+class CheckAuth(AppTest, create_setup_patch_mixin(app_remote)):
+    def test_refuse_invalid_token(self):
+        self.setup_patch("remote_native.get_token_user", return_value=None)
+        response = self.get("/remote/check_auth")
+        self.assertEqual(response.code, 401)
+        self.assertEqual(response.body, b'{"notauthorized":"true"}')
+
+    def test_success_on_valid_token(self):
+        self.setup_patch("remote_native.get_token_user", return_value=USER)
+        response = self.get(
+            "/remote/check_auth",
+            headers={"Cookie": "token=abcd"}
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body, b'{"success":true}')
+
+class PacemakerNodeStatus(AppTest, create_setup_patch_mixin(app_remote)):
+    def setUp(self):
+        self.node_status = self.setup_patch(
+            "remote_native.get_pacemaker_node_status",
+            return_value={"offline": True},
+        )
+        super().setUp()
+
+    def get_routes(self):
+        return app_remote.get_routes(
+            self.wrapper,
+            self.lock,
+            self.https_server_manage,
+            node_status_cache_ttl=60,
+        )
+
+    def test_superuser_served_natively_and_cached(self):
+        self.setup_patch(
+            "remote_native.is_superuser_request",
+            return_value=True
+        )
+        for _ in range(2):
+            response = self.get("/remote/pacemaker_node_status")
+            self.assertEqual(response.code, 200)
+            self.assertEqual(json.loads(response.body), {"offline": True})
+        self.node_status.assert_called_once_with()
+
+    def test_other_users_go_to_ruby(self):
+        self.setup_patch(
+            "remote_native.is_superuser_request",
+            return_value=False
+        )
+        self.assert_wrappers_response(self.get("/remote/pacemaker_node_status"))
+        self.node_status.assert_not_called()
+
+    def test_library_error_goes_to_ruby(self):
+        self.setup_patch(
+            "remote_native.is_superuser_request",
+            return_value=True
+        )
+        self.node_status.side_effect = LibraryError()
+        self.assert_wrappers_response(self.get("/remote/pacemaker_node_status"))
+
+class GetConfigs(AppTest, create_setup_patch_mixin(app_remote)):
+    def test_superuser_served_natively(self):
+        self.setup_patch(
+            "remote_native.is_superuser_request",
+            return_value=True
+        )
+        get_configs = self.setup_patch(
+            "remote_native.get_configs",
+            return_value={"status": "wrong_cluster_name"},
+        )
+        response = self.get("/remote/get_configs?cluster_name=cluster")
+        self.assertEqual(
+            json.loads(response.body),
+            {"status": "wrong_cluster_name"}
+        )
+        get_configs.assert_called_once_with("cluster")
+
+    def test_other_users_go_to_ruby(self):
+        self.setup_patch(
+            "remote_native.is_superuser_request",
+            return_value=False
+        )
+        self.assert_wrappers_response(self.get("/remote/get_configs"))
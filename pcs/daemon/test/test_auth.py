@@ -1,6 +1,11 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from unittest import TestCase
 import logging
 
+from tornado.gen import coroutine
+from tornado.testing import AsyncTestCase, gen_test
+
 from pcs.daemon import auth
 from pcs.test.tools.misc import create_setup_patch_mixin
 
@@ -37,3 +42,87 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+class GroupsCache(TestCase):
+    def setUp(self):
+        self.time = 0
+        self.cache = auth.GroupsCache(10, now=lambda: self.time)
+        self.user = auth.UserAuthInfo(USER, [auth.HA_ADM_GROUP], True)
+
+    def test_return_cached_until_expired(self):
+        self.cache.set(USER, self.user)
+        self.time = 9
+        self.assertEqual(self.cache.get(USER), self.user)
+        self.time = 10
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_return_none_for_unknown_user(self):
+        self.assertIsNone(self.cache.get(USER))
+
+class CheckUserGroups(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.user = auth.UserAuthInfo(USER, [auth.HA_ADM_GROUP], True)
+        self.run_in_process = self.setup_patch(
+            "run_in_process",
+            side_effect=self.fake_run_in_process
+        )
+        self.setup_patch("AuthPool.groups_cache", auth.GroupsCache(60))
+
+    @coroutine
+    def fake_run_in_process(self, sync_fn, *args):
+        return self.user
+
+    @gen_test
+    def test_use_cached_groups(self):
+        for _ in range(2):
+            user = yield auth.check_user_groups(USER)
+            self.assertEqual(user, self.user)
+        self.run_in_process.assert_called_once()
+
+    @gen_test
+    def test_authorization_fills_cache(self):
+        yield auth.authorize_user(USER, PASSWORD)
+        user = yield auth.check_user_groups(USER)
+        self.assertEqual(user, self.user)
+        self.run_in_process.assert_called_once()
+
+class Executor:
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.is_shutdown = False
+
+    def submit(self, sync_fn, *args):
+        if self.broken:
+            raise BrokenProcessPool()
+        future = Future()
+        future.set_result(sync_fn(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        self.is_shutdown = True
+
+class RunInProcess(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.broken_executor = Executor(broken=True)
+        self.new_executor = Executor()
+        self.setup_patch("AuthPool.executor", self.broken_executor)
+        self.setup_patch("AuthPool.max_workers", 4)
+        self.process_pool_executor = self.setup_patch(
+            "ProcessPoolExecutor", return_value=self.new_executor
+        )
+
+    @gen_test
+    def test_replace_broken_pool(self):
+        result = yield auth.run_in_process(lambda x: x + 1, 1)
+        self.assertEqual(result, 2)
+        self.assertTrue(self.broken_executor.is_shutdown)
+        self.assertIs(auth.AuthPool.executor, self.new_executor)
+        self.process_pool_executor.assert_called_once_with(max_workers=4)
+
+    def test_replace_only_once(self):
+        auth.replace_broken_auth_pool(self.broken_executor)
+        auth.replace_broken_auth_pool(self.broken_executor)
+        self.process_pool_executor.assert_called_once_with(max_workers=4)
+        self.assertIs(auth.AuthPool.executor, self.new_executor)
@@ -40,6 +40,10 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_DEBUG: False,
             env.PCSD_DISABLE_GUI: False,
             env.PCSD_SESSION_LIFETIME: settings.gui_session_lifetime_seconds,
+            env.PCSD_RUBY_WORKERS: settings.pcsd_ruby_workers,
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS:
+                settings.pcsd_ruby_worker_max_requests
+            ,
             env.GEM_HOME: pcsd_dir(settings.pcsd_gem_path),
             env.PCSD_CMDLINE_ENTRY: pcsd_dir(env.PCSD_CMDLINE_ENTRY_RB_SCRIPT),
             env.PCSD_STATIC_FILES_DIR: pcsd_dir(env.PCSD_STATIC_FILES_DIR_NAME),
@@ -75,6 +79,8 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_DEBUG: "true",
             env.PCSD_DISABLE_GUI: "true",
             env.PCSD_SESSION_LIFETIME: str(session_lifetime),
+            env.PCSD_RUBY_WORKERS: "0",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "10",
             env.PCSD_DEV: "true",
             env.HTTPS_PROXY: "proxy1",
             env.NO_PROXY: "host",
@@ -91,6 +97,8 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                 env.PCSD_DEBUG: True,
                 env.PCSD_DISABLE_GUI: True,
                 env.PCSD_SESSION_LIFETIME: session_lifetime,
+                env.PCSD_RUBY_WORKERS: 0,
+                env.PCSD_RUBY_WORKER_MAX_REQUESTS: 10,
                 env.GEM_HOME: pcsd_dir(settings.pcsd_gem_path),
                 env.PCSD_CMDLINE_ENTRY: pcsd_dir(
                     env.PCSD_CMDLINE_ENTRY_RB_SCRIPT
@@ -115,6 +123,23 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             ]
         )
 
+    def test_error_on_invalid_ruby_workers(self):
+        environ = {
+            env.PCSD_RUBY_WORKERS: "-1",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "many",
+        }
+        self.assert_environ_produces_modified_pcsd_env(
+            environ,
+            specific_env_values={**environ, "has_errors": True},
+            errors=[
+                "Invalid PCSD_RUBY_WORKERS value '-1'"
+                    " (it must be a non-negative integer)"
+                ,
+                "Invalid PCSD_RUBY_WORKER_MAX_REQUESTS value 'many'"
+                    " (it must be a non-negative integer)"
+                ,
+            ]
+        )
 
     def test_report_invalid_ssl_ciphers(self):
         environ = {env.PCSD_SSL_CIPHERS: "invalid ;@{}+ ciphers"}
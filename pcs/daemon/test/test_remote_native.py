@@ -0,0 +1,129 @@
+import json
+import os.path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from tornado.testing import AsyncTestCase, gen_test
+
+from pcs.daemon import remote_native
+from pcs.test.tools.misc import create_setup_patch_mixin, get_test_resource as rc
+
+SetupPatchMixin = create_setup_patch_mixin(remote_native)
+
+class ResultCache(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.time = 0
+        self.cache = remote_native.ResultCache(10, now=lambda: self.time)
+        self.sync_fn = mock.Mock(return_value="result")
+
+    @gen_test
+    def test_reuse_result_until_expired(self):
+        for time in [0, 9]:
+            self.time = time
+            result = yield self.cache.get("key", self.sync_fn, "arg")
+            self.assertEqual(result, "result")
+        self.sync_fn.assert_called_once_with("arg")
+        self.time = 10
+        yield self.cache.get("key", self.sync_fn, "arg")
+        self.assertEqual(self.sync_fn.call_count, 2)
+
+    @gen_test
+    def test_different_keys(self):
+        yield self.cache.get("key1", self.sync_fn)
+        yield self.cache.get("key2", self.sync_fn)
+        self.assertEqual(self.sync_fn.call_count, 2)
+
+    @gen_test
+    def test_do_not_cache_errors(self):
+        self.sync_fn.side_effect = [ValueError(), "result"]
+        with self.assertRaises(ValueError):
+            yield self.cache.get("key", self.sync_fn)
+        result = yield self.cache.get("key", self.sync_fn)
+        self.assertEqual(result, "result")
+
+class Token(TestCase, SetupPatchMixin):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        users_conf = os.path.join(tmp_dir.name, "pcs_users.conf")
+        with open(users_conf, "w") as users_file:
+            json.dump(
+                [
+                    {"username": "hacluster", "token": "super-token"},
+                    {"username": "user", "token": "user-token"},
+                ],
+                users_file
+            )
+        self.setup_patch("settings.pcsd_users_conf_location", users_conf)
+
+    def test_get_token_user(self):
+        self.assertEqual(
+            remote_native.get_token_user("user-token"),
+            "user"
+        )
+
+    def test_get_token_user_invalid(self):
+        self.assertIsNone(remote_native.get_token_user("unknown"))
+        self.assertIsNone(remote_native.get_token_user(None))
+
+    def test_superuser(self):
+        self.assertTrue(
+            remote_native.is_superuser_request({"token": "super-token"})
+        )
+
+    def test_superuser_acting_as_another_user(self):
+        self.assertFalse(
+            remote_native.is_superuser_request({
+                "token": "super-token",
+                "CIB_user": "user",
+            })
+        )
+
+    def test_not_superuser(self):
+        self.assertFalse(
+            remote_native.is_superuser_request({"token": "user-token"})
+        )
+
+class GetConfigs(TestCase, SetupPatchMixin):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.settings_conf = os.path.join(tmp_dir.name, "pcs_settings.conf")
+        with open(self.settings_conf, "w") as settings_file:
+            settings_file.write("settings")
+        self.setup_patch("settings.corosync_conf_file", rc("corosync.conf"))
+        self.setup_patch(
+            "settings.pcsd_settings_conf_location",
+            self.settings_conf
+        )
+        self.setup_patch(
+            "settings.pcsd_known_hosts_location",
+            os.path.join(tmp_dir.name, "known-hosts")
+        )
+
+    def test_success(self):
+        self.assertEqual(
+            remote_native.get_configs("test99"),
+            {
+                "status": "ok",
+                "cluster_name": "test99",
+                "configs": {
+                    "pcs_settings.conf": {"type": "file", "text": "settings"},
+                    "known-hosts": {"type": "file", "text": None},
+                },
+            }
+        )
+
+    def test_wrong_cluster_name(self):
+        self.assertEqual(
+            remote_native.get_configs("another"),
+            {"status": "wrong_cluster_name"}
+        )
+
+    def test_not_in_cluster(self):
+        self.setup_patch("settings.corosync_conf_file", "/nonexistent/file")
+        self.assertEqual(
+            remote_native.get_configs("test99"),
+            {"status": "not_in_cluster"}
+        )
@@ -4,6 +4,7 @@ from base64 import b64encode
 from unittest import TestCase, mock
 from urllib.parse import urlencode
 
+from tornado.concurrent import Future
 from tornado.httputil import HTTPServerRequest
 from tornado.testing import AsyncTestCase, gen_test
 from tornado.web import HTTPError
@@ -181,3 +182,98 @@ class ProcessResponseLog(TestCase):
             message="ruby_message",
             group_id=1,
         )
+
+class Worker:
+    def __init__(self, response=b"response"):
+        self.response = response
+        self.request_count = 0
+        self.is_alive = True
+        self.stopped = False
+        self.killed = False
+        self.hang = False
+
+    async def communicate(self, request_json):
+        self.request_count += 1
+        if self.hang:
+            await Future()
+        return self.response
+
+    def stop(self):
+        self.stopped = True
+        self.is_alive = False
+
+    def kill(self):
+        self.killed = True
+        self.is_alive = False
+
+class RubyWorkerPool(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.workers = []
+
+    def spawn_worker(self):
+        self.workers.append(Worker())
+        return self.workers[-1]
+
+    def create_pool(
+        self, size=1, max_requests=10, max_queued=10, request_timeout=None
+    ):
+        return ruby_pcsd.RubyWorkerPool(
+            self.spawn_worker, size, max_requests, max_queued, request_timeout
+        )
+
+    @gen_test
+    def test_reuse_worker(self):
+        pool = self.create_pool()
+        for _ in range(3):
+            result = yield pool.communicate("{}")
+            self.assertEqual(result, b"response")
+        self.assertEqual(len(self.workers), 1)
+        self.assertEqual(self.workers[0].request_count, 3)
+
+    @gen_test
+    def test_recycle_worker_after_max_requests(self):
+        pool = self.create_pool(max_requests=2)
+        for _ in range(3):
+            yield pool.communicate("{}")
+        self.assertEqual(len(self.workers), 2)
+        self.assertTrue(self.workers[0].stopped)
+        self.assertFalse(self.workers[1].stopped)
+
+    @gen_test
+    def test_replace_crashed_worker(self):
+        pool = self.create_pool()
+        yield pool.communicate("{}")
+        self.workers[0].is_alive = False
+        yield pool.communicate("{}")
+        self.assertEqual(len(self.workers), 2)
+
+    @gen_test
+    def test_replace_worker_without_response(self):
+        pool = self.create_pool()
+        yield pool.communicate("{}")
+        self.workers[0].response = b""
+        result = yield pool.communicate("{}")
+        self.assertEqual(result, b"")
+        self.assertTrue(self.workers[0].stopped)
+        yield pool.communicate("{}")
+        self.assertEqual(len(self.workers), 2)
+
+    @gen_test
+    def test_kill_worker_not_responding(self):
+        pool = self.create_pool(request_timeout=0.01)
+        yield pool.communicate("{}")
+        self.workers[0].hang = True
+        result = yield pool.communicate("{}")
+        self.assertEqual(result, b"")
+        self.assertTrue(self.workers[0].killed)
+        result = yield pool.communicate("{}")
+        self.assertEqual(result, b"response")
+        self.assertEqual(len(self.workers), 2)
+
+    @gen_test
+    def test_refuse_when_queue_is_full(self):
+        pool = self.create_pool(size=0, max_queued=0)
+        with self.assertRaises(HTTPError) as cm:
+            yield pool.communicate("{}")
+        self.assertEqual(cm.exception.status_code, 503)
@@ -1,3 +1,4 @@
+import os.path
 from urllib.parse import urlparse
 
 from pcs import (
@@ -7,6 +8,12 @@ from pcs import (
 )
 from pcs.cli.common import parse_args
 from pcs.cli.common.errors import CmdLineInputError
+from pcs.common.host import (
+    get_known_hosts_file_path,
+    read_known_hosts_file,
+    update_known_hosts_file,
+)
+from pcs.common.tools import format_environment_error
 from pcs.lib.errors import LibraryError
 
 def host_cmd(lib, argv, modifiers):
@@ -88,6 +95,11 @@ def deauth_cmd(lib, argv, modifiers):
         remove_hosts = list(utils.read_known_hosts_file().keys())
     else:
         remove_hosts = argv
+    if not os.path.exists(settings.corosync_conf_file):
+        # The host is not in a cluster, there is nothing to synchronize and
+        # the hosts can be removed without pcsd.
+        _remove_local_known_hosts(remove_hosts)
+        return
     output, retval = utils.run_pcsdcli(
         'remove_known_hosts',
         {'host_names': remove_hosts}
@@ -121,3 +133,24 @@ def deauth_cmd(lib, argv, modifiers):
             utils.err('Unable to communicate with pcsd')
         return
     utils.err('Unable to communicate with pcsd')
+
+def _remove_local_known_hosts(host_name_list):
+    if not host_name_list:
+        return
+    path = get_known_hosts_file_path()
+    try:
+        known_hosts = read_known_hosts_file(path).known_hosts
+        not_found_list = [
+            name for name in host_name_list if name not in known_hosts
+        ]
+        if not_found_list:
+            utils.err("Following hosts were not found: '{hosts}'".format(
+                hosts="', '".join(not_found_list)
+            ))
+        update_known_hosts_file(path, remove_name_list=host_name_list)
+    except EnvironmentError as e:
+        utils.err("Unable to save known-hosts: {0}".format(
+            format_environment_error(e)
+        ))
+    except ValueError:
+        utils.err("Unable to parse known host file.")
@@ -0,0 +1,154 @@
+"""
+Cache of resource and stonith agents' metadata shared by pcs processes.
+
+Getting metadata means running the agent which takes hundreds of milliseconds
+for some agents. Cached metadata of an agent are valid as long as the files
+they come from, i.e. the agent's executable and crm_resource, keep their
+modification time and size. Metadata of agents whose files cannot be located
+are not cached.
+
+Metadata are not secret, the cache can be read by everyone. Only users allowed
+to write to the cache directory store metadata in it.
+"""
+import json
+import os
+import os.path
+import tempfile
+from urllib.parse import quote, unquote
+
+
+_FILE_SUFFIX = ".json"
+
+_metadata_cache = None
+
+def enable(cache_dir):
+    """
+    Make pcs use an agent metadata cache stored in the specified directory
+
+    string cache_dir -- path to the cache directory
+    """
+    global _metadata_cache
+    if _metadata_cache is None or _metadata_cache.cache_dir != cache_dir:
+        _metadata_cache = AgentMetadataCache(cache_dir)
+
+def disable():
+    global _metadata_cache
+    _metadata_cache = None
+
+def get_cache():
+    """
+    Return the agent metadata cache or None if the cache is disabled
+    """
+    return _metadata_cache
+
+def get_fingerprint(file_list):
+    """
+    Return a json serializable identification of files' content or None
+
+    iterable file_list -- paths to the files, None is returned if any of them
+        does not exist
+    """
+    fingerprint = []
+    for path in file_list:
+        try:
+            stat = os.stat(path)
+        except EnvironmentError:
+            return None
+        fingerprint.append([path, stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+class AgentMetadataCache(object):
+    def __init__(self, cache_dir):
+        """
+        string cache_dir -- path to the cache directory
+        """
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def get(self, agent_name, file_list):
+        """
+        Return cached metadata or None if they are not cached or outdated
+
+        string agent_name -- full name of the agent
+        iterable file_list -- files the metadata come from
+        """
+        fingerprint = get_fingerprint(file_list)
+        if fingerprint is None:
+            return None
+        try:
+            with open(self._get_path(agent_name)) as cache_file:
+                data = json.load(cache_file)
+            if data["fingerprint"] != fingerprint:
+                return None
+            return data["metadata"]
+        except (EnvironmentError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, agent_name, file_list, metadata):
+        """
+        Store freshly loaded metadata
+
+        string agent_name -- full name of the agent
+        iterable file_list -- files the metadata come from
+        string metadata -- metadata of the agent
+        """
+        fingerprint = get_fingerprint(file_list)
+        if fingerprint is None:
+            return
+        # The cache is an optimization only. Users who cannot write to the
+        # cache directory get metadata from agents every time.
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir, 0o755)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir)
+        except EnvironmentError:
+            return
+        try:
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(
+                    {"fingerprint": fingerprint, "metadata": metadata},
+                    tmp_file
+                )
+            os.rename(tmp_path, self._get_path(agent_name))
+        except EnvironmentError:
+            try:
+                os.unlink(tmp_path)
+            except EnvironmentError:
+                pass
+
+    def get_agent_names(self):
+        """
+        Return names of agents with cached metadata, outdated ones included
+        """
+        try:
+            file_name_list = os.listdir(self._cache_dir)
+        except EnvironmentError:
+            return []
+        return sorted(
+            unquote(file_name[:-len(_FILE_SUFFIX)])
+            for file_name in file_name_list
+            if file_name.endswith(_FILE_SUFFIX)
+        )
+
+    def clear(self):
+        """
+        Remove all cached metadata, raise EnvironmentError on failure
+        """
+        try:
+            file_name_list = os.listdir(self._cache_dir)
+        except FileNotFoundError:
+            return
+        for file_name in file_name_list:
+            if file_name.endswith(_FILE_SUFFIX):
+                os.unlink(os.path.join(self._cache_dir, file_name))
+
+    def _get_path(self, agent_name):
+        # Keep agent names readable in file names, so they can be listed for
+        # shell completion without reading the files.
+        return os.path.join(
+            self._cache_dir, quote(agent_name, safe=":") + _FILE_SUFFIX
+        )
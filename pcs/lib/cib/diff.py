@@ -0,0 +1,266 @@
+"""
+Creating and applying CIB diffs in the pacemaker xml patchset format v2, the
+same format crm_diff produces. Creating diffs here saves writing both CIBs to
+temporary files and running crm_diff which parses them again.
+"""
+from copy import deepcopy
+import re
+
+from lxml import etree
+
+from pcs.lib.xml_tools import etree_to_str
+
+
+# crm_diff --no-version ignores changes of the CIB version
+_VERSION_ATTRIBUTES = frozenset(["admin_epoch", "epoch", "num_updates"])
+_PATH_SEGMENT_RE = re.compile(r"/([^/\[]+)(?:\[@id='([^']*)'\])?")
+
+class DiffNotSupported(Exception):
+    """
+    The CIBs contain something which cannot be expressed by the native diff
+    reliably, crm_diff should be used instead
+    """
+
+def diff_cibs(cib_old, cib_new):
+    """
+    Return a patchset turning cib_old into cib_new as a string, return an empty
+    string if there is no difference
+
+    etree cib_old -- original CIB
+    etree cib_new -- modified CIB
+    """
+    cib_old = _get_root_element(cib_old)
+    cib_new = _get_root_element(cib_new)
+    if cib_old.tag != cib_new.tag:
+        raise DiffNotSupported("Root elements differ")
+    delete_list = []
+    change_list = []
+    _diff_element(
+        cib_old, cib_new, delete_list, change_list, ignore=_VERSION_ATTRIBUTES
+    )
+    if not delete_list and not change_list:
+        return ""
+    patchset = etree.Element("diff", format="2")
+    patchset.extend(delete_list)
+    patchset.extend(change_list)
+    return etree_to_str(patchset)
+
+def apply_patchset(cib, patchset):
+    """
+    Apply a patchset to a CIB in place the same way pacemaker does
+
+    etree cib -- CIB to be patched
+    etree patchset -- patchset in the format v2
+    """
+    cib = _get_root_element(cib)
+    positioned_list = []
+    for change in patchset.iterfind("change"):
+        operation = change.get("operation")
+        match = _find_by_path(cib, change.get("path"))
+        if match is None:
+            if operation == "delete":
+                continue
+            raise ValueError(
+                "No element matches '{0}'".format(change.get("path"))
+            )
+        if operation in ("create", "move"):
+            positioned_list.append(
+                (int(change.get("position", "0")), operation, change, match)
+            )
+            if operation == "move":
+                # put the element to the end for now, it gets its final
+                # position once all elements are present
+                match.getparent().append(match)
+        elif operation == "delete":
+            match.getparent().remove(match)
+        elif operation == "modify":
+            result = change.find("change-result")
+            match.attrib.clear()
+            match.attrib.update(result[0].attrib)
+        else:
+            raise ValueError("Unknown operation '{0}'".format(operation))
+
+    # sorting is stable so the order of the patchset is kept for elements with
+    # the same position
+    positioned_list.sort(key=lambda item: item[0])
+    for position, operation, change, match in positioned_list:
+        if operation == "create":
+            parent, element = match, deepcopy(change[0])
+        else:
+            parent, element = match.getparent(), match
+        sibling_list = list(parent)
+        if position >= len(sibling_list):
+            if operation == "create":
+                parent.append(element)
+        elif sibling_list[position] is not element:
+            sibling_list[position].addprevious(element)
+
+def _get_root_element(tree):
+    return tree.getroot() if hasattr(tree, "getroot") else tree
+
+def _find_by_path(root, path):
+    element = None
+    for index, segment in enumerate(_PATH_SEGMENT_RE.finditer(path)):
+        tag, element_id = segment.groups()
+        candidate_list = (
+            [root] if index == 0
+            else [child for child in element if child.tag == tag]
+        )
+        element = None
+        for candidate in candidate_list:
+            if (
+                candidate.tag == tag
+                and
+                (element_id is None or candidate.get("id") == element_id)
+            ):
+                element = candidate
+                break
+        if element is None:
+            return None
+    return element
+
+def _get_path(element):
+    segment_list = []
+    while element is not None:
+        element_id = element.get("id")
+        if element_id is None:
+            segment_list.append("/{0}".format(element.tag))
+        else:
+            if "'" in element_id:
+                raise DiffNotSupported(
+                    "Id '{0}' cannot be used in a path".format(element_id)
+                )
+            segment_list.append(
+                "/{0}[@id='{1}']".format(element.tag, element_id)
+            )
+        element = element.getparent()
+    return "".join(reversed(segment_list))
+
+def _get_children(element):
+    """
+    Return child elements mapped by their tag and id
+    """
+    child_list = []
+    child_map = {}
+    for child in element:
+        if not isinstance(child.tag, str):
+            # comments, processing instructions
+            raise DiffNotSupported("Unsupported node in '{0}'".format(
+                _get_path(element)
+            ))
+        key = (child.tag, child.get("id"))
+        if key in child_map:
+            # elements cannot be matched and found by a path reliably
+            raise DiffNotSupported("Ambiguous elements in '{0}'".format(
+                _get_path(element)
+            ))
+        child_map[key] = child
+        child_list.append((key, child))
+    return child_list, child_map
+
+def _is_same(element_old, element_new):
+    return (
+        etree.tostring(element_old, with_tail=False)
+        ==
+        etree.tostring(element_new, with_tail=False)
+    )
+
+def _strip(text):
+    return text.strip() if text else ""
+
+def _diff_element(
+    element_old, element_new, delete_list, change_list, ignore=frozenset()
+):
+    # Changes are ordered the same way pacemaker orders them: all deletions
+    # first, then a modification of an element, changes of its children and
+    # a move of the element.
+    if _strip(element_old.text) != _strip(element_new.text):
+        raise DiffNotSupported("Text of '{0}' changed".format(
+            _get_path(element_new)
+        ))
+    _diff_attributes(element_old, element_new, change_list, ignore)
+
+    child_list_old, child_map_old = _get_children(element_old)
+    child_list_new, child_map_new = _get_children(element_new)
+    matched_position_old = {}
+    for key, child_old in child_list_old:
+        if key in child_map_new:
+            matched_position_old[key] = len(matched_position_old)
+        else:
+            delete_list.append(etree.Element(
+                "change", operation="delete", path=_get_path(child_old)
+            ))
+
+    matched_position_new = 0
+    for position, (key, child_new) in enumerate(child_list_new):
+        if key not in child_map_old:
+            change = etree.Element(
+                "change",
+                operation="create",
+                path=_get_path(element_new),
+                position=str(position),
+            )
+            created = deepcopy(child_new)
+            created.tail = None
+            change.append(created)
+            change_list.append(change)
+            continue
+        child_old = child_map_old[key]
+        if not _is_same(child_old, child_new):
+            _diff_element(child_old, child_new, delete_list, change_list)
+        if matched_position_old[key] != matched_position_new:
+            change_list.append(etree.Element(
+                "change",
+                operation="move",
+                path=_get_path(child_new),
+                position=str(position),
+            ))
+        matched_position_new += 1
+
+def _diff_attributes(element_old, element_new, change_list, ignore):
+    attrs_old = element_old.attrib
+    attrs_new = element_new.attrib
+    change_attr_list = []
+    for name, value in attrs_new.items():
+        if name not in ignore and attrs_old.get(name) != value:
+            change_attr_list.append(
+                {"name": name, "operation": "set", "value": value}
+            )
+    for name in attrs_old.keys():
+        if name not in ignore and name not in attrs_new:
+            change_attr_list.append({"name": name, "operation": "unset"})
+    if not change_attr_list:
+        return
+
+    change = etree.Element(
+        "change", operation="modify", path=_get_path(element_new)
+    )
+    change_list_element = etree.SubElement(change, "change-list")
+    for change_attr in change_attr_list:
+        etree.SubElement(change_list_element, "change-attr", change_attr)
+    result = etree.SubElement(change, "change-result")
+    # the result replaces all attributes of the element, keep ignored
+    # attributes as they are in the original element
+    result_element = etree.SubElement(result, element_new.tag)
+    for name, value in attrs_new.items():
+        if name not in ignore:
+            result_element.set(name, value)
+    for name, value in attrs_old.items():
+        if name in ignore:
+            result_element.set(name, value)
+    change_list.append(change)
+
+def are_equivalent(cib_a, cib_b):
+    """
+    Check two CIBs are the same apart from whitespace and the CIB version
+    """
+    return _canonical(cib_a) == _canonical(cib_b)
+
+def _canonical(cib):
+    cib = deepcopy(_get_root_element(cib))
+    for name in _VERSION_ATTRIBUTES:
+        cib.attrib.pop(name, None)
+    for element in cib.iter():
+        element.text = _strip(element.text) or None
+        element.tail = None
+    return etree.tostring(cib)
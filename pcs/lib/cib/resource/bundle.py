@@ -207,12 +207,14 @@ def validate_update(
     )
     report_list.extend(
         _validate_map_ids_exist(
-            bundle_el, "port-mapping", "port-map", port_map_remove
+            bundle_el, "port-mapping", "port-map", port_map_remove,
+            id_provider.id_index
         )
     )
     report_list.extend(
         _validate_map_ids_exist(
-            bundle_el, "storage-mapping", "storage-map", storage_map_remove
+            bundle_el, "storage-mapping", "storage-map", storage_map_remove,
+            id_provider.id_index
         )
     )
     return report_list
@@ -597,12 +599,15 @@ def _validate_storage_map_list(options_list, id_provider, force_options):
         )
     return report_list
 
-def _validate_map_ids_exist(bundle_el, map_type, map_label, id_list):
+def _validate_map_ids_exist(
+    bundle_el, map_type, map_label, id_list, id_index=None
+):
     report_list = []
     for id in id_list:
         try:
             find_element_by_tag_and_id(
-                map_type, bundle_el, id, id_types=[map_label]
+                map_type, bundle_el, id, id_types=[map_label],
+                id_index=id_index
             )
         except LibraryError as e:
             report_list.extend(e.args)
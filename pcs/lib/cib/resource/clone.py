@@ -26,20 +26,21 @@ def is_master(resource_el):
 def is_any_clone(resource_el):
     return resource_el.tag in ALL_TAGS
 
-def create_id(primitive_element):
+def create_id(primitive_element, id_provider=None):
     """
     Create id for clone element based on contained primitive_element.
 
     etree.Element primitive_element is resource which will be cloned.
         It must be connected into the cib to ensure that the resulting id is
         unique!
+    IdProvider id_provider -- elements' ids generator
     """
-    return find_unique_id(
-        primitive_element,
-        "{0}-{1}".format(primitive_element.get("id"), TAG_CLONE)
-    )
+    proposed_id = "{0}-{1}".format(primitive_element.get("id"), TAG_CLONE)
+    if id_provider:
+        return id_provider.allocate_id(proposed_id)
+    return find_unique_id(primitive_element, proposed_id)
 
-def append_new(resources_section, primitive_element, options):
+def append_new(resources_section, primitive_element, options, id_provider=None):
     """
     Append a new clone element (containing the primitive_element) to the
     resources_section.
@@ -47,16 +48,17 @@ def append_new(resources_section, primitive_element, options):
     etree.Element resources_section is place where new clone will be appended.
     etree.Element primitive_element is resource which will be cloned.
     dict options is source for clone meta options
+    IdProvider id_provider -- elements' ids generator
     """
     clone_element = etree.SubElement(
         resources_section,
         TAG_CLONE,
-        id=create_id(primitive_element),
+        id=create_id(primitive_element, id_provider),
     )
     clone_element.append(primitive_element)
 
     if options:
-        append_new_meta_attributes(clone_element, options)
+        append_new_meta_attributes(clone_element, options, id_provider)
 
     return clone_element
 
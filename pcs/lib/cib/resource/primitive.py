@@ -25,7 +25,8 @@ def create(
     allow_invalid_operation=False,
     allow_invalid_instance_attributes=False,
     use_default_operations=True,
-    resource_type="resource"
+    resource_type="resource",
+    id_provider=None
 ):
     """
     Prepare all parts of primitive resource and append it into cib.
@@ -43,6 +44,7 @@ def create(
     bool use_default_operations is flag for completion operations with default
         actions specified in resource agent
     string resource_type -- describes the resource for reports
+    IdProvider id_provider -- elements' ids generator and uniqueness checker
     """
     if raw_operation_list is None:
         raw_operation_list = []
@@ -51,8 +53,13 @@ def create(
     if instance_attributes is None:
         instance_attributes = {}
 
-    if does_id_exist(resources_section, resource_id):
-        raise LibraryError(reports.id_already_exists(resource_id))
+    if id_provider is None:
+        if does_id_exist(resources_section, resource_id):
+            raise LibraryError(reports.id_already_exists(resource_id))
+    else:
+        report_list = id_provider.book_ids(resource_id)
+        if report_list:
+            raise LibraryError(*report_list)
     validate_id(resource_id, "{0} name".format(resource_type))
 
     operation_list = prepare_operations(
@@ -80,14 +87,16 @@ def create(
         resource_agent.get_type(),
         instance_attributes=instance_attributes,
         meta_attributes=meta_attributes,
-        operation_list=operation_list
+        operation_list=operation_list,
+        id_provider=id_provider
     )
 
 def append_new(
     resources_section, resource_id, standard, provider, agent_type,
     instance_attributes=None,
     meta_attributes=None,
-    operation_list=None
+    operation_list=None,
+    id_provider=None
 ):
     """
     Append a new primitive element to the resources_section.
@@ -101,6 +110,7 @@ def append_new(
     dict meta_attributes will be nvpairs inside meta_attributes element
     list operation_list contains dicts representing operations
         (e.g. [{"name": "monitor"}, {"name": "start"}])
+    IdProvider id_provider -- elements' ids generator
     """
     attributes = {
         "id": resource_id,
@@ -114,15 +124,19 @@ def append_new(
     if instance_attributes:
         append_new_instance_attributes(
             primitive_element,
-            instance_attributes
+            instance_attributes,
+            id_provider
         )
 
     if meta_attributes:
-        append_new_meta_attributes(primitive_element, meta_attributes)
+        append_new_meta_attributes(
+            primitive_element, meta_attributes, id_provider
+        )
 
     create_operations(
         primitive_element,
-        operation_list if operation_list else []
+        operation_list if operation_list else [],
+        id_provider
     )
 
     return primitive_element
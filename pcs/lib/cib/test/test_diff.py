@@ -0,0 +1,160 @@
+from lxml import etree
+from unittest import TestCase
+
+from pcs.lib.cib import diff
+from pcs.test.tools.assertions import assert_xml_equal
+
+
+CIB = """
+    <cib epoch="1" num_updates="0" admin_epoch="0">
+        <configuration>
+            <crm_config/>
+            <resources>
+                <primitive id="A" class="ocf" provider="pacemaker" type="A">
+                    <meta_attributes id="A-meta">
+                        <nvpair id="A-meta-a" name="a" value="1"/>
+                        <nvpair id="A-meta-b" name="b" value="2"/>
+                    </meta_attributes>
+                </primitive>
+                <primitive id="B" class="ocf" provider="pacemaker" type="B"/>
+                <primitive id="C" class="ocf" provider="pacemaker" type="C"/>
+            </resources>
+            <constraints/>
+        </configuration>
+        <status/>
+    </cib>
+"""
+
+class DiffCibs(TestCase):
+    def setUp(self):
+        self.cib_old = etree.fromstring(CIB)
+        self.cib_new = etree.fromstring(CIB)
+
+    def assert_diff(self, expected_diff):
+        real_diff = diff.diff_cibs(self.cib_old, self.cib_new)
+        assert_xml_equal(expected_diff, real_diff)
+        # the diff turns the old cib to the new one
+        diff.apply_patchset(self.cib_old, etree.fromstring(real_diff))
+        self.assertTrue(diff.are_equivalent(self.cib_old, self.cib_new))
+
+    def find(self, path):
+        return self.cib_new.find(path)
+
+    def test_no_change(self):
+        self.assertEqual("", diff.diff_cibs(self.cib_old, self.cib_new))
+
+    def test_version_change_ignored(self):
+        self.cib_new.set("epoch", "5")
+        self.assertEqual("", diff.diff_cibs(self.cib_old, self.cib_new))
+
+    def test_whitespace_change_ignored(self):
+        self.find("configuration/crm_config").text = "\n  "
+        self.assertEqual("", diff.diff_cibs(self.cib_old, self.cib_new))
+
+    def test_set_and_unset_attributes(self):
+        self.find(".//nvpair[@id='A-meta-a']").set("value", "10")
+        del self.find(".//primitive[@id='B']").attrib["provider"]
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="modify"
+                    path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta']/nvpair[@id='A-meta-a']"
+                >
+                    <change-list>
+                        <change-attr name="value" operation="set" value="10"/>
+                    </change-list>
+                    <change-result>
+                        <nvpair id="A-meta-a" name="a" value="10"/>
+                    </change-result>
+                </change>
+                <change operation="modify"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                >
+                    <change-list>
+                        <change-attr name="provider" operation="unset"/>
+                    </change-list>
+                    <change-result>
+                        <primitive id="B" class="ocf" type="B"/>
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_create_and_delete(self):
+        resources = self.find("configuration/resources")
+        resources.remove(self.find(".//primitive[@id='B']"))
+        etree.SubElement(resources, "primitive", id="D")
+        etree.SubElement(
+            self.find("configuration/constraints"), "rsc_order", id="O"
+        )
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="delete"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                />
+                <change operation="create" path="/cib/configuration/resources"
+                    position="2"
+                >
+                    <primitive id="D"/>
+                </change>
+                <change operation="create"
+                    path="/cib/configuration/constraints" position="0"
+                >
+                    <rsc_order id="O"/>
+                </change>
+            </diff>
+        """)
+
+    def test_move(self):
+        resources = self.find("configuration/resources")
+        resources.insert(0, self.find(".//primitive[@id='C']"))
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="move"
+                    path="/cib/configuration/resources/primitive[@id='C']"
+                    position="0"
+                />
+                <change operation="move"
+                    path="/cib/configuration/resources/primitive[@id='A']"
+                    position="1"
+                />
+                <change operation="move"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                    position="2"
+                />
+            </diff>
+        """)
+
+    def test_move_and_create(self):
+        meta = self.find(".//meta_attributes")
+        meta.insert(0, self.find(".//nvpair[@id='A-meta-b']"))
+        etree.SubElement(meta, "nvpair", id="A-meta-c", name="c", value="3")
+        meta.insert(1, meta[-1])
+        real_diff = diff.diff_cibs(self.cib_old, self.cib_new)
+        diff.apply_patchset(self.cib_old, etree.fromstring(real_diff))
+        self.assertTrue(diff.are_equivalent(self.cib_old, self.cib_new))
+
+    def test_comment_not_supported(self):
+        self.find("configuration/resources").append(etree.Comment("x"))
+        self.assertRaises(
+            diff.DiffNotSupported,
+            lambda: diff.diff_cibs(self.cib_old, self.cib_new)
+        )
+
+    def test_ambiguous_elements_not_supported(self):
+        etree.SubElement(self.find("configuration/constraints"), "rsc_order")
+        etree.SubElement(self.find("configuration/constraints"), "rsc_order")
+        self.assertRaises(
+            diff.DiffNotSupported,
+            lambda: diff.diff_cibs(self.cib_old, self.cib_new)
+        )
+
+    def test_id_with_apostrophe_not_supported(self):
+        for cib in (self.cib_old, self.cib_new):
+            etree.SubElement(
+                cib.find("configuration/constraints"), "rsc_order", id="a'b"
+            )
+        self.find(".//rsc_order").set("kind", "Optional")
+        self.assertRaises(
+            diff.DiffNotSupported,
+            lambda: diff.diff_cibs(self.cib_old, self.cib_new)
+        )
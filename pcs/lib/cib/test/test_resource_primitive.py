@@ -32,15 +32,18 @@ class AppendNew(TestCase):
     ):
         create_operations.assert_called_once_with(
             primitive_element,
-            self.operation_list
+            self.operation_list,
+            None
         )
         append_new_meta_attributes.assert_called_once_with(
             primitive_element,
-            self.meta_attributes
+            self.meta_attributes,
+            None
         )
         append_new_instance_attributes.assert_called_once_with(
             primitive_element,
-            self.instance_attributes
+            self.instance_attributes,
+            None
         )
 
     def test_append_without_provider(
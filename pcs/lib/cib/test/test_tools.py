@@ -213,6 +213,104 @@ class DoesIdExistTest(CibToolsTest):
         """)
         self.assertTrue(lib.does_id_exist(tree, "a"))
 
+class DoesIdExistIndexedTest(DoesIdExistTest):
+    def setUp(self):
+        super(DoesIdExistIndexedTest, self).setUp()
+        does_id_exist = lib.does_id_exist
+        patcher = mock.patch.object(
+            lib,
+            "does_id_exist",
+            lambda tree, check_id: does_id_exist(
+                tree, check_id, lib.IdIndex(tree)
+            )
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+class IdIndexTest(TestCase):
+    def setUp(self):
+        self.tree = etree.fromstring("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <group id="G">
+                            <primitive id="A"/>
+                        </group>
+                        <primitive id="B">
+                            <meta_attributes id="B-meta">
+                                <nvpair id="B-meta-remote" name="remote-node"
+                                    value="R"
+                                />
+                            </meta_attributes>
+                        </primitive>
+                    </resources>
+                </configuration>
+                <status><node_state id="S"/></status>
+            </cib>
+        """)
+        self.index = lib.IdIndex(self.tree)
+
+    def test_removed_elements(self):
+        resources = self.tree.find(".//resources")
+        resources.remove(resources.find("primitive"))
+        self.assertFalse(self.index.does_id_exist("B"))
+        self.assertFalse(self.index.does_id_exist("B-meta-remote"))
+        self.assertFalse(self.index.does_id_exist("R"))
+        self.assertTrue(self.index.does_id_exist("A"))
+
+    def test_changed_id(self):
+        self.tree.find(".//group").set("id", "G2")
+        self.assertFalse(self.index.does_id_exist("G"))
+
+    def test_added_elements(self):
+        group = self.tree.find(".//group")
+        primitive = etree.SubElement(group, "primitive", id="C")
+        etree.SubElement(primitive, "operations", id="C-ops")
+        self.index.add(primitive)
+        self.assertTrue(self.index.does_id_exist("C"))
+        self.assertTrue(self.index.does_id_exist("C-ops"))
+
+    def test_get_elements_including_status(self):
+        self.assertEqual(
+            [self.tree.find(".//node_state")], self.index.get_elements("S")
+        )
+        self.assertFalse(self.index.does_id_exist("S"))
+
+    def test_find_element(self):
+        self.assertEqual(
+            "A",
+            lib.find_element_by_tag_and_id(
+                "primitive", self.tree.find(".//group"), "A",
+                id_index=self.index
+            ).get("id")
+        )
+
+    def test_find_element_in_another_context(self):
+        assert_raise_library_error(
+            lambda: lib.find_element_by_tag_and_id(
+                "primitive", self.tree.find(".//group"), "B",
+                id_index=self.index
+            ),
+            (
+                severities.ERROR,
+                report_codes.OBJECT_WITH_ID_IN_UNEXPECTED_CONTEXT,
+                {
+                    "type": "primitive",
+                    "id": "B",
+                    "expected_context_type": "group",
+                    "expected_context_id": "G",
+                },
+            ),
+        )
+
+    def test_find_element_not_found(self):
+        self.assertIsNone(
+            lib.find_element_by_tag_and_id(
+                "primitive", self.tree, "X", none_if_id_unused=True,
+                id_index=self.index
+            )
+        )
+
 class FindUniqueIdTest(CibToolsTest):
     def test_already_unique(self):
         self.fixture_add_primitive_with_id("myId")
@@ -12,6 +12,125 @@ from pcs.lib.xml_tools import get_root, get_sub_element
 
 VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 
+class IdIndex(object):
+    """
+    Ids used in the CIB indexed for fast lookups
+
+    The index is built once and it does not notice elements added to the CIB
+    later. Those must be registered by the add method. Removed elements and
+    changed ids are detected on lookup.
+    """
+    def __init__(self, cib_element):
+        """
+        etree cib_element -- any element of the xml to be indexed
+        """
+        self._root = _get_root_element(cib_element)
+        self._element_map = {}
+        self._remote_node_map = {}
+        for element in self._root.iterdescendants():
+            self._add_element(element)
+
+    def add(self, element):
+        """
+        Register an element and its descendants added to the CIB
+
+        etree element -- newly added element
+        """
+        self._add_element(element)
+        for descendant in element.iterdescendants():
+            self._add_element(descendant)
+
+    def does_id_exist(self, check_id):
+        """
+        Check the id is in use, see does_id_exist for details
+
+        string check_id -- id to check
+        """
+        for element in self.get_elements(check_id):
+            if (
+                element.tag not in ("acl_target", "role")
+                and
+                self._is_searched(element)
+            ):
+                return True
+        for nvpair in self._remote_node_map.get(check_id, []):
+            if (
+                _is_remote_node_nvpair(nvpair, check_id)
+                and
+                self._is_live(nvpair)
+                and
+                self._is_searched(nvpair)
+            ):
+                return True
+        return False
+
+    def get_elements(self, element_id):
+        """
+        Return all elements in the CIB with the specified id in document order
+
+        string element_id -- id of the elements
+        """
+        element_list = [
+            element for element in self._element_map.get(element_id, [])
+            if element.get("id") == element_id and self._is_live(element)
+        ]
+        if element_list:
+            self._element_map[element_id] = element_list
+        else:
+            self._element_map.pop(element_id, None)
+        return element_list
+
+    def _add_element(self, element):
+        if not isinstance(element.tag, str):
+            # comments, processing instructions
+            return
+        element_id = element.get("id")
+        if element_id is not None:
+            self._element_map.setdefault(element_id, []).append(element)
+        if _is_remote_node_nvpair(element):
+            self._remote_node_map.setdefault(element.get("value"), []).append(
+                element
+            )
+
+    def _is_live(self, element):
+        # a removed element keeps its document, so look at its ancestors
+        top = element
+        for top in element.iterancestors():
+            pass
+        return top is self._root
+
+    def _is_searched(self, element):
+        # the same elements as searched by does_id_exist: the status section
+        # and sections directly under cib are not searched
+        if self._root.tag != "cib":
+            return True
+        parent = element.getparent()
+        if parent is self._root:
+            return False
+        while parent is not self._root:
+            element, parent = parent, parent.getparent()
+        return element.tag != "status"
+
+def _get_root_element(element):
+    root = get_root(element)
+    return root.getroot() if hasattr(root, "getroot") else root
+
+def _is_remote_node_nvpair(element, value=None):
+    if element.tag != "nvpair" or element.get("name") != "remote-node":
+        return False
+    if value is not None and element.get("value") != value:
+        return False
+    meta_attributes = element.getparent()
+    return (
+        meta_attributes is not None
+        and
+        meta_attributes.tag == "meta_attributes"
+        and
+        meta_attributes.getparent() is not None
+        and
+        meta_attributes.getparent().tag == "primitive"
+    )
+
 class IdProvider(object):
     """
     Book ids for future use in the CIB and generate new ids accordingly
@@ -22,13 +141,29 @@ class IdProvider(object):
         """
         self._cib = get_root(cib_element)
         self._booked_ids = set()
+        self._id_index = None
+
+    @property
+    def id_index(self):
+        """
+        Index of ids in the CIB, built on the first use
+
+        Ids allocated or booked by the provider are expected to be used by
+        elements added to the CIB, so the index does not need to know about
+        those elements.
+        """
+        if self._id_index is None:
+            self._id_index = IdIndex(self._cib)
+        return self._id_index
 
     def allocate_id(self, proposed_id):
         """
         Generate a new unique id based on the proposal and keep track of it
         string proposed_id -- requested id
         """
-        final_id = find_unique_id(self._cib, proposed_id, self._booked_ids)
+        final_id = find_unique_id(
+            self._cib, proposed_id, self._booked_ids, self.id_index
+        )
         self._booked_ids.add(final_id)
         return final_id
 
@@ -42,7 +177,11 @@ class IdProvider(object):
         for id in id_list:
             if id in reported_ids:
                 continue
-            if id in self._booked_ids or does_id_exist(self._cib, id):
+            if (
+                id in self._booked_ids
+                or
+                does_id_exist(self._cib, id, self.id_index)
+            ):
                 report_list.append(reports.id_already_exists(id))
                 reported_ids.add(id)
                 continue
@@ -50,12 +189,15 @@ class IdProvider(object):
         return report_list
 
 
-def does_id_exist(tree, check_id):
+def does_id_exist(tree, check_id, id_index=None):
     """
     Checks to see if id exists in the xml dom passed
     tree cib etree node
     check_id id to check
+    IdIndex id_index -- index of the tree ids, scan the tree if not set
     """
+    if id_index is not None:
+        return id_index.does_id_exist(check_id)
 
     # do not search in /cib/status, it may contain references to previously
     # existing and deleted resources and thus preventing creating them again
@@ -99,25 +241,31 @@ def validate_id_does_not_exist(tree, id):
     if does_id_exist(tree, id):
         raise LibraryError(reports.id_already_exists(id))
 
-def find_unique_id(tree, check_id, reserved_ids=None):
+def find_unique_id(tree, check_id, reserved_ids=None, id_index=None):
     """
     Returns check_id if it doesn't exist in the dom, otherwise it adds
     an integer to the end of the id and increments it until a unique id is found
     etree tree -- cib etree node
     string check_id -- id to check
     iterable reserved_ids -- ids to think about as already used
+    IdIndex id_index -- index of the tree ids, scan the tree if not set
     """
     if not reserved_ids:
         reserved_ids = set()
     counter = 1
     temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
+    while (
+        temp_id in reserved_ids
+        or
+        does_id_exist(tree, temp_id, id_index)
+    ):
         temp_id = "{0}-{1}".format(check_id, counter)
         counter += 1
     return temp_id
 
 def find_element_by_tag_and_id(
-    tag, context_element, element_id, none_if_id_unused=False, id_types=None
+    tag, context_element, element_id, none_if_id_unused=False, id_types=None,
+    id_index=None
 ):
     """
     Return element with given tag and element_id under context_element. When
@@ -130,6 +278,7 @@ def find_element_by_tag_and_id(
     bool none_if_id_unused if the element is not found then return None if True
         or raise a LibraryError if False
     list id_types optional list of descriptions for id / expected types of id
+    IdIndex id_index -- index of the tree ids, scan the tree if not set
     """
     tag_list = [tag] if isinstance(tag, str) else tag
     if id_types is None:
@@ -139,19 +288,33 @@ def find_element_by_tag_and_id(
     else:
         id_type_list = id_types
 
-    element_list = context_element.xpath(
-        './/*[({0}) and @id="{1}"]'.format(
-            " or ".join(["self::{0}".format(one_tag) for one_tag in tag_list]),
-            element_id
+    if id_index is not None:
+        any_element_list = id_index.get_elements(element_id)
+        element_list = [
+            element for element in any_element_list
+            if element.tag in tag_list
+            and
+            _is_descendant(element, context_element)
+        ]
+    else:
+        element_list = context_element.xpath(
+            './/*[({0}) and @id="{1}"]'.format(
+                " or ".join(
+                    ["self::{0}".format(one_tag) for one_tag in tag_list]
+                ),
+                element_id
+            )
         )
-    )
 
     if element_list:
         return element_list[0]
 
-    element = get_root(context_element).find(
-        './/*[@id="{0}"]'.format(element_id)
-    )
+    if id_index is not None:
+        element = any_element_list[0] if any_element_list else None
+    else:
+        element = get_root(context_element).find(
+            './/*[@id="{0}"]'.format(element_id)
+        )
 
     if element is not None:
         raise LibraryError(
@@ -180,6 +343,12 @@ def find_element_by_tag_and_id(
         )
     )
 
+def _is_descendant(element, ancestor):
+    for parent in element.iterancestors():
+        if parent is ancestor:
+            return True
+    return False
+
 def create_subelement_id(context_element, suffix, id_provider=None):
     proposed_id = sanitize_id(
         "{0}-{1}".format(context_element.get("id"), suffix)
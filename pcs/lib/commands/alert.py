@@ -1,6 +1,7 @@
 from pcs.common.tools import Version
 from pcs.lib import reports
 from pcs.lib.cib import alert
+from pcs.lib.cib.sections import CONFIGURATION
 from pcs.lib.errors import LibraryError
 
 
@@ -31,7 +32,7 @@ def create_alert(
 
 
     alert_el = alert.create_alert(
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION]),
         alert_id,
         path,
         description
@@ -63,7 +64,7 @@ def update_alert(
     """
 
     alert_el = alert.update_alert(
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION]),
         alert_id,
         path,
         description
@@ -81,7 +82,7 @@ def remove_alert(lib_env, alert_id_list):
     lib_env -- LibraryEnvironment
     alert_id_list -- list of alerts ids which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION])
     report_list = []
     for alert_id in alert_id_list:
         try:
@@ -122,7 +123,7 @@ def add_recipient(
 
     recipient = alert.add_recipient(
         lib_env.report_processor,
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION]),
         alert_id,
         recipient_value,
         recipient_id=recipient_id,
@@ -163,7 +164,7 @@ def update_recipient(
         )
     recipient = alert.update_recipient(
         lib_env.report_processor,
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION]),
         recipient_id,
         recipient_value=recipient_value,
         description=description,
@@ -182,7 +183,7 @@ def remove_recipient(lib_env, recipient_id_list):
     lib_env -- LibraryEnvironment
     recipient_id_list -- list of recipients ids to be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, [CONFIGURATION])
     report_list = []
     for recipient_id in recipient_id_list:
         try:
@@ -200,4 +201,4 @@ def get_all_alerts(lib_env):
 
     lib_env -- LibraryEnvironment
     """
-    return alert.get_all_alerts(lib_env.get_cib())
+    return alert.get_all_alerts(lib_env.get_cib(scope_list=[CONFIGURATION]))
@@ -874,7 +874,9 @@ def _start_cluster(
     if wait_timeout is not False:
         report_processor.process_list(
             _wait_for_pacemaker_to_start(
-                communicator_factory.get_communicator(),
+                # nodes may not respond while the cluster is starting, keep
+                # asking them
+                communicator_factory.get_communicator(retry_unreachable=True),
                 report_processor,
                 target_list,
                 timeout=wait_timeout, # wait_timeout is either None or a timeout
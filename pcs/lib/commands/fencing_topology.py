@@ -11,6 +11,18 @@ from pcs.lib.cib.tools import (
 from pcs.lib.pacemaker.live import get_cluster_status_xml
 from pcs.lib.pacemaker.state import ClusterState
 
+def get_add_level_required_cib_version(target_type):
+    """
+    Return the CIB schema version needed to add a fencing level or None
+
+    constant target_type -- the new fencing level target value type
+    """
+    if target_type == TARGET_TYPE_REGEXP:
+        return Version(2, 3, 0)
+    if target_type == TARGET_TYPE_ATTRIBUTE:
+        return Version(2, 4, 0)
+    return None
+
 def add_level(
     lib_env, level, target_type, target_value, devices,
     force_device=False, force_node=False
@@ -26,13 +38,7 @@ def add_level(
     bool force_device -- continue even if a stonith device does not exist
     bool force_node -- continue even if a node (target) does not exist
     """
-    version_check = None
-    if target_type == TARGET_TYPE_REGEXP:
-        version_check = Version(2, 3, 0)
-    elif target_type == TARGET_TYPE_ATTRIBUTE:
-        version_check = Version(2, 4, 0)
-
-    cib = lib_env.get_cib(version_check)
+    cib = lib_env.get_cib(get_add_level_required_cib_version(target_type))
     cib_fencing_topology.add_level(
         lib_env.report_processor,
         get_fencing_topology(cib),
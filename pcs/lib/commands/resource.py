@@ -1,5 +1,7 @@
 from contextlib import contextmanager
 
+from lxml import etree
+
 from pcs.common import report_codes
 from pcs.common.tools import Version
 from pcs.lib import reports
@@ -7,6 +9,7 @@ from pcs.lib.cib import (
     resource,
     status as cib_status,
 )
+from pcs.lib.cib.nvpair import append_new_meta_attributes
 from pcs.lib.cib.resource import operations, remote_node, guest_node
 from pcs.lib.cib.tools import (
     find_element_by_tag_and_id,
@@ -31,6 +34,8 @@ from pcs.lib.resource_agent import(
 )
 from pcs.lib.validate import value_time_interval
 
+BUNDLE_REQUIRED_CIB_VERSION = Version(2, 8, 0)
+
 @contextmanager
 def resource_environment(
     env,
@@ -233,6 +238,7 @@ def create(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -308,6 +314,7 @@ def create_as_clone(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         clone_element = resource.clone.append_new(
             resources_section,
@@ -389,6 +396,7 @@ def create_in_group(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -455,7 +463,7 @@ def create_into_bundle(
             or
             resource.common.are_meta_disabled(meta_attributes)
         ),
-        required_cib_version=Version(2, 8, 0)
+        required_cib_version=BUNDLE_REQUIRED_CIB_VERSION
     ) as resources_section:
         _check_special_cases(
             env,
@@ -474,6 +482,7 @@ def create_into_bundle(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -524,13 +533,6 @@ def bundle_create(
     storage_map = storage_map or []
     meta_attributes = meta_attributes or {}
 
-    required_cib_version = Version(2, 8, 0)
-    if container_type == "rkt":
-        required_cib_version = Version(2, 10, 0)
-    if "promoted-max" in container_options:
-        required_cib_version = Version(3, 0, 0)
-    if container_type == "podman":
-        required_cib_version = Version(3, 2, 0)
     with resource_environment(
         env,
         wait,
@@ -540,7 +542,9 @@ def bundle_create(
             or
             resource.common.are_meta_disabled(meta_attributes)
         ),
-        required_cib_version=required_cib_version
+        required_cib_version=get_bundle_create_required_cib_version(
+            container_type, container_options
+        )
     ) as resources_section:
         # no need to run validations related to remote and guest nodes as those
         # nodes can only be created from primitive resources
@@ -572,6 +576,32 @@ def bundle_create(
         if ensure_disabled:
             resource.common.disable(bundle_element)
 
+def get_bundle_create_required_cib_version(container_type, container_options):
+    """
+    Return the CIB schema version needed to create a bundle
+
+    string container_type -- container engine name (docker, lxc...)
+    dict container_options -- container options
+    """
+    required_cib_version = BUNDLE_REQUIRED_CIB_VERSION
+    if container_type == "rkt":
+        required_cib_version = Version(2, 10, 0)
+    if "promoted-max" in container_options:
+        required_cib_version = Version(3, 0, 0)
+    if container_type == "podman":
+        required_cib_version = Version(3, 2, 0)
+    return required_cib_version
+
+def get_bundle_update_required_cib_version(container_options):
+    """
+    Return the CIB schema version needed to update a bundle
+
+    dict container_options -- container options to modify
+    """
+    if container_options and "promoted-max" in container_options:
+        return Version(3, 0, 0)
+    return BUNDLE_REQUIRED_CIB_VERSION
+
 def bundle_update(
     env, bundle_id, container_options=None, network_options=None,
     port_map_add=None, port_map_remove=None, storage_map_add=None,
@@ -602,14 +632,13 @@ def bundle_update(
     storage_map_remove = storage_map_remove or []
     meta_attributes = meta_attributes or {}
 
-    required_cib_version=Version(2, 8, 0)
-    if "promoted-max" in container_options:
-        required_cib_version=Version(3, 0, 0)
     with resource_environment(
         env,
         wait,
         [bundle_id],
-        required_cib_version=required_cib_version
+        required_cib_version=get_bundle_update_required_cib_version(
+            container_options
+        )
     ) as resources_section:
         # no need to run validations related to remote and guest nodes as those
         # nodes can only be created from primitive resources
@@ -645,6 +674,306 @@ def bundle_update(
             meta_attributes
         )
 
+# resource type: (required keys, optional keys)
+_BULK_CREATE_KEYS = {
+    "primitive": (
+        ["agent", "id"],
+        ["instance_attributes", "meta_attributes", "operations"],
+    ),
+    "group": (["id", "resources"], ["meta_attributes"]),
+    "clone": (["resource"], ["meta_attributes"]),
+    "bundle": (
+        ["container_type", "id"],
+        [
+            "container_options", "meta_attributes", "network_options",
+            "port_map", "resource", "storage_map",
+        ],
+    ),
+}
+_BULK_CREATE_INNER_TYPES = {
+    "group": ["primitive"],
+    "clone": ["group", "primitive"],
+    "bundle": ["primitive"],
+}
+_BULK_CREATE_DICT_KEYS = [
+    "container_options", "instance_attributes", "meta_attributes",
+    "network_options",
+]
+_BULK_CREATE_LIST_KEYS = ["operations", "port_map", "resources", "storage_map"]
+
+def _validate_bulk_resource(resource_dict, allowed_types):
+    if not isinstance(resource_dict, dict):
+        return [reports.invalid_option_type("resource", "an object")]
+    resource_type = resource_dict.get("type", "")
+    if resource_type not in allowed_types:
+        return [
+            reports.invalid_option_value("type", resource_type, allowed_types)
+        ]
+
+    report_list = []
+    required_keys, optional_keys = _BULK_CREATE_KEYS[resource_type]
+    missing_keys = set(required_keys) - set(resource_dict.keys())
+    if missing_keys:
+        report_list.append(reports.required_option_is_missing(
+            sorted(missing_keys), resource_type
+        ))
+    allowed_keys = ["type"] + required_keys + optional_keys
+    invalid_keys = set(resource_dict.keys()) - set(allowed_keys)
+    if invalid_keys:
+        report_list.append(reports.invalid_options(
+            sorted(invalid_keys), sorted(allowed_keys), resource_type
+        ))
+    for key in _BULK_CREATE_DICT_KEYS:
+        if key in resource_dict and not isinstance(resource_dict[key], dict):
+            report_list.append(reports.invalid_option_type(key, "an object"))
+    for key in _BULK_CREATE_LIST_KEYS:
+        if key in resource_dict and not isinstance(resource_dict[key], list):
+            report_list.append(reports.invalid_option_type(key, "an array"))
+    if report_list:
+        return report_list
+
+    inner_types = _BULK_CREATE_INNER_TYPES.get(resource_type, [])
+    for inner_resource in resource_dict.get("resources", []):
+        report_list.extend(
+            _validate_bulk_resource(inner_resource, inner_types)
+        )
+    if "resource" in resource_dict:
+        report_list.extend(
+            _validate_bulk_resource(resource_dict["resource"], inner_types)
+        )
+    return report_list
+
+def _get_bulk_primitives(resource_dict):
+    if resource_dict["type"] == "primitive":
+        return [resource_dict]
+    primitive_list = []
+    inner_list = list(resource_dict.get("resources", []))
+    if "resource" in resource_dict:
+        inner_list.append(resource_dict["resource"])
+    for inner_resource in inner_list:
+        primitive_list.extend(_get_bulk_primitives(inner_resource))
+    return primitive_list
+
+def _is_bulk_resource_disabled(resource_dict):
+    meta_attributes = resource_dict.get("meta_attributes", {})
+    if resource_dict["type"] == "clone":
+        return (
+            resource.common.is_clone_deactivated_by_meta(meta_attributes)
+            or
+            _is_bulk_resource_disabled(resource_dict["resource"])
+        )
+    return resource.common.are_meta_disabled(meta_attributes)
+
+def bulk_create(
+    env, resource_list,
+    allow_absent_agent=False,
+    allow_invalid_operation=False,
+    allow_invalid_instance_attributes=False,
+    use_default_operations=True,
+    ensure_disabled=False,
+    wait=False,
+    allow_not_suitable_command=False,
+    allow_not_accessible_resource=False,
+    force_options=False,
+):
+    """
+    Create many resources in a cib and push the cib only once
+
+    LibraryEnvironment env provides all for communication with externals
+    list of dict resource_list -- resources to create. Each dict has a key
+        "type" and keys specific to the type:
+        * primitive: id, agent, operations, meta_attributes,
+          instance_attributes
+        * group: id, resources (list of primitives), meta_attributes
+        * clone: resource (a primitive or a group), meta_attributes
+        * bundle: id, container_type, container_options, network_options,
+          port_map, storage_map, meta_attributes, resource (a primitive)
+    bool allow_absent_agent is a flag for allowing agent that is not installed
+        in a system
+    bool allow_invalid_operation is a flag for allowing to use operations that
+        are not listed in a resource agent metadata
+    bool allow_invalid_instance_attributes is a flag for allowing to use
+        instance attributes that are not listed in a resource agent metadata
+        or for allowing to not use the instance_attributes that are required in
+        resource agent metadata
+    bool use_default_operations is a flag for stopping stopping of adding
+        default cib operations (specified in a resource agent)
+    bool ensure_disabled is flag that keeps resources in target-role "Stopped"
+    mixed wait is flag for controlling waiting for pacemaker idle mechanism
+    bool allow_not_suitable_command -- flag for FORCE_NOT_SUITABLE_COMMAND
+    bool allow_not_accessible_resource -- flag for
+        FORCE_RESOURCE_IN_BUNDLE_NOT_ACCESSIBLE
+    bool force_options -- return warnings instead of forceable errors when
+        validating bundles
+    """
+    if not isinstance(resource_list, list):
+        raise LibraryError(
+            reports.invalid_option_type("resource list", "an array")
+        )
+    report_list = []
+    for resource_dict in resource_list:
+        report_list.extend(
+            _validate_bulk_resource(resource_dict, sorted(_BULK_CREATE_KEYS))
+        )
+    if report_list:
+        raise LibraryError(*report_list)
+
+    # Load each agent and its metadata only once no matter how many resources
+    # use it.
+    agent_dict = {}
+    for resource_dict in resource_list:
+        for primitive_dict in _get_bulk_primitives(resource_dict):
+            if primitive_dict["agent"] not in agent_dict:
+                agent_dict[primitive_dict["agent"]] = get_agent(
+                    env.report_processor,
+                    env.cmd_runner(),
+                    primitive_dict["agent"],
+                    allow_absent_agent,
+                )
+
+    required_cib_version = None
+    for resource_dict in resource_list:
+        if resource_dict["type"] == "bundle":
+            bundle_cib_version = get_bundle_create_required_cib_version(
+                resource_dict["container_type"],
+                resource_dict.get("container_options", {}),
+            )
+            if (
+                required_cib_version is None
+                or
+                bundle_cib_version > required_cib_version
+            ):
+                required_cib_version = bundle_cib_version
+
+    env.ensure_wait_satisfiable(wait)
+    resources_section = get_resources(env.get_cib(required_cib_version))
+    # One id provider for all the resources, so the index of ids in the cib is
+    # built only once.
+    id_provider = IdProvider(resources_section)
+
+    def create_primitive(primitive_dict):
+        resource_agent = agent_dict[primitive_dict["agent"]]
+        meta_attributes = primitive_dict.get("meta_attributes", {})
+        instance_attributes = primitive_dict.get("instance_attributes", {})
+        _check_special_cases(
+            env,
+            resource_agent,
+            resources_section,
+            primitive_dict["id"],
+            meta_attributes,
+            instance_attributes,
+            allow_not_suitable_command
+        )
+        return resource.primitive.create(
+            env.report_processor, resources_section,
+            primitive_dict["id"], resource_agent,
+            primitive_dict.get("operations", []),
+            meta_attributes,
+            instance_attributes,
+            allow_invalid_operation,
+            allow_invalid_instance_attributes,
+            use_default_operations,
+            id_provider=id_provider,
+        )
+
+    def create_group(group_dict):
+        group_id = group_dict["id"]
+        validate_id(group_id, "group name")
+        if id_provider.book_ids(group_id):
+            # the id is taken, it is fine as long as it is a group
+            group_element = resource.group.provide_group(
+                resources_section, group_id
+            )
+        else:
+            group_element = etree.SubElement(
+                resources_section, resource.group.TAG, id=group_id
+            )
+        if group_dict.get("meta_attributes"):
+            append_new_meta_attributes(
+                group_element, group_dict["meta_attributes"], id_provider
+            )
+        for primitive_dict in group_dict["resources"]:
+            resource.group.place_resource(
+                group_element, create_primitive(primitive_dict)
+            )
+        return group_element
+
+    def create_clone(clone_dict):
+        return resource.clone.append_new(
+            resources_section,
+            create_resource(clone_dict["resource"]),
+            clone_dict.get("meta_attributes", {}),
+            id_provider=id_provider,
+        )
+
+    def create_bundle(bundle_dict):
+        bundle_id = bundle_dict["id"]
+        bundle_options = [
+            bundle_dict.get("container_options", {}),
+            bundle_dict.get("network_options", {}),
+            bundle_dict.get("port_map", []),
+            bundle_dict.get("storage_map", []),
+        ]
+        env.report_processor.process_list(
+            resource.bundle.validate_new(
+                id_provider,
+                bundle_id,
+                bundle_dict["container_type"],
+                *bundle_options,
+                force_options=force_options
+            )
+        )
+        bundle_element = resource.bundle.append_new(
+            resources_section,
+            id_provider,
+            bundle_id,
+            bundle_dict["container_type"],
+            *bundle_options,
+            bundle_dict.get("meta_attributes", {})
+        )
+        if "resource" in bundle_dict:
+            if not resource.bundle.is_pcmk_remote_accessible(bundle_element):
+                env.report_processor.process(
+                    reports.get_problem_creator(
+                        report_codes.FORCE_RESOURCE_IN_BUNDLE_NOT_ACCESSIBLE,
+                        allow_not_accessible_resource
+                    )(
+                        reports.resource_in_bundle_not_accessible,
+                        bundle_id,
+                        bundle_dict["resource"]["id"]
+                    )
+                )
+            resource.bundle.add_resource(
+                bundle_element, create_primitive(bundle_dict["resource"])
+            )
+        return bundle_element
+
+    create_by_type = {
+        "primitive": create_primitive,
+        "group": create_group,
+        "clone": create_clone,
+        "bundle": create_bundle,
+    }
+    def create_resource(resource_dict):
+        return create_by_type[resource_dict["type"]](resource_dict)
+
+    disabled_after_wait = {}
+    for resource_dict in resource_list:
+        resource_element = create_resource(resource_dict)
+        if ensure_disabled:
+            resource.common.disable(resource_element)
+        disabled_after_wait[resource_element.get("id")] = (
+            ensure_disabled or _is_bulk_resource_disabled(resource_dict)
+        )
+
+    env.push_cib(wait=wait)
+    if wait is not False and disabled_after_wait:
+        state = env.get_cluster_state()
+        env.report_processor.process_list([
+            ensure_resource_state(not disabled, state, resource_id)
+            for resource_id, disabled in disabled_after_wait.items()
+        ])
+
 def disable(env, resource_ids, wait):
     """
     Disallow specified resource to be started by the cluster
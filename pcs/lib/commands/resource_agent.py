@@ -1,4 +1,8 @@
-from pcs.lib import resource_agent
+from pcs import settings
+from pcs.common import env_file_role_codes
+from pcs.common.tools import map_parallel
+from pcs.lib import agent_metadata_cache, reports, resource_agent
+from pcs.lib.errors import LibraryError
 
 
 def list_standards(lib_env):
@@ -22,15 +26,18 @@ def list_agents_for_standard_and_provider(lib_env, standard_provider=None):
     List resource agents for specified standard on the local host
     string standard_provider standard[:provider], e.g. None, ocf, ocf:pacemaker
     """
+    runner = lib_env.cmd_runner()
     if standard_provider:
         standards = [standard_provider]
     else:
-        standards = resource_agent.list_resource_agents_standards(
-            lib_env.cmd_runner()
-        )
+        standards = resource_agent.list_resource_agents_standards(runner)
     agents = []
-    for std in standards:
-        agents += resource_agent.list_resource_agents(lib_env.cmd_runner(), std)
+    for agent_list in map_parallel(
+        lambda std: resource_agent.list_resource_agents(runner, std),
+        standards,
+        settings.agent_metadata_parallelism
+    ):
+        agents += agent_list
     return sorted(
         agents,
         # works with both str and unicode in both python 2 and 3
@@ -46,29 +53,29 @@ def list_agents(lib_env, describe=True, search=None):
     string search return only agents which name contains this string
     """
     runner = lib_env.cmd_runner()
-
-    # list agents for all standards and providers
-    agent_names = []
-    for std in resource_agent.list_resource_agents_standards_and_providers(
-        runner
-    ):
-        agent_names += [
-            "{0}:{1}".format(std, agent)
-            for agent in resource_agent.list_resource_agents(runner, std)
-        ]
-    agent_names.sort(
-        # works with both str and unicode in both python 2 and 3
-        key=lambda x: x.lower()
-    )
     return _complete_agent_list(
         runner,
-        agent_names,
+        _list_all_agent_names(runner),
         describe,
         search,
         resource_agent.ResourceAgent
     )
 
 
+def _list_all_agent_names(runner):
+    # list agents for all standards and providers
+    agent_names = [
+        "{0}:{1}".format(std, agent)
+        for std, agent
+        in resource_agent.list_resource_agents_for_all_standards(runner)
+    ]
+    agent_names.sort(
+        # works with both str and unicode in both python 2 and 3
+        key=lambda x: x.lower()
+    )
+    return agent_names
+
+
 def _complete_agent_list(
     runner, agent_names, describe, search, metadata_class
 ):
@@ -118,3 +125,92 @@ def describe_agent(lib_env, agent_name):
         absent_agent_supported=False
     )
     return agent.get_full_info()
+
+
+def get_all_agents_with_metadata(lib_env, search=None, include_stonith=True):
+    """
+    Get full info of all resource and stonith agents on the local host
+
+    Agents and their metadata are loaded in parallel. Metadata are stored in
+    the agent metadata cache, so the next call is fast. Agents without valid
+    metadata are skipped. Return a dict with keys "resource_agents" and
+    "stonith_agents" each holding a list of agents' full info.
+
+    string search -- return only agents which name contains this string
+    bool include_stonith -- load stonith agents as well
+    """
+    agent_list = resource_agent.prefetch_agents_metadata(
+        _create_all_agents(lib_env.cmd_runner(), search, include_stonith)
+    )
+    result = {"resource_agents": [], "stonith_agents": []}
+    for agent in agent_list:
+        try:
+            agent_info = agent.get_full_info()
+        except resource_agent.ResourceAgentError:
+            continue
+        if isinstance(agent, resource_agent.StonithAgent):
+            result["stonith_agents"].append(agent_info)
+        else:
+            result["resource_agents"].append(agent_info)
+    return result
+
+
+def _create_all_agents(runner, search=None, include_stonith=True):
+    # list resource agents of all standards and stonith agents at once
+    list_func_list = [_list_all_agent_names]
+    if include_stonith:
+        list_func_list.append(resource_agent.list_stonith_agents)
+    name_list_list = map_parallel(
+        lambda list_func: list_func(runner),
+        list_func_list,
+        settings.agent_metadata_parallelism
+    )
+    agent_class_list = [
+        resource_agent.ResourceAgent, resource_agent.StonithAgent
+    ]
+    search_lower = search.lower() if search else None
+    agent_list = []
+    for agent_class, name_list in zip(agent_class_list, name_list_list):
+        for name in name_list:
+            if search_lower and search_lower not in name.lower():
+                continue
+            try:
+                agent_list.append(agent_class(runner, name))
+            except resource_agent.ResourceAgentError:
+                # invalid names are not listed by list_agents either
+                pass
+    return agent_list
+
+
+def clear_metadata_cache(lib_env):
+    """
+    Remove metadata of all agents from the agent metadata cache
+    """
+    cache = agent_metadata_cache.get_cache()
+    if cache is None:
+        return
+    try:
+        cache.clear()
+    except EnvironmentError as e:
+        raise LibraryError(reports.file_io_error(
+            env_file_role_codes.AGENT_METADATA_CACHE,
+            file_path=cache.cache_dir,
+            reason=e.strerror,
+            operation="clear",
+        ))
+
+
+def refresh_metadata_cache(lib_env):
+    """
+    Load metadata of all resource and stonith agents to the agent metadata
+    cache, return names of agents which have their metadata cached
+    """
+    cache = agent_metadata_cache.get_cache()
+    if cache is None:
+        return []
+    clear_metadata_cache(lib_env)
+    # loading metadata stores them in the cache
+    resource_agent.prefetch_agents_metadata(
+        _create_all_agents(lib_env.cmd_runner())
+    )
+    return cache.get_agent_names()
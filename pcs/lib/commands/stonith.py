@@ -1,6 +1,7 @@
 from pcs.lib import reports
 from pcs.lib.cib import resource
 from pcs.lib.cib.resource.common import are_meta_disabled
+from pcs.lib.cib.tools import IdProvider
 from pcs.lib.commands.resource import (
     _ensure_disabled_after_wait,
     resource_environment
@@ -77,7 +78,8 @@ def create(
             allow_invalid_operation=allow_invalid_operation,
             allow_invalid_instance_attributes=allow_invalid_instance_attributes,
             use_default_operations=use_default_operations,
-            resource_type="stonith"
+            resource_type="stonith",
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(stonith_element)
@@ -145,6 +147,7 @@ def create_in_group(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(stonith_element)
@@ -0,0 +1,248 @@
+from unittest import TestCase
+
+from pcs.common import report_codes
+from pcs.lib.commands import resource
+from pcs.test.tools import fixture
+from pcs.test.tools.command_env import get_env_tools
+
+
+TIMEOUT=10
+
+def fixture_primitive(resource_id, meta_attributes=""):
+    return """
+        <primitive class="ocf" id="{id}" provider="heartbeat" type="Dummy">
+            {meta}
+            <operations>
+                <op id="{id}-monitor-interval-10" interval="10"
+                    name="monitor" timeout="20"
+                />
+            </operations>
+        </primitive>
+    """.format(id=resource_id, meta=meta_attributes)
+
+def fixture_primitive_dict(resource_id, **kwargs):
+    return dict(
+        type="primitive", id=resource_id, agent="ocf:heartbeat:Dummy",
+        **kwargs
+    )
+
+fixture_resource_list = [
+    fixture_primitive_dict("A"),
+    {
+        "type": "group",
+        "id": "G",
+        "resources": [fixture_primitive_dict("B"), fixture_primitive_dict("C")],
+    },
+    {
+        "type": "clone",
+        "meta_attributes": {"clone-max": "2"},
+        "resource": fixture_primitive_dict("D"),
+    },
+    {
+        "type": "bundle",
+        "id": "B1",
+        "container_type": "docker",
+        "container_options": {"image": "pcs:test"},
+    },
+]
+
+fixture_resources = """
+    <resources>
+        {A}
+        <group id="G">
+            {B}
+            {C}
+        </group>
+        <clone id="D-clone">
+            {D}
+            <meta_attributes id="D-clone-meta_attributes">
+                <nvpair id="D-clone-meta_attributes-clone-max"
+                    name="clone-max" value="2"
+                />
+            </meta_attributes>
+        </clone>
+        <bundle id="B1">
+            <docker image="pcs:test" />
+        </bundle>
+    </resources>
+""".format(**{
+    resource_id: fixture_primitive(resource_id)
+    for resource_id in ["A", "B", "C", "D"]
+})
+
+def bulk_create(env, resource_list, wait=False):
+    return resource.bulk_create(
+        env,
+        resource_list,
+        use_default_operations=False,
+        wait=wait,
+    )
+
+
+class BulkCreate(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_all_resource_types(self):
+        # the agent metadata are loaded only once for all the primitives
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.cib.load()
+            .env.push_cib(resources=fixture_resources)
+        )
+        bulk_create(self.env_assist.get_env(), fixture_resource_list)
+
+    def test_disabled_in_one_push(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.cib.load()
+            .env.push_cib(
+                resources="""
+                    <resources>
+                        {A}
+                        {B}
+                    </resources>
+                """.format(
+                    A=fixture_primitive("A", """
+                        <meta_attributes id="A-meta_attributes">
+                            <nvpair id="A-meta_attributes-target-role"
+                                name="target-role" value="Stopped"
+                            />
+                        </meta_attributes>
+                    """),
+                    B=fixture_primitive("B", """
+                        <meta_attributes id="B-meta_attributes">
+                            <nvpair id="B-meta_attributes-target-role"
+                                name="target-role" value="Stopped"
+                            />
+                        </meta_attributes>
+                    """),
+                )
+            )
+        )
+        resource.bulk_create(
+            self.env_assist.get_env(),
+            [fixture_primitive_dict("A"), fixture_primitive_dict("B")],
+            use_default_operations=False,
+            ensure_disabled=True,
+        )
+
+    def test_duplicate_id(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.cib.load()
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: bulk_create(
+                self.env_assist.get_env(),
+                [
+                    fixture_primitive_dict("A"),
+                    {
+                        "type": "group",
+                        "id": "G",
+                        "resources": [fixture_primitive_dict("A")],
+                    },
+                ]
+            ),
+            [
+                fixture.error(report_codes.ID_ALREADY_EXISTS, id="A"),
+            ],
+            expected_in_processor=False
+        )
+
+    def test_invalid_structure(self):
+        self.env_assist.assert_raise_library_error(
+            lambda: bulk_create(
+                self.env_assist.get_env(),
+                [
+                    {"type": "master", "id": "M"},
+                    {"type": "primitive", "agent": "ocf:heartbeat:Dummy"},
+                    {
+                        "type": "group",
+                        "id": "G",
+                        "resources": [{"type": "group", "id": "G2"}],
+                        "options": {},
+                    },
+                    {
+                        "type": "clone",
+                        "resource": fixture_primitive_dict("D"),
+                        "meta_attributes": ["clone-max"],
+                    },
+                ]
+            ),
+            [
+                fixture.error(
+                    report_codes.INVALID_OPTION_VALUE,
+                    option_name="type",
+                    option_value="master",
+                    allowed_values=["bundle", "clone", "group", "primitive"],
+                ),
+                fixture.error(
+                    report_codes.REQUIRED_OPTION_IS_MISSING,
+                    option_names=["id"],
+                    option_type="primitive",
+                ),
+                fixture.error(
+                    report_codes.INVALID_OPTIONS,
+                    option_names=["options"],
+                    allowed=["id", "meta_attributes", "resources", "type"],
+                    option_type="group",
+                    allowed_patterns=[],
+                ),
+                fixture.error(
+                    report_codes.INVALID_OPTION_TYPE,
+                    option_name="meta_attributes",
+                    allowed_types="an object",
+                ),
+            ],
+            expected_in_processor=False
+        )
+
+    def test_invalid_inner_resource(self):
+        self.env_assist.assert_raise_library_error(
+            lambda: bulk_create(
+                self.env_assist.get_env(),
+                [
+                    {
+                        "type": "group",
+                        "id": "G",
+                        "resources": [{"type": "group", "id": "G2"}],
+                    },
+                ]
+            ),
+            [
+                fixture.error(
+                    report_codes.INVALID_OPTION_VALUE,
+                    option_name="type",
+                    option_value="group",
+                    allowed_values=["primitive"],
+                ),
+            ],
+            expected_in_processor=False
+        )
+
+    def test_wait(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.pcmk.can_wait()
+            .runner.cib.load()
+            .env.push_cib(
+                resources="<resources>{0}</resources>".format(
+                    fixture_primitive("A")
+                ),
+                wait=TIMEOUT
+            )
+            .runner.pcmk.load_state(raw_resources=dict())
+        )
+        bulk_create(
+            self.env_assist.get_env(),
+            [fixture_primitive_dict("A")],
+            wait=TIMEOUT
+        )
+        self.env_assist.assert_reports([
+            fixture.info(
+                report_codes.RESOURCE_RUNNING_ON_NODES,
+                roles_with_nodes={"Started": ["node1"]},
+                resource_id="A",
+            ),
+        ])
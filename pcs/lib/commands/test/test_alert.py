@@ -65,7 +65,7 @@ class CreateAlertTest(TestCase):
 
     def test_create_no_upgrade(self):
         (self.config
-            .runner.cib.load()
+            .runner.cib.load(scope_list=["configuration"])
             .env.push_cib(optional_in_conf=self.fixture_final_alerts)
         )
         cmd_alert.create_alert(
@@ -83,6 +83,7 @@ class CreateAlertTest(TestCase):
     def test_create_upgrade(self):
         (self.config
             .runner.cib.load(
+                scope_list=["configuration"],
                 filename="cib-empty-2.0.xml",
                 name="load_cib_old_version"
             )
@@ -167,7 +168,10 @@ class UpdateAlertTest(TestCase):
         </alerts>
         """
         (self.config
-            .runner.cib.load(optional_in_conf=self.fixture_initial_alerts)
+            .runner.cib.load(
+                scope_list=["configuration"],
+                optional_in_conf=self.fixture_initial_alerts
+            )
             .env.push_cib(
                 replace={"./configuration/alerts": fixture_final_alerts}
             )
@@ -186,7 +190,10 @@ class UpdateAlertTest(TestCase):
 
     def test_update_instance_attribute(self):
         (self.config
-            .runner.cib.load(optional_in_conf=self.fixture_initial_alerts)
+            .runner.cib.load(
+                scope_list=["configuration"],
+                optional_in_conf=self.fixture_initial_alerts
+            )
             .env.push_cib(
                 replace={
                     './configuration/alerts/alert[@id="my-alert"]/'
@@ -213,6 +220,7 @@ class UpdateAlertTest(TestCase):
     def test_alert_doesnt_exist(self):
         (self.config
             .runner.cib.load(
+                scope_list=["configuration"],
                 optional_in_conf="""
                     <alerts>
                         <alert id="alert" path="path"/>
@@ -244,6 +252,7 @@ class RemoveAlertTest(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
         self.config.runner.cib.load(
+            scope_list=["configuration"],
             optional_in_conf="""
                 <alerts>
                     <alert id="alert1" path="path"/>
@@ -321,6 +330,7 @@ class AddRecipientTest(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
         self.config.runner.cib.load(
+            scope_list=["configuration"],
             optional_in_conf="""
                 <alerts>
                     <alert id="alert" path="path">
@@ -332,6 +342,7 @@ class AddRecipientTest(TestCase):
 
     def test_value_not_defined(self):
         self.config.remove("runner.cib.load")
+        self.config.remove("runner.cib.load.configuration")
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.add_recipient(
                 self.env_assist.get_env(), "unknown", "", {}, {}
@@ -459,6 +470,7 @@ class UpdateRecipientTest(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
         self.config.runner.cib.load(
+            scope_list=["configuration"],
             optional_in_conf="""
                 <alerts>
                     <alert id="alert" path="path">
@@ -497,6 +509,7 @@ class UpdateRecipientTest(TestCase):
 
     def test_empty_value(self):
         self.config.remove("runner.cib.load")
+        self.config.remove("runner.cib.load.configuration")
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.update_recipient(
                 self.env_assist.get_env(),
@@ -601,6 +614,7 @@ class RemoveRecipientTest(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
         self.config.runner.cib.load(
+            scope_list=["configuration"],
             optional_in_conf=self.fixture_initial_alerts
         )
 
@@ -121,7 +121,10 @@ class TestListAgentsForStandardAndProvider(TestCase):
             "pcsd",
         ]
         mock_list_standards.return_value = ["ocf:test", "service"]
-        mock_list_agents.side_effect = [agents_ocf, agents_service]
+        mock_list_agents.side_effect = lambda runner, standard: {
+            "ocf:test": agents_ocf,
+            "service": agents_service,
+        }[standard]
 
         self.assertEqual(
             lib.list_agents_for_standard_and_provider(self.lib_env),
@@ -130,10 +133,13 @@ class TestListAgentsForStandardAndProvider(TestCase):
 
         mock_list_standards.assert_called_once_with("mock_runner")
         self.assertEqual(2, len(mock_list_agents.mock_calls))
-        mock_list_agents.assert_has_calls([
-            mock.call("mock_runner", "ocf:test"),
-            mock.call("mock_runner", "service"),
-        ])
+        mock_list_agents.assert_has_calls(
+            [
+                mock.call("mock_runner", "ocf:test"),
+                mock.call("mock_runner", "service"),
+            ],
+            any_order=True
+        )
 
 
 @mock.patch(
@@ -461,3 +467,141 @@ class DescribeAgentUtf8(TestCase):
                 ],
             }
         )
+
+
+@mock.patch(
+    "pcs.lib.resource_agent.list_resource_agents_for_all_standards",
+    lambda runner: [
+        ("ocf:test", "Delay"),
+        ("ocf:test", "Stateful"),
+        ("service", "corosync"),
+    ]
+)
+@mock.patch(
+    "pcs.lib.resource_agent.list_stonith_agents",
+    lambda runner: ["fence_scsi", "fence_xvm"]
+)
+@mock.patch.object(
+    LibraryEnvironment,
+    "cmd_runner",
+    lambda self: "mock_runner"
+)
+@mock.patch.object(lib_ra.Agent, "_get_metadata", autospec=True)
+class GetAllAgentsWithMetadata(TestCase):
+    def setUp(self):
+        self.mock_logger = mock.MagicMock(logging.Logger)
+        self.mock_reporter = MockLibraryReportProcessor()
+        self.lib_env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        self.addCleanup(lib_ra.StonithAgent.clear_fenced_metadata_cache)
+
+    @staticmethod
+    def mock_metadata_func(agent):
+        if agent.get_name() in ["ocf:test:Stateful", "fence_scsi"]:
+            raise lib_ra.UnableToGetAgentMetadata(
+                agent.get_name(), "test exception"
+            )
+        return etree.XML("""
+            <resource-agent>
+                <shortdesc>short {name}</shortdesc>
+            </resource-agent>
+        """.format(name=agent.get_name()))
+
+    @staticmethod
+    def get_names(agent_info_list):
+        return [agent_info["name"] for agent_info in agent_info_list]
+
+    def test_all_agents(self, mock_metadata):
+        mock_metadata.side_effect = self.mock_metadata_func
+        result = lib.get_all_agents_with_metadata(self.lib_env)
+        # agents without valid metadata are skipped
+        self.assertEqual(
+            ["ocf:test:Delay", "service:corosync"],
+            self.get_names(result["resource_agents"])
+        )
+        self.assertEqual(
+            ["fence_xvm"], self.get_names(result["stonith_agents"])
+        )
+        self.assertEqual(
+            "short fence_xvm", result["stonith_agents"][0]["shortdesc"]
+        )
+        self.assertIn("parameters", result["resource_agents"][0])
+        self.assertIn("default_actions", result["resource_agents"][0])
+
+    def test_search_without_stonith(self, mock_metadata):
+        mock_metadata.side_effect = self.mock_metadata_func
+        result = lib.get_all_agents_with_metadata(
+            self.lib_env, search="DEL", include_stonith=False
+        )
+        self.assertEqual(
+            ["ocf:test:Delay"], self.get_names(result["resource_agents"])
+        )
+        self.assertEqual([], result["stonith_agents"])
+
+
+@mock.patch("pcs.lib.commands.resource_agent.agent_metadata_cache.get_cache")
+@mock.patch.object(
+    LibraryEnvironment,
+    "cmd_runner",
+    lambda self: "mock_runner"
+)
+class MetadataCache(TestCase):
+    def setUp(self):
+        self.mock_logger = mock.MagicMock(logging.Logger)
+        self.mock_reporter = MockLibraryReportProcessor()
+        self.lib_env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        self.cache = mock.Mock(
+            spec_set=["cache_dir", "clear", "get_agent_names"],
+            cache_dir="/cache",
+        )
+
+    def test_clear(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        lib.clear_metadata_cache(self.lib_env)
+        self.cache.clear.assert_called_once_with()
+
+    def test_clear_error(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        self.cache.clear.side_effect = PermissionError(
+            13, "Permission denied"
+        )
+        assert_raise_library_error(
+            lambda: lib.clear_metadata_cache(self.lib_env),
+            (
+                severity.ERROR,
+                report_codes.FILE_IO_ERROR,
+                {
+                    "file_role": "AGENT_METADATA_CACHE",
+                    "file_path": "/cache",
+                    "reason": "Permission denied",
+                    "operation": "clear",
+                }
+            )
+        )
+
+    def test_cache_disabled(self, mock_get_cache):
+        mock_get_cache.return_value = None
+        lib.clear_metadata_cache(self.lib_env)
+        self.assertEqual([], lib.refresh_metadata_cache(self.lib_env))
+
+    @mock.patch("pcs.lib.resource_agent.list_stonith_agents")
+    @mock.patch(
+        "pcs.lib.resource_agent.list_resource_agents_standards_and_providers"
+    )
+    @mock.patch("pcs.lib.resource_agent.list_resource_agents")
+    @mock.patch.object(lib_ra.CrmAgent, "is_valid_metadata")
+    def test_refresh(
+        self, mock_is_valid, mock_list_agents, mock_list_standards,
+        mock_list_stonith, mock_get_cache
+    ):
+        mock_get_cache.return_value = self.cache
+        mock_list_standards.return_value = ["ocf:heartbeat"]
+        mock_list_agents.return_value = ["Dummy", "IPaddr2"]
+        mock_list_stonith.return_value = ["fence_xvm"]
+        self.cache.get_agent_names.return_value = ["ocf:heartbeat:Dummy"]
+
+        self.assertEqual(
+            ["ocf:heartbeat:Dummy"],
+            lib.refresh_metadata_cache(self.lib_env)
+        )
+        self.cache.clear.assert_called_once_with()
+        self.assertEqual(3, mock_is_valid.call_count)
@@ -1,8 +1,22 @@
+from contextlib import contextmanager
+
+from lxml import etree
+
+from pcs import settings
 from pcs.common.node_communicator import NodeCommunicatorFactory
-from pcs.common.tools import Version
+from pcs.common.tools import Version, xml_fromstring
 from pcs.lib import reports
 from pcs.lib.booth.env import BoothEnv
-from pcs.lib.cib.tools import get_cib_crm_feature_set
+from pcs.lib.cib.diff import (
+    are_equivalent as are_cibs_equivalent,
+    apply_patchset,
+    diff_cibs,
+    DiffNotSupported,
+)
+from pcs.lib.cib.tools import (
+    get_cib_crm_feature_set,
+    get_pacemaker_version_by_which_cib_was_validated,
+)
 from pcs.lib.pacemaker.env import PacemakerEnv
 from pcs.lib.communication import qdevice
 from pcs.lib.communication.corosync import (
@@ -33,6 +47,7 @@ from pcs.lib.pacemaker.live import (
     ensure_wait_for_idle_support,
     get_cib,
     get_cib_xml,
+    get_cib_xml_scoped,
     get_cluster_status_xml,
     push_cib_diff_xml,
     replace_cib_configuration,
@@ -60,6 +75,8 @@ class LibraryEnvironment(object):
         pacemaker=None,
         known_hosts_getter=None,
         request_timeout=None,
+        debug=False,
+        request_parallelism=None,
     ):
         self._logger = logger
         self._report_processor = report_processor
@@ -84,11 +101,14 @@ class LibraryEnvironment(object):
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        self.__cib_batch_running = False
         self._communicator_factory = NodeCommunicatorFactory(
             LibCommunicatorLogger(self.logger, self.report_processor),
             self.user_login,
             self.user_groups,
-            self._request_timeout
+            self._request_timeout,
+            debug=debug,
+            request_parallelism=request_parallelism,
         )
 
         self.__timeout_cache = {}
@@ -109,10 +129,24 @@ class LibraryEnvironment(object):
     def user_groups(self):
         return self._user_groups
 
-    def get_cib(self, minimal_version=None):
+    def get_cib(self, minimal_version=None, scope_list=None):
+        """
+        Load the CIB for modifying and pushing it later
+
+        pcs.common.tools.Version minimal_version -- upgrade the CIB if needed
+        iterable scope_list -- load only these sections of the cib element
+            (configuration, status), load the whole CIB if not specified
+        """
         if self.__loaded_cib_diff_source is not None:
-            raise AssertionError("CIB has already been loaded")
-        self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
+            if not self.__cib_batch_running:
+                raise AssertionError("CIB has already been loaded")
+            return self.__get_batch_cib(minimal_version, scope_list)
+        if scope_list:
+            self.__loaded_cib_diff_source = get_cib_xml_scoped(
+                self.cmd_runner(), scope_list
+            )
+        else:
+            self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
         self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
@@ -138,12 +172,85 @@ class LibraryEnvironment(object):
         )
         return self.__loaded_cib_to_modify
 
+    def __get_batch_cib(self, minimal_version, scope_list):
+        if (
+            minimal_version is not None
+            and
+            get_pacemaker_version_by_which_cib_was_validated(
+                self.__loaded_cib_to_modify
+            ) < minimal_version
+        ):
+            # The CIB is upgraded by pacemaker which means pushing the changes
+            # done in the batch so far. They would stay in the CIB even if a
+            # later command of the batch failed.
+            raise LibraryError(reports.cib_upgrade_in_batch_not_possible(
+                get_pacemaker_version_by_which_cib_was_validated(
+                    self.__loaded_cib_to_modify
+                ),
+                minimal_version
+            ))
+        for scope in (scope_list or ("configuration", "status")):
+            self.ensure_cib_scope_loaded(scope)
+        return self.__loaded_cib_to_modify
+
+    @contextmanager
+    def cib_batch(self, wait=False, minimal_version=None):
+        """
+        Run several commands against one CIB and push it only once
+
+        Commands run in the batch share the CIB loaded by the first of them,
+        their push_cib calls do not push anything. The CIB is pushed when the
+        batch ends. If an exception is raised in the batch, the CIB is not
+        pushed at all. The CIB cannot be upgraded once a command of the batch
+        has loaded it, so the highest CIB version the commands need must be
+        specified up front.
+
+        mixed wait -- how many seconds to wait for pacemaker to process new CIB
+            or False for not waiting at all
+        pcs.common.tools.Version minimal_version -- upgrade the CIB if needed
+            before the commands run
+        """
+        if self.__cib_batch_running:
+            raise AssertionError("CIB batch is already running")
+        if self.__loaded_cib_diff_source is not None:
+            raise AssertionError("CIB has already been loaded")
+        self.ensure_wait_satisfiable(wait)
+        self.__cib_batch_running = True
+        try:
+            if minimal_version is not None:
+                self.get_cib(minimal_version)
+            yield
+        except BaseException:
+            self.__cib_batch_running = False
+            self.__drop_loaded_cib()
+            raise
+        self.__cib_batch_running = False
+        if self.__loaded_cib_diff_source is not None:
+            self.__push_loaded_cib(wait)
+
     @property
     def cib(self):
         if self.__loaded_cib_diff_source is None:
             raise AssertionError("CIB has not been loaded")
         return self.__loaded_cib_to_modify
 
+    def ensure_cib_scope_loaded(self, scope):
+        """
+        Load a section of the cib element not loaded by get_cib with a scope
+
+        string scope -- name of the section, e.g. configuration, status
+        """
+        if self.__loaded_cib_diff_source is None:
+            raise AssertionError("CIB has not been loaded")
+        if self.__loaded_cib_to_modify.find(scope) is not None:
+            return
+        section_xml = get_cib_xml(self.cmd_runner(), scope)
+        # the section is not modified yet, add it to the diff source as well
+        diff_source = get_cib(self.__loaded_cib_diff_source)
+        diff_source.append(get_cib(section_xml))
+        self.__loaded_cib_diff_source = etree_to_str(diff_source)
+        self.__loaded_cib_to_modify.append(get_cib(section_xml))
+
     def get_cluster_state(self):
         return get_cluster_state_dom(get_cluster_status_xml(self.cmd_runner()))
 
@@ -185,6 +292,15 @@ class LibraryEnvironment(object):
             return self.__push_cib_full(custom_cib, wait)
         if self.__loaded_cib_diff_source is None:
             raise AssertionError("CIB has not been loaded")
+        if self.__cib_batch_running:
+            if wait is not False:
+                raise AssertionError(
+                    "Cannot wait for a CIB push in a batch, wait for the batch"
+                )
+            return
+        self.__push_loaded_cib(wait)
+
+    def __push_loaded_cib(self, wait=False):
         # Push by diff works with crm_feature_set > 3.0.8, see
         # https://bugzilla.redhat.com/show_bug.cgi?id=1488044 for details. We
         # only check the version if a CIB has been loaded, otherwise the push
@@ -201,8 +317,9 @@ class LibraryEnvironment(object):
                     self.__loaded_cib_diff_source_feature_set
                 )
             )
-            return self.__push_cib_full(self.__loaded_cib_to_modify, wait=wait)
-        return self.__push_cib_diff(wait=wait)
+            self.__push_cib_full(self.__loaded_cib_to_modify, wait=wait)
+            return
+        self.__push_cib_diff(wait=wait)
 
     def __push_cib_full(self, cib_to_push, wait=False):
         cmd_runner = self.cmd_runner()
@@ -221,24 +338,76 @@ class LibraryEnvironment(object):
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
+        if settings.cib_diff_mode == "crm_diff":
+            cib_diff_xml = self.__get_cib_diff_crm_diff(cmd_runner)
+        elif settings.cib_diff_mode == "cross-check":
+            cib_diff_xml = self.__get_cib_diff_cross_checked(cmd_runner)
+        else:
+            cib_diff_xml = self.__get_cib_diff_native()
+            if cib_diff_xml is None:
+                cib_diff_xml = self.__get_cib_diff_crm_diff(cmd_runner)
+        if cib_diff_xml:
+            push_cib_diff_xml(cmd_runner, cib_diff_xml)
+
+    def __get_cib_diff_crm_diff(self, cmd_runner):
+        return diff_cibs_xml(
             cmd_runner,
             self.report_processor,
             self.__loaded_cib_diff_source,
             etree_to_str(self.__loaded_cib_to_modify)
         )
-        if cib_diff_xml:
-            push_cib_diff_xml(cmd_runner, cib_diff_xml)
+
+    def __get_cib_diff_native(self):
+        """
+        Return a diff of the loaded and the modified CIB or None if the diff
+        cannot be created without crm_diff
+        """
+        try:
+            return diff_cibs(
+                get_cib(self.__loaded_cib_diff_source),
+                self.__loaded_cib_to_modify
+            )
+        except DiffNotSupported as e:
+            self.logger.debug("Using crm_diff to diff CIBs: %s", e)
+            return None
+
+    def __get_cib_diff_cross_checked(self, cmd_runner):
+        native_diff_xml = self.__get_cib_diff_native()
+        crm_diff_xml = self.__get_cib_diff_crm_diff(cmd_runner)
+        if native_diff_xml is None:
+            return crm_diff_xml
+        cib_native = get_cib(self.__loaded_cib_diff_source)
+        cib_crm_diff = get_cib(self.__loaded_cib_diff_source)
+        try:
+            if native_diff_xml:
+                apply_patchset(cib_native, xml_fromstring(native_diff_xml))
+            if crm_diff_xml:
+                apply_patchset(cib_crm_diff, xml_fromstring(crm_diff_xml))
+            equivalent = are_cibs_equivalent(cib_native, cib_crm_diff)
+        except (ValueError, etree.XMLSyntaxError) as e:
+            self.logger.warning("Unable to apply a CIB diff: %s", e)
+            equivalent = False
+        if not equivalent:
+            self.logger.warning(
+                "CIB diff created by pcs differs from crm_diff result\n"
+                "pcs:\n%s\ncrm_diff:\n%s",
+                native_diff_xml,
+                crm_diff_xml
+            )
+        return crm_diff_xml
 
     def __do_push_cib(self, cmd_runner, push_strategy, wait):
         timeout = self._get_wait_timeout(wait)
         push_strategy()
+        self.__drop_loaded_cib()
+        if self.is_cib_live and timeout is not False:
+            wait_for_idle(cmd_runner, timeout)
+
+    def __drop_loaded_cib(self):
         self._cib_upgrade_reported = False
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
-        if self.is_cib_live and timeout is not False:
-            wait_for_idle(cmd_runner, timeout)
 
     @property
     def is_cib_live(self):
@@ -356,9 +525,12 @@ class LibraryEnvironment(object):
     def communicator_factory(self):
         return self._communicator_factory
 
-    def get_node_communicator(self, request_timeout=None):
+    def get_node_communicator(
+        self, request_timeout=None, retry_unreachable=False
+    ):
         return self.communicator_factory.get_communicator(
-            request_timeout=request_timeout
+            request_timeout=request_timeout,
+            retry_unreachable=retry_unreachable,
         )
 
     def get_node_target_factory(self):
@@ -0,0 +1,156 @@
+"""
+In-process cache of the live CIB.
+
+Legacy commands load the CIB many times while running and a pcs shell runs many
+commands in one process. A cached CIB is used as long as the attributes of the
+cib element reported by pacemaker do not change. Besides the CIB version
+(admin_epoch, epoch, num_updates), they contain the time and origin of the last
+write, so a CIB of a destroyed and newly set up cluster is not mistaken for the
+cached one even if its version matches. Querying the cib element only is much
+cheaper than downloading and parsing the whole CIB.
+
+The cached CIB contains the status section, so it is only valid while
+num_updates does not change. The cache is kept in memory only, as CIBs cached
+between pcs runs would be outdated most of the time on a running cluster.
+
+The cache is keyed by the CIB_user pacemaker shows the CIB to, as ACLs may
+hide parts of the CIB from some users. The cache is only used for the local
+CIB, it is bypassed when connecting to a CIB file, a shadow CIB or a remote
+CIB.
+"""
+import re
+
+from lxml import etree
+
+
+_CIB_START_TAG_RE = re.compile(r"<cib\b[^>]*>")
+_VERSION_ATTRIBUTES = ("admin_epoch", "epoch", "num_updates")
+# environment variables of pacemaker tools which do not make them connect to
+# a different CIB
+_LOCAL_CIB_ENV_VARS = frozenset(["CIB_user"])
+
+_cib_cache = None
+
+def enable():
+    """
+    Make pcs cache the live CIB in this process
+    """
+    global _cib_cache
+    # keep the CIBs cached when enabled again in the same process
+    if _cib_cache is None:
+        _cib_cache = CibCache()
+
+def disable():
+    global _cib_cache
+    _cib_cache = None
+
+def get_cache(env_vars):
+    """
+    Return the CIB cache or None if the cache is disabled or not applicable
+
+    dict env_vars -- environment variables of pacemaker tools
+    """
+    if _cib_cache is None:
+        return None
+    for name, value in env_vars.items():
+        if (
+            name.startswith("CIB_")
+            and
+            name not in _LOCAL_CIB_ENV_VARS
+            and
+            value
+        ):
+            return None
+    return _cib_cache
+
+def clear():
+    """
+    Forget all cached CIBs
+
+    Cached CIBs cannot be trusted once the cluster has been destroyed or its
+    configuration has been restored.
+    """
+    if _cib_cache is not None:
+        _cib_cache.clear()
+
+def get_version_from_xml(cib_xml):
+    """
+    Return the version of the CIB as a tuple or None if it cannot be found
+
+    string cib_xml -- CIB or the cib element only
+    """
+    cib_el = _get_cib_element(cib_xml)
+    if cib_el is None:
+        return None
+    try:
+        return tuple(
+            int(cib_el.get(name, "0")) for name in _VERSION_ATTRIBUTES
+        )
+    except ValueError:
+        return None
+
+def get_identity_from_xml(cib_xml):
+    """
+    Return attributes of the cib element as a sorted list of [name, value]
+        pairs or None if the CIB version cannot be found
+
+    string cib_xml -- CIB or the cib element only
+    """
+    if get_version_from_xml(cib_xml) is None:
+        return None
+    return sorted(
+        [name, value]
+        for name, value in _get_cib_element(cib_xml).attrib.items()
+    )
+
+def _get_cib_element(cib_xml):
+    match = _CIB_START_TAG_RE.search(cib_xml)
+    if not match:
+        return None
+    start_tag = match.group(0)
+    if not start_tag.endswith("/>"):
+        start_tag = start_tag[:-1] + "/>"
+    try:
+        return etree.fromstring(start_tag)
+    except etree.XMLSyntaxError:
+        return None
+
+class CibCache(object):
+    def __init__(self):
+        self._cache = {}
+
+    def get(self, cib_user, get_current_identity):
+        """
+        Return the cached CIB or None if it is not cached or outdated
+
+        string cib_user -- user the CIB has been loaded for
+        callable get_current_identity -- returns attributes of the cib element
+            of the live CIB as get_identity_from_xml does or None if they
+            cannot be obtained
+        """
+        cached = self._cache.get(cib_user)
+        if cached is None:
+            return None
+        identity, cib_xml = cached
+        if identity != get_current_identity():
+            del self._cache[cib_user]
+            return None
+        return cib_xml
+
+    def put(self, cib_user, cib_xml):
+        """
+        Store a freshly loaded CIB
+
+        string cib_user -- user the CIB has been loaded for
+        string cib_xml -- the whole CIB
+        """
+        identity = get_identity_from_xml(cib_xml)
+        if identity is None:
+            return
+        self._cache[cib_user] = (identity, cib_xml)
+
+    def clear(self):
+        """
+        Remove all cached CIBs
+        """
+        self._cache.clear()
@@ -8,6 +8,7 @@ from pcs.common.tools import (
 )
 from pcs.lib import reports
 from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
+from pcs.lib.pacemaker import cib_cache
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.tools import write_tmpfile
@@ -44,7 +45,56 @@ def get_cib_xml_cmd_results(runner, scope=None):
     stdout, stderr, returncode = runner.run(command)
     return stdout, stderr, returncode
 
+def get_cib_root_xml_cmd_results(runner):
+    return runner.run([
+        __exec("cibadmin"), "--local", "--query", "--xpath=/cib",
+        "--no-children"
+    ])
+
+def get_cib_version(runner):
+    """
+    Return the version of the live CIB as a tuple or None if it is not known
+    """
+    stdout, dummy_stderr, retval = get_cib_root_xml_cmd_results(runner)
+    if retval != 0:
+        return None
+    return cib_cache.get_version_from_xml(stdout)
+
+def get_cib_identity(runner):
+    """
+    Return attributes of the cib element of the live CIB identifying its
+        content or None if they are not known
+    """
+    stdout, dummy_stderr, retval = get_cib_root_xml_cmd_results(runner)
+    if retval != 0:
+        return None
+    return cib_cache.get_identity_from_xml(stdout)
+
+def get_cib_xml_scoped(runner, scope_list):
+    """
+    Return a CIB containing only the specified sections of the cib element
+
+    CommandRunner runner
+    iterable scope_list -- names of the sections, e.g. configuration, status
+    """
+    stdout, stderr, retval = get_cib_root_xml_cmd_results(runner)
+    if retval != 0:
+        raise LibraryError(
+            reports.cib_load_error(join_multilines([stderr, stdout]))
+        )
+    cib = get_cib(stdout)
+    for scope in scope_list:
+        cib.append(get_cib(get_cib_xml(runner, scope)))
+    return etree_to_str(cib)
+
 def get_cib_xml(runner, scope=None):
+    # only the whole CIB is cached, scopes do not contain the CIB version
+    cache = None if scope else cib_cache.get_cache(runner.env_vars)
+    if cache is not None:
+        cib_user = runner.env_vars.get("CIB_user")
+        cached_cib_xml = cache.get(cib_user, lambda: get_cib_identity(runner))
+        if cached_cib_xml is not None:
+            return cached_cib_xml
     stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope)
     if retval != 0:
         if retval == __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT and scope:
@@ -58,6 +108,8 @@ def get_cib_xml(runner, scope=None):
             raise LibraryError(
                 reports.cib_load_error(join_multilines([stderr, stdout]))
             )
+    if cache is not None:
+        cache.put(cib_user, stdout)
     return stdout
 
 def parse_cib_xml(xml):
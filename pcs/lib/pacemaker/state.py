@@ -15,7 +15,7 @@ from pcs.lib.pacemaker.values import (
     is_false,
     is_true,
 )
-from pcs.lib.xml_tools import find_parent
+from pcs.lib.xml_tools import get_relaxng
 
 class ResourceNotFound(Exception):
     pass
@@ -58,16 +58,22 @@ class _Children(object):
         self.sections = sections
 
     def __getattr__(self, name):
+        # Found children are stored as attributes of the instance, so the dom
+        # is searched only when a child is accessed for the first time.
         if name in self.children.keys():
             element_name, wrapper = self.children[name]
-            return [
+            value = [
                 wrapper(element)
-                for element in self.dom_part.findall('.//' + element_name)
+                for element in self.dom_part.iterfind('.//' + element_name)
             ]
+            setattr(self, name, value)
+            return value
 
         if name in self.sections.keys():
             element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall('.//' + element_name)[0])
+            value = wrapper(self.dom_part.findall('.//' + element_name)[0])
+            setattr(self, name, value)
+            return value
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'"
@@ -138,7 +144,7 @@ def get_cluster_state_dom(xml):
     try:
         dom = xml_fromstring(xml)
         if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+            get_relaxng(settings.crm_mon_schema).assertValid(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
@@ -153,30 +159,123 @@ class ClusterState(_Element):
         self.dom = get_cluster_state_dom(xml)
         super(ClusterState, self).__init__(self.dom)
 
-def _id_xpath_predicate(resource_id):
-    return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
+class _PrimitiveState(object):
+    __slots__ = ("element", "position", "failed", "managed", "container_list")
+
+    def __init__(self, element, position):
+        self.element = element
+        self.position = position
+        self.failed = is_true(element.attrib.get("failed", ""))
+        self.managed = element.attrib.get("managed", "")
+        # the closest clone or bundle first
+        self.container_list = []
+
+class _ContainerState(object):
+    # clone or bundle
+    __slots__ = ("managed", "primitive_list", "group_list", "all_primitives")
+
+    def __init__(self, element):
+        self.managed = element.attrib.get("managed", "")
+        # primitives which are direct children of the clone or its replicas
+        self.primitive_list = []
+        # groups in the clone, each group is a list of its primitives
+        self.group_list = []
+        self.all_primitives = []
+
+class _ResourceStateIndex(object):
+    """
+    Resources in a cluster state indexed by their ids
+
+    Primitives and groups are indexed by their ids as well as by the ids of
+    their clones, e.g. "R:0" can be found as "R:0" and "R".
+    """
+    __slots__ = ("primitives", "groups", "containers")
+
+    def __init__(self, cluster_state):
+        self.primitives = defaultdict(list)
+        self.groups = defaultdict(list)
+        self.containers = {}
+        container_by_element = {}
+        for element in cluster_state.iter("clone", "bundle"):
+            container = _ContainerState(element)
+            container_by_element[element] = container
+            self.containers.setdefault(element.attrib.get("id"), container)
+
+        primitive_by_element = {}
+        for position, element in enumerate(cluster_state.iter("resource")):
+            primitive = _PrimitiveState(element, position)
+            primitive_by_element[element] = primitive
+            for resource_id in self.__get_lookup_ids(element):
+                self.primitives[resource_id].append(primitive)
+            for container_el in element.iterancestors("clone", "bundle"):
+                container = container_by_element[container_el]
+                primitive.container_list.append(container)
+                container.all_primitives.append(primitive)
+            parent = element.getparent()
+            if parent is not None and parent.tag == "replica":
+                parent = parent.getparent()
+                if parent is not None and parent.tag != "bundle":
+                    parent = None
+            if parent is not None and parent.tag in ("clone", "bundle"):
+                container_by_element[parent].primitive_list.append(primitive)
+
+        for element in cluster_state.iter("group"):
+            group = [
+                primitive_by_element[child]
+                for child in element.iterchildren("resource")
+            ]
+            for group_id in self.__get_lookup_ids(element):
+                self.groups[group_id].append(group)
+            parent = element.getparent()
+            if parent is not None and parent.tag == "clone":
+                container_by_element[parent].group_list.append(group)
+
+    @staticmethod
+    def __get_lookup_ids(element):
+        element_id = element.attrib.get("id", "")
+        lookup_ids = [element_id]
+        position = element_id.find(":")
+        while position != -1:
+            lookup_ids.append(element_id[:position])
+            position = element_id.find(":", position + 1)
+        return lookup_ids
+
+# A cluster state is usually checked for many resources before a new state is
+# loaded. Keep the index of the last state.
+_last_resource_index = (None, None)
+
+def _get_resource_index(cluster_state):
+    global _last_resource_index
+    if _last_resource_index[0] is not cluster_state:
+        _last_resource_index = (
+            cluster_state, _ResourceStateIndex(cluster_state)
+        )
+    return _last_resource_index[1]
 
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
-    primitives = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource[{predicate_position}]
-        |
-        .//clone[@id="{id}"]/resource
-        |
-        .//clone[@id="{id}"]/group/resource[{predicate_position}]
-        |
-        .//bundle[@id="{id}"]/replica/resource
-    """.format(
-        id=resource_id,
-        predicate_id=_id_xpath_predicate(resource_id),
-        predicate_position=("last()" if expected_running else "1")
-    ))
+    index = _get_resource_index(cluster_state)
+    group_position = -1 if expected_running else 0
+    primitive_list = list(index.primitives.get(resource_id, []))
+    group_list = list(index.groups.get(resource_id, []))
+    container = index.containers.get(resource_id)
+    if container is not None:
+        primitive_list.extend(container.primitive_list)
+        group_list.extend(container.group_list)
+    primitive_list.extend(
+        [group[group_position] for group in group_list if group]
+    )
     return [
-        element for element in primitives
-            if not is_true(element.attrib.get("failed", ""))
+        primitive.element
+        for primitive in sorted(
+            # an element may have been found more than once
+            dict(
+                (primitive.position, primitive) for primitive in primitive_list
+            ).values(),
+            key=lambda primitive: primitive.position
+        )
+        if not primitive.failed
     ]
 
 def _get_primitive_roles_with_nodes(primitive_el_list):
@@ -245,36 +344,30 @@ def is_resource_managed(cluster_state, resource_id):
     etree cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
-    primitive_list = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource
-        """.format(predicate_id=_id_xpath_predicate(resource_id))
-    )
+    index = _get_resource_index(cluster_state)
+    primitive_list = index.primitives.get(resource_id, []) + [
+        primitive
+        for group in index.groups.get(resource_id, [])
+        for primitive in group
+    ]
     if primitive_list:
         for primitive in primitive_list:
-            if is_false(primitive.attrib.get("managed", "")):
+            if is_false(primitive.managed):
                 return False
-            parent = find_parent(primitive, ["clone", "bundle"])
             if (
-                parent is not None
+                primitive.container_list
                 and
-                is_false(parent.attrib.get("managed", ""))
+                is_false(primitive.container_list[0].managed)
             ):
                 return False
         return True
 
-    parent_list = cluster_state.xpath("""
-        .//clone[@id="{0}"]
-        |
-        .//bundle[@id="{0}"]
-        """.format(resource_id)
-    )
-    for parent in parent_list:
-        if is_false(parent.attrib.get("managed", "")):
+    container = index.containers.get(resource_id)
+    if container is not None:
+        if is_false(container.managed):
             return False
-        for primitive in parent.xpath(".//resource"):
-            if is_false(primitive.attrib.get("managed", "")):
+        for primitive in container.all_primitives:
+            if is_false(primitive.managed):
                 return False
         return True
 
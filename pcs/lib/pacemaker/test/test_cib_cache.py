@@ -0,0 +1,152 @@
+from unittest import mock, TestCase
+
+from pcs.lib.pacemaker import cib_cache
+
+
+CIB_1 = '<cib admin_epoch="0" epoch="5" num_updates="2"><configuration/></cib>'
+CIB_2 = '<cib admin_epoch="0" epoch="6" num_updates="0"><configuration/></cib>'
+ID_1 = [["admin_epoch", "0"], ["epoch", "5"], ["num_updates", "2"]]
+ID_2 = [["admin_epoch", "0"], ["epoch", "6"], ["num_updates", "0"]]
+
+class GetVersionFromXml(TestCase):
+    def test_whole_cib(self):
+        self.assertEqual(
+            (0, 5, 2), cib_cache.get_version_from_xml(CIB_1)
+        )
+
+    def test_cib_element_only(self):
+        self.assertEqual(
+            (1, 2, 3),
+            cib_cache.get_version_from_xml(
+                '<cib admin_epoch="1" epoch="2" num_updates="3"/>\n'
+            )
+        )
+
+    def test_no_cib(self):
+        self.assertIsNone(cib_cache.get_version_from_xml("<xml/>"))
+
+    def test_invalid_version(self):
+        self.assertIsNone(
+            cib_cache.get_version_from_xml('<cib epoch="a"/>')
+        )
+
+class GetIdentityFromXml(TestCase):
+    def test_whole_cib(self):
+        self.assertEqual(
+            [
+                ["admin_epoch", "0"],
+                ["cib-last-written", "Mon Oct 12 10:00:00 2026"],
+                ["epoch", "5"],
+                ["num_updates", "2"],
+                ["update-origin", "node1"],
+            ],
+            cib_cache.get_identity_from_xml(
+                '<cib num_updates="2" epoch="5" admin_epoch="0" '
+                    'update-origin="node1" '
+                    'cib-last-written="Mon Oct 12 10:00:00 2026">'
+                    '<configuration/></cib>'
+            )
+        )
+
+    def test_no_version(self):
+        self.assertIsNone(cib_cache.get_identity_from_xml('<cib epoch="a"/>'))
+        self.assertIsNone(cib_cache.get_identity_from_xml("<xml/>"))
+
+class CibCacheTest(TestCase):
+    def setUp(self):
+        self.cache = cib_cache.CibCache()
+
+    def test_miss(self):
+        get_version = mock.Mock()
+        self.assertIsNone(self.cache.get(None, get_version))
+        get_version.assert_not_called()
+
+    def test_hit(self):
+        self.cache.put(None, CIB_1)
+        self.assertEqual(CIB_1, self.cache.get(None, lambda: ID_1))
+        self.assertEqual(CIB_1, self.cache.get(None, lambda: ID_1))
+
+    def test_outdated(self):
+        self.cache.put(None, CIB_1)
+        self.assertIsNone(self.cache.get(None, lambda: ID_2))
+        # the outdated CIB has been forgotten
+        self.assertIsNone(self.cache.get(None, lambda: ID_1))
+
+    def test_identity_unknown(self):
+        self.cache.put(None, CIB_1)
+        self.assertIsNone(self.cache.get(None, lambda: None))
+
+    def test_status_changed(self):
+        # only num_updates differs, the status section has changed
+        self.cache.put(None, CIB_1)
+        self.assertIsNone(
+            self.cache.get(None, lambda: ID_1[:2] + [["num_updates", "3"]])
+        )
+
+    def test_same_version_other_cib(self):
+        # e.g. a CIB of a new cluster, its version matches the cached one
+        self.cache.put(None, CIB_1)
+        self.assertIsNone(
+            self.cache.get(
+                None, lambda: ID_1 + [["update-origin", "node1"]]
+            )
+        )
+
+    def test_no_version_not_cached(self):
+        self.cache.put(None, "<cib/>")
+        self.assertIsNone(self.cache.get(None, lambda: None))
+
+    def test_clear(self):
+        self.cache.put(None, CIB_1)
+        self.cache.put("user", CIB_1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(None, lambda: ID_1))
+        self.assertIsNone(self.cache.get("user", lambda: ID_1))
+
+    def test_users_separated(self):
+        self.cache.put("user", CIB_1)
+        self.assertIsNone(self.cache.get(None, lambda: ID_1))
+        self.assertIsNone(self.cache.get("other", lambda: ID_1))
+        self.assertEqual(CIB_1, self.cache.get("user", lambda: ID_1))
+
+class GetCache(TestCase):
+    def setUp(self):
+        self.addCleanup(cib_cache.disable)
+
+    def test_disabled(self):
+        self.assertIsNone(cib_cache.get_cache({}))
+
+    def test_enabled(self):
+        cib_cache.enable()
+        self.assertIsNotNone(cib_cache.get_cache({"CIB_user": "user"}))
+
+    def test_cib_file(self):
+        cib_cache.enable()
+        self.assertIsNone(cib_cache.get_cache({"CIB_file": "/cib.xml"}))
+
+    def test_remote_cib(self):
+        cib_cache.enable()
+        self.assertIsNone(cib_cache.get_cache({"CIB_server": "node1"}))
+        self.assertIsNone(cib_cache.get_cache({"CIB_port": "1234"}))
+        self.assertIsNone(cib_cache.get_cache({"CIB_shadow": "shadow"}))
+        self.assertIsNotNone(cib_cache.get_cache({"CIB_file": ""}))
+
+    def test_enabled_again(self):
+        cib_cache.enable()
+        cache = cib_cache.get_cache({})
+        cib_cache.enable()
+        self.assertIs(cache, cib_cache.get_cache({}))
+
+class Clear(TestCase):
+    def setUp(self):
+        self.addCleanup(cib_cache.disable)
+
+    def test_enabled_cache(self):
+        cib_cache.enable()
+        cache = cib_cache.get_cache({})
+        cache.put(None, CIB_1)
+        cib_cache.clear()
+        self.assertIsNone(cache.get(None, lambda: ID_1))
+
+    def test_disabled_cache(self):
+        cib_cache.clear()
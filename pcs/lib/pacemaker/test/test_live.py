@@ -169,6 +169,72 @@ class GetCibXmlTest(LibraryPacemakerTest):
             ]
         )
 
+class GetCibXmlCached(LibraryPacemakerTest):
+    cib = '<cib admin_epoch="0" epoch="1" num_updates="2"/>'
+
+    def setUp(self):
+        self.cache = mock.Mock(spec_set=["get", "put"])
+        patcher = mock.patch(
+            "pcs.lib.pacemaker.cib_cache._cib_cache", self.cache
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cached(self):
+        self.cache.get.return_value = self.cib
+        runner = get_runner(self.cib, env_vars={"CIB_user": "user"})
+
+        self.assertEqual(self.cib, lib.get_cib_xml(runner))
+
+        self.assertEqual("user", self.cache.get.call_args[0][0])
+        self.assertEqual(
+            [["admin_epoch", "0"], ["epoch", "1"], ["num_updates", "2"]],
+            self.cache.get.call_args[0][1]()
+        )
+        runner.run.assert_called_once_with([
+            self.path("cibadmin"), "--local", "--query", "--xpath=/cib",
+            "--no-children"
+        ])
+        self.cache.put.assert_not_called()
+
+    def test_not_cached(self):
+        self.cache.get.return_value = None
+        runner = get_runner(self.cib)
+
+        self.assertEqual(self.cib, lib.get_cib_xml(runner))
+
+        runner.run.assert_called_once_with(
+            [self.path("cibadmin"), "--local", "--query"]
+        )
+        self.cache.put.assert_called_once_with(None, self.cib)
+
+    def test_scope_not_cached(self):
+        runner = get_runner("<resources/>")
+
+        lib.get_cib_xml(runner, scope="resources")
+
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+    def test_file_not_cached(self):
+        runner = get_runner(self.cib, env_vars={"CIB_file": "/cib.xml"})
+
+        lib.get_cib_xml(runner)
+
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+    def test_remote_not_cached(self):
+        runner = get_runner(
+            self.cib, env_vars={"CIB_server": "node1", "CIB_user": "user"}
+        )
+
+        lib.get_cib_xml(runner)
+
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+
 class GetCibTest(LibraryPacemakerTest):
     def test_success(self):
         xml = "<xml />"
@@ -600,6 +600,39 @@ class InfoResourceState(CommonResourceState):
         )
 
 
+class GetResourceIndex(TestCase):
+    def test_index_reused_for_the_same_state(self):
+        status = etree.fromstring("<resources/>")
+        self.assertIs(
+            state._get_resource_index(status),
+            state._get_resource_index(status)
+        )
+        self.assertIsNot(
+            state._get_resource_index(status),
+            state._get_resource_index(etree.fromstring("<resources/>"))
+        )
+
+    def test_ids_with_more_colons(self):
+        status = etree.fromstring("""
+            <resources>
+                <resource id="A:B:0" failed="false"/>
+                <resource id="A:C" failed="false"/>
+            </resources>
+        """)
+        self.assertEqual(
+            [["A:B:0", "A:C"], ["A:B:0"], ["A:B:0"], []],
+            [
+                [
+                    element.attrib["id"]
+                    for element in state._get_primitives_for_state_check(
+                        status, resource_id, True
+                    )
+                ]
+                for resource_id in ["A", "A:B", "A:B:0", "A:B:"]
+            ]
+        )
+
+
 class IsResourceManaged(TestCase):
     status_xml = etree.fromstring("""
         <resources>
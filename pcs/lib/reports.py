@@ -2825,6 +2825,22 @@ def unable_to_upgrade_cib_to_required_version(
         }
     )
 
+def cib_upgrade_in_batch_not_possible(current_version, required_version):
+    """
+    A command in a batch needs a newer CIB schema, the CIB cannot be upgraded
+    without pushing the changes done in the batch so far
+
+    pcs.common.tools.Version current_version -- current version of CIB schema
+    pcs.common.tools.Version required_version -- required version of CIB schema
+    """
+    return ReportItem.error(
+        report_codes.CIB_UPGRADE_IN_BATCH_NOT_POSSIBLE,
+        info={
+            "required_version": str(required_version),
+            "current_version": str(current_version)
+        }
+    )
+
 def file_already_exists(
         file_role, file_path, severity=ReportItemSeverity.ERROR,
         forceable=None, node=None
@@ -5,8 +5,8 @@ import re
 
 from pcs import settings
 from pcs.common import report_codes
-from pcs.common.tools import xml_fromstring
-from pcs.lib import reports, validate
+from pcs.common.tools import map_parallel, xml_fromstring
+from pcs.lib import agent_metadata_cache, reports, validate
 from pcs.lib.errors import LibraryError, ReportItemSeverity
 from pcs.lib.pacemaker.values import is_true
 
@@ -157,13 +157,15 @@ def list_resource_agents_standards_and_providers(runner):
     Return list of all standard[:provider] on the local host
     CommandRunner runner
     """
+    standard_list, provider_list = map_parallel(
+        lambda list_func: list_func(runner),
+        [list_resource_agents_standards, list_resource_agents_ocf_providers],
+        settings.agent_metadata_parallelism
+    )
     standards = (
-        list_resource_agents_standards(runner)
+        standard_list
         +
-        [
-            "ocf:{0}".format(provider)
-            for provider in list_resource_agents_ocf_providers(runner)
-        ]
+        ["ocf:{0}".format(provider) for provider in provider_list]
     )
     # do not list ocf resources twice
     try:
@@ -192,6 +194,27 @@ def list_resource_agents(runner, standard_provider):
     return _prepare_agent_list(stdout)
 
 
+def list_resource_agents_for_all_standards(runner):
+    """
+    Return list of (standard[:provider], agent) of all resource agents on the
+        local host
+    CommandRunner runner
+    """
+    standard_list = list_resource_agents_standards_and_providers(runner)
+    agent_list_list = map_parallel(
+        lambda standard_provider: list_resource_agents(
+            runner, standard_provider
+        ),
+        standard_list,
+        settings.agent_metadata_parallelism
+    )
+    return [
+        (standard_provider, agent)
+        for standard_provider, agent_list in zip(standard_list, agent_list_list)
+        for agent in agent_list
+    ]
+
+
 def list_stonith_agents(runner):
     """
     Return list of fence agents on the local host
@@ -220,6 +243,28 @@ def list_stonith_agents(runner):
     return _prepare_agent_list(stdout, ignored_agents)
 
 
+def prefetch_agents_metadata(agent_list):
+    """
+    Load metadata of the agents in parallel, return agents with valid metadata
+
+    Loaded metadata are kept in the agents and stored in the agent metadata
+    cache if it is enabled.
+
+    iterable agent_list -- CrmAgent instances
+    """
+    agent_list = list(agent_list)
+    is_valid_list = map_parallel(
+        lambda agent: agent.is_valid_metadata(),
+        agent_list,
+        settings.agent_metadata_parallelism
+    )
+    return [
+        agent
+        for agent, is_valid in zip(agent_list, is_valid_list)
+        if is_valid
+    ]
+
+
 def _prepare_agent_list(agents_string, filter_list=None):
     ignored = frozenset(filter_list) if filter_list else frozenset([])
     result = [
@@ -241,11 +286,11 @@ def guess_resource_agent_full_name(runner, search_agent_name):
     """
     search_lower = search_agent_name.lower()
     # list all possible names
-    possible_names = []
-    for std in list_resource_agents_standards_and_providers(runner):
-        for agent in list_resource_agents(runner, std):
-            if search_lower == agent.lower():
-                possible_names.append("{0}:{1}".format(std, agent))
+    possible_names = [
+        "{0}:{1}".format(std, agent)
+        for std, agent in list_resource_agents_for_all_standards(runner)
+        if search_lower == agent.lower()
+    ]
     # construct agent wrappers
     agent_candidates = [
         ResourceAgent(runner, agent) for agent in possible_names
@@ -719,10 +764,35 @@ class Agent():
             or parse its metadata
         """
         if self._metadata is None:
-            self._metadata = self._parse_metadata(self._load_metadata())
+            self._metadata = self._parse_metadata(self._get_raw_metadata())
         return self._metadata
 
 
+    def _get_raw_metadata(self):
+        cache = agent_metadata_cache.get_cache()
+        if cache is None:
+            return self._load_metadata()
+        file_list = self._get_metadata_file_list()
+        if not file_list:
+            return self._load_metadata()
+        metadata = cache.get(self._get_metadata_cache_key(), file_list)
+        if metadata is None:
+            metadata = self._load_metadata()
+            cache.put(self._get_metadata_cache_key(), file_list, metadata)
+        return metadata
+
+
+    def _get_metadata_file_list(self):
+        """
+        Return files the metadata come from, empty list disables caching
+        """
+        return []
+
+
+    def _get_metadata_cache_key(self):
+        return self.get_name()
+
+
     def _load_metadata(self):
         raise NotImplementedError()
 
@@ -790,6 +860,10 @@ class FencedMetadata(FakeAgentMetadata):
         return parameter
 
 
+    def _get_metadata_file_list(self):
+        return [settings.pacemaker_fenced]
+
+
     def _load_metadata(self):
         stdout, stderr, dummy_retval = self._runner.run(
             [settings.pacemaker_fenced, "metadata"]
@@ -843,6 +917,22 @@ class CrmAgent(Agent):
         self._get_metadata()
         return self
 
+    def _get_metadata_cache_key(self):
+        return self._get_full_name()
+
+    def _get_agent_executable(self):
+        """
+        Return path to the agent's executable, None if it cannot be determined
+        """
+        return None
+
+    def _get_metadata_file_list(self):
+        executable = self._get_agent_executable()
+        if not executable:
+            return []
+        # crm_resource is included as it may change metadata of some agents
+        return [executable, _crm_resource]
+
     def _load_metadata(self):
         env_path = ":".join([
             # otherwise pacemaker cannot run RHEL fence agents to get their
@@ -876,6 +966,20 @@ class ResourceAgent(CrmAgent):
     def get_name(self):
         return self._get_full_name()
 
+    def _get_agent_executable(self):
+        if self.get_standard() == "ocf":
+            return os.path.join(
+                settings.ocf_root,
+                "resource.d",
+                self.get_provider(),
+                self.get_type()
+            )
+        if self.get_standard() == "lsb":
+            return os.path.join(settings.lsb_agent_binaries, self.get_type())
+        # metadata of other agents are generated by pacemaker from sources
+        # pcs does not know about
+        return None
+
     def get_parameters(self):
         parameters = super(ResourceAgent, self).get_parameters()
         if (
@@ -948,6 +1052,9 @@ class ResourceAgent(CrmAgent):
 
 
 class AbsentAgentMixin():
+    def _get_metadata_file_list(self):
+        return []
+
     def _load_metadata(self):
         return "<resource-agent/>"
 
@@ -987,6 +1094,9 @@ class StonithAgent(CrmAgent):
     def get_name(self):
         return self.get_type()
 
+    def _get_agent_executable(self):
+        return os.path.join(settings.fence_agent_binaries, self.get_type())
+
     def get_parameters(self):
         return (
             self._filter_parameters(
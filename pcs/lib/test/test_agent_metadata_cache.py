@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from pcs.lib import agent_metadata_cache
+
+
+METADATA = '<resource-agent name="Dummy"/>'
+
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.cache = agent_metadata_cache.AgentMetadataCache(self.cache_dir)
+        self.agent_path = os.path.join(self.tmp_dir, "Dummy")
+        self.write_agent("#!/bin/sh\n")
+
+    def write_agent(self, content, mtime=1000000000):
+        with open(self.agent_path, "w") as agent_file:
+            agent_file.write(content)
+        os.utime(self.agent_path, (mtime, mtime))
+
+    def test_miss(self):
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+
+    def test_hit(self):
+        self.cache.put("ocf:heartbeat:Dummy", [self.agent_path], METADATA)
+        self.assertEqual(
+            METADATA,
+            agent_metadata_cache.AgentMetadataCache(self.cache_dir).get(
+                "ocf:heartbeat:Dummy", [self.agent_path]
+            )
+        )
+        self.assertIsNone(
+            self.cache.get("ocf:pacemaker:Dummy", [self.agent_path])
+        )
+
+    def test_agent_changed(self):
+        self.cache.put("ocf:heartbeat:Dummy", [self.agent_path], METADATA)
+        self.write_agent("#!/bin/sh\n", mtime=1000000001)
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+        self.write_agent("#!/bin/bash\n")
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+
+    def test_agent_file_missing(self):
+        missing_path = os.path.join(self.tmp_dir, "missing")
+        self.cache.put("ocf:heartbeat:Dummy", [missing_path], METADATA)
+        self.assertEqual([], self.cache.get_agent_names())
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [missing_path]))
+
+    def test_broken_cache_file(self):
+        self.cache.put("ocf:heartbeat:Dummy", [self.agent_path], METADATA)
+        with open(
+            os.path.join(self.cache_dir, "ocf:heartbeat:Dummy.json"), "w"
+        ) as cache_file:
+            cache_file.write("{")
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+
+    def test_agent_names_and_clear(self):
+        self.cache.put("ocf:heartbeat:Dummy", [self.agent_path], METADATA)
+        self.cache.put("stonith:fence_xvm", [self.agent_path], METADATA)
+        self.cache.put("a/b", [self.agent_path], METADATA)
+        self.assertEqual(
+            ["a/b", "ocf:heartbeat:Dummy", "stonith:fence_xvm"],
+            self.cache.get_agent_names()
+        )
+        self.cache.clear()
+        self.assertEqual([], self.cache.get_agent_names())
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+
+    def test_clear_not_existing(self):
+        self.cache.clear()
+        self.assertEqual([], self.cache.get_agent_names())
+
+    def test_cache_not_writable(self):
+        with mock.patch("os.makedirs", side_effect=PermissionError()):
+            self.cache.put("ocf:heartbeat:Dummy", [self.agent_path], METADATA)
+        self.assertIsNone(
+            self.cache.get("ocf:heartbeat:Dummy", [self.agent_path])
+        )
+
+
+class EnableDisable(TestCase):
+    def tearDown(self):
+        agent_metadata_cache.disable()
+
+    def test_enable_disable(self):
+        self.assertIsNone(agent_metadata_cache.get_cache())
+        agent_metadata_cache.enable("/tmp/cache")
+        cache = agent_metadata_cache.get_cache()
+        self.assertEqual("/tmp/cache", cache.cache_dir)
+        agent_metadata_cache.enable("/tmp/cache")
+        self.assertIs(cache, agent_metadata_cache.get_cache())
+        agent_metadata_cache.disable()
+        self.assertIsNone(agent_metadata_cache.get_cache())
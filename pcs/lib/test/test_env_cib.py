@@ -136,6 +136,7 @@ class GetCib(TestCase, ManageCibAssertionMixin):
         self.assert_raises_cib_already_loaded(env.get_cib)
 
 
+@mock.patch("pcs.lib.env.settings.cib_diff_mode", "crm_diff")
 class PushLoadedCib(TestCase, ManageCibAssertionMixin):
     wait_timeout = 10
     def setUp(self):
@@ -434,6 +435,289 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
 
+class GetCibScoped(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(
+            filename="cib-empty-2.0.xml", scope_list=["configuration"]
+        )
+
+    def test_push_diff(self):
+        self.config.runner.cib.push_diff(cib_diff="""
+            <diff format="2">
+                <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                >
+                    <primitive id="R"/>
+                </change>
+            </diff>
+        """)
+        env = self.env_assist.get_env()
+
+        cib = env.get_cib(scope_list=["configuration"])
+        self.assertIsNone(cib.find("status"))
+        self.assertEqual("3.0.9", cib.get("crm_feature_set"))
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id="R"
+        )
+        env.push_cib()
+
+    def test_load_scope_on_demand(self):
+        self.config.runner.cib.push_diff(cib_diff="""
+            <diff format="2">
+                <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                >
+                    <primitive id="R"/>
+                </change>
+            </diff>
+        """)
+        self.config.runner.place(
+            "cibadmin --local --query --scope=status",
+            name="runner.cib.load.status",
+            stdout="<status><node_state id='1'/></status>",
+            before="runner.cib.push_diff",
+        )
+        env = self.env_assist.get_env()
+
+        cib = env.get_cib(scope_list=["configuration"])
+        env.ensure_cib_scope_loaded("status")
+        env.ensure_cib_scope_loaded("configuration")
+        self.assertEqual("1", cib.find("status/node_state").get("id"))
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id="R"
+        )
+        env.push_cib()
+
+
+class CibBatch(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    @staticmethod
+    def create_diff(*resource_id_list):
+        return """
+            <diff format="2">
+                {0}
+            </diff>
+        """.format("".join([
+            """
+                <change operation="create" path="/cib/configuration/resources"
+                    position="{0}"
+                >
+                    <primitive id="{1}"/>
+                </change>
+            """.format(position, resource_id)
+            for position, resource_id in enumerate(resource_id_list)
+        ]))
+
+    @staticmethod
+    def add_resource(env, resource_id, **kwargs):
+        cib = env.get_cib(**kwargs)
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id=resource_id
+        )
+        env.push_cib()
+
+    def test_push_once(self):
+        (self.config
+            .runner.cib.load(filename="cib-empty-2.0.xml")
+            .runner.cib.push_diff(cib_diff=self.create_diff("A", "B"))
+        )
+        env = self.env_assist.get_env()
+
+        with env.cib_batch():
+            self.add_resource(env, "A")
+            self.add_resource(env, "B")
+
+    def test_wait(self):
+        (self.config
+            .runner.pcmk.can_wait()
+            .runner.cib.load(filename="cib-empty-2.0.xml")
+            .runner.cib.push_diff(cib_diff=self.create_diff("A", "B"))
+            .runner.pcmk.wait(timeout=10)
+        )
+        env = self.env_assist.get_env()
+
+        with env.cib_batch(wait="10"):
+            self.add_resource(env, "A")
+            self.add_resource(env, "B")
+
+    def test_nothing_loaded(self):
+        env = self.env_assist.get_env()
+        with env.cib_batch():
+            pass
+
+    def test_no_push_on_error(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+
+        with self.assertRaises(ValueError):
+            with env.cib_batch():
+                self.add_resource(env, "A")
+                raise ValueError()
+        self.assertRaises(AssertionError, lambda: env.cib)
+
+    def test_wait_in_batch_not_allowed(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+
+        with self.assertRaises(AssertionError):
+            with env.cib_batch():
+                env.get_cib()
+                env.push_cib(wait=10)
+
+    def test_load_missing_scope(self):
+        (self.config
+            .runner.cib.load(
+                filename="cib-empty-2.0.xml", scope_list=["configuration"]
+            )
+            .runner.place(
+                "cibadmin --local --query --scope=status",
+                name="runner.cib.load.status",
+                stdout="<status/>",
+            )
+            .runner.cib.push_diff(cib_diff=self.create_diff("A", "B"))
+        )
+        env = self.env_assist.get_env()
+
+        with env.cib_batch():
+            self.add_resource(env, "A", scope_list=["configuration"])
+            self.add_resource(env, "B")
+            self.assertIsNotNone(env.cib.find("status"))
+
+    def test_upgrade_before_batch(self):
+        (self.config
+            .runner.cib.load(name="load_cib_old", filename="cib-empty-2.6.xml")
+            .runner.cib.upgrade()
+            .runner.cib.load(filename="cib-empty-2.8.xml")
+            .runner.cib.push_diff(cib_diff=self.create_diff("A", "B"))
+        )
+        env = self.env_assist.get_env()
+
+        with env.cib_batch(minimal_version=Version(2, 8, 0)):
+            self.add_resource(env, "A")
+            self.add_resource(env, "B", minimal_version=Version(2, 8, 0))
+
+        self.env_assist.assert_reports(
+            [fixture.info(report_codes.CIB_UPGRADE_SUCCESSFUL)]
+        )
+
+    def test_no_upgrade_in_batch(self):
+        self.config.runner.cib.load(filename="cib-empty-2.6.xml")
+        env = self.env_assist.get_env()
+
+        def run_batch():
+            with env.cib_batch():
+                self.add_resource(env, "A")
+                self.add_resource(env, "B", minimal_version=Version(2, 8, 0))
+
+        self.env_assist.assert_raise_library_error(
+            run_batch,
+            [
+                fixture.error(
+                    report_codes.CIB_UPGRADE_IN_BATCH_NOT_POSSIBLE,
+                    current_version="2.6",
+                    required_version="2.8.0",
+                ),
+            ],
+            expected_in_processor=False
+        )
+        self.assertRaises(AssertionError, lambda: env.cib)
+
+    def test_nested_batch_not_allowed(self):
+        env = self.env_assist.get_env()
+        with self.assertRaises(AssertionError):
+            with env.cib_batch():
+                with env.cib_batch():
+                    pass
+
+
+class PushLoadedCibNativeDiff(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+
+    def test_push_diff(self):
+        self.config.runner.cib.push_diff(cib_diff="""
+            <diff format="2">
+                <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                >
+                    <primitive id="R" class="ocf" provider="heartbeat"
+                        type="Dummy"
+                    />
+                </change>
+            </diff>
+        """)
+        env = self.env_assist.get_env()
+
+        etree.SubElement(
+            env.get_cib().find("configuration/resources"),
+            "primitive",
+            id="R", **{"class": "ocf", "provider": "heartbeat", "type": "Dummy"}
+        )
+        env.push_cib()
+
+    def test_no_change(self):
+        env = self.env_assist.get_env()
+
+        env.get_cib()
+        env.push_cib()
+
+    @mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+    def test_fallback_to_crm_diff(self, mock_write_tmpfile):
+        tmpfile_old = mock_tmpfile("old.cib")
+        tmpfile_new = mock_tmpfile("new.cib")
+        mock_write_tmpfile.side_effect = [tmpfile_old, tmpfile_new]
+        (self.config
+            .runner.cib.diff(tmpfile_old.name, tmpfile_new.name)
+            .runner.cib.push_diff()
+        )
+        env = self.env_assist.get_env()
+
+        env.get_cib().find("configuration/resources").append(
+            etree.Comment("not supported")
+        )
+        env.push_cib()
+        self.env_assist.assert_reports([
+            fixture.debug(report_codes.TMP_FILE_WRITE, **{"file_path": name})
+            for name in (tmpfile_old.name, tmpfile_new.name)
+        ])
+
+    @mock.patch("pcs.lib.env.settings.cib_diff_mode", "cross-check")
+    @mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+    def test_cross_check_pushes_crm_diff(self, mock_write_tmpfile):
+        tmpfile_old = mock_tmpfile("old.cib")
+        tmpfile_new = mock_tmpfile("new.cib")
+        mock_write_tmpfile.side_effect = [tmpfile_old, tmpfile_new]
+        crm_diff = """
+            <diff format="2">
+                <change operation="modify" path="/cib/configuration/nodes">
+                    <change-list>
+                        <change-attr name="a" operation="set" value="1"/>
+                    </change-list>
+                    <change-result><nodes a="1"/></change-result>
+                </change>
+            </diff>
+        """
+        (self.config
+            .runner.cib.diff(
+                tmpfile_old.name, tmpfile_new.name, stdout=crm_diff
+            )
+            .runner.cib.push_diff(cib_diff=crm_diff)
+        )
+        env = self.env_assist.get_env()
+
+        env.get_cib().find("configuration/nodes").set("a", "1")
+        env.push_cib()
+        env.logger.warning.assert_not_called()
+        self.env_assist.assert_reports([
+            fixture.debug(report_codes.TMP_FILE_WRITE, **{"file_path": name})
+            for name in (tmpfile_old.name, tmpfile_new.name)
+        ])
+
+
 class PushCustomCib(TestCase, ManageCibAssertionMixin):
     custom_cib = "<custom_cib />"
     wait_timeout = 10
@@ -21,6 +21,19 @@ from pcs.lib.external import CommandRunner
 patch_agent = create_patcher("pcs.lib.resource_agent")
 patch_agent_object = partial(mock.patch.object, lib_ra.Agent)
 
+def fixture_listing_runner(listing_outputs, other_outputs=()):
+    # agents are listed in parallel, so crm_resource listing commands are
+    # matched by their arguments, other commands by their order
+    other_output_iter = iter(other_outputs)
+    def run(args, *dummy_args, **dummy_kwargs):
+        listing_key = " ".join(args[1:])
+        if listing_key in listing_outputs:
+            return listing_outputs[listing_key]
+        return next(other_output_iter)
+    mock_runner = mock.MagicMock(spec_set=CommandRunner)
+    mock_runner.run.side_effect = run
+    return mock_runner
+
 
 class GetDefaultInterval(TestCase):
     def test_return_0s_on_name_different_from_monitor(self):
@@ -292,9 +305,8 @@ class ListResourceAgentsOcfProvidersTest(TestCase):
 
 class ListResourceAgentsStandardsAndProvidersTest(TestCase):
     def test_success(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = [
-            (
+        mock_runner = fixture_listing_runner({
+            "--list-standards": (
                 "\n".join([
                     "ocf",
                     "lsb",
@@ -307,7 +319,7 @@ class ListResourceAgentsStandardsAndProvidersTest(TestCase):
                 "",
                 0
             ),
-            (
+            "--list-ocf-providers": (
                 "\n".join([
                     "heartbeat",
                     "openstack",
@@ -318,7 +330,7 @@ class ListResourceAgentsStandardsAndProvidersTest(TestCase):
                 "",
                 0
             ),
-        ]
+        })
 
         self.assertEqual(
             lib_ra.list_resource_agents_standards_and_providers(mock_runner),
@@ -335,10 +347,36 @@ class ListResourceAgentsStandardsAndProvidersTest(TestCase):
         )
 
         self.assertEqual(2, len(mock_runner.run.mock_calls))
-        mock_runner.run.assert_has_calls([
-            mock.call(["/usr/sbin/crm_resource", "--list-standards"]),
-            mock.call(["/usr/sbin/crm_resource", "--list-ocf-providers"]),
-        ])
+        mock_runner.run.assert_has_calls(
+            [
+                mock.call(["/usr/sbin/crm_resource", "--list-standards"]),
+                mock.call(["/usr/sbin/crm_resource", "--list-ocf-providers"]),
+            ],
+            any_order=True
+        )
+
+
+class ListResourceAgentsForAllStandardsTest(TestCase):
+    def test_success(self):
+        mock_runner = fixture_listing_runner({
+            "--list-standards": ("ocf\nlsb\nservice\n", "", 0),
+            "--list-ocf-providers": ("pacemaker\nheartbeat\n", "", 0),
+            "--list-agents lsb": ("network\n", "", 0),
+            "--list-agents ocf:heartbeat": ("IPaddr2\nDummy\n", "", 0),
+            "--list-agents ocf:pacemaker": ("Dummy\n", "", 0),
+            "--list-agents service": ("", "", 1),
+        })
+
+        self.assertEqual(
+            lib_ra.list_resource_agents_for_all_standards(mock_runner),
+            [
+                ("lsb", "network"),
+                ("ocf:heartbeat", "Dummy"),
+                ("ocf:heartbeat", "IPaddr2"),
+                ("ocf:pacemaker", "Dummy"),
+            ]
+        )
+        self.assertEqual(6, len(mock_runner.run.mock_calls))
 
 
 class ListResourceAgentsTest(TestCase):
@@ -513,21 +551,16 @@ class ListStonithAgentsTest(TestCase):
 
 class GuessResourceAgentFullNameTest(TestCase):
     def setUp(self):
-        self.mock_runner_side_effect = [
-            # list standards
-            ("ocf\n", "", 0),
-            # list providers
-            ("heartbeat\npacemaker\n", "", 0),
-            # list agents for standard-provider pairs
-            ("Delay\nDummy\n", "", 0),
-            ("Dummy\nStateful\n", "", 0),
-        ]
+        self.listing_outputs = {
+            "--list-standards": ("ocf\n", "", 0),
+            "--list-ocf-providers": ("heartbeat\npacemaker\n", "", 0),
+            "--list-agents ocf:heartbeat": ("Delay\nDummy\n", "", 0),
+            "--list-agents ocf:pacemaker": ("Dummy\nStateful\n", "", 0),
+        }
 
     def test_one_agent_list(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("<resource-agent />", "", 0)
             ]
@@ -542,10 +575,8 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_one_agent_exception(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("<resource-agent />", "", 0),
             ]
@@ -560,10 +591,8 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_two_agents_list(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("<resource-agent />", "", 0),
                 ("<resource-agent />", "", 0),
@@ -579,10 +608,8 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_two_agents_one_valid_list(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("<resource-agent />", "", 0),
                 ("invalid metadata", "", 0),
@@ -598,10 +625,8 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_two_agents_exception(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("<resource-agent />", "", 0),
                 ("<resource-agent />", "", 0),
@@ -627,8 +652,7 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_no_agents_list(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = self.mock_runner_side_effect
+        mock_runner = fixture_listing_runner(self.listing_outputs)
 
         self.assertEqual(
             lib_ra.guess_resource_agent_full_name(mock_runner, "missing"),
@@ -636,8 +660,7 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_no_agents_exception(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = self.mock_runner_side_effect
+        mock_runner = fixture_listing_runner(self.listing_outputs)
 
         assert_raise_library_error(
             lambda: lib_ra.guess_exactly_one_resource_agent_full_name(
@@ -654,10 +677,8 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_no_valids_agent_list(self):
-        mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
+        mock_runner = fixture_listing_runner(
+            self.listing_outputs,
             [
                 ("invalid metadata", "", 0),
             ]
@@ -2381,3 +2402,69 @@ class AbsentResourceAgentTest(TestCase):
                 }
             )
         )
+
+
+@mock.patch("pcs.lib.resource_agent.agent_metadata_cache.get_cache")
+class AgentMetadataCacheTest(TestCase):
+    metadata = "<resource-agent><shortdesc>cached</shortdesc></resource-agent>"
+
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.return_value = (self.metadata, "", 0)
+        self.cache = mock.Mock(spec_set=["get", "put"])
+
+    def test_cache_disabled(self, mock_get_cache):
+        mock_get_cache.return_value = None
+        agent = lib_ra.ResourceAgent(self.mock_runner, "ocf:heartbeat:Dummy")
+        self.assertEqual("cached", agent.get_shortdesc())
+        self.mock_runner.run.assert_called_once_with(
+            ["/usr/sbin/crm_resource", "--show-metadata", "ocf:heartbeat:Dummy"],
+            env_extend={"PATH": "/usr/sbin/:/bin/:/usr/bin/"}
+        )
+
+    def test_hit(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        self.cache.get.return_value = self.metadata
+        agent = lib_ra.ResourceAgent(self.mock_runner, "ocf:heartbeat:Dummy")
+        self.assertEqual("cached", agent.get_shortdesc())
+        self.mock_runner.run.assert_not_called()
+        self.cache.get.assert_called_once_with(
+            "ocf:heartbeat:Dummy",
+            [
+                "/usr/lib/ocf/resource.d/heartbeat/Dummy",
+                "/usr/sbin/crm_resource",
+            ]
+        )
+        self.cache.put.assert_not_called()
+
+    def test_miss(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        self.cache.get.return_value = None
+        agent = lib_ra.StonithAgent(self.mock_runner, "fence_xvm")
+        self.assertEqual("cached", agent.get_shortdesc())
+        self.mock_runner.run.assert_called_once_with(
+            ["/usr/sbin/crm_resource", "--show-metadata", "stonith:fence_xvm"],
+            env_extend={"PATH": "/usr/sbin/:/bin/:/usr/bin/"}
+        )
+        self.cache.put.assert_called_once_with(
+            "stonith:fence_xvm",
+            ["/usr/sbin/fence_xvm", "/usr/sbin/crm_resource"],
+            self.metadata
+        )
+
+    def test_not_cacheable_agent(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        agent = lib_ra.ResourceAgent(self.mock_runner, "systemd:httpd")
+        self.assertEqual("cached", agent.get_shortdesc())
+        self.mock_runner.run.assert_called_once()
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+    def test_absent_agent_not_cached(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        agent = lib_ra.AbsentResourceAgent(
+            self.mock_runner, "ocf:heartbeat:Absent"
+        )
+        self.assertEqual("", agent.get_shortdesc())
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
@@ -1,4 +1,6 @@
+import os
 from lxml import etree
+from tempfile import NamedTemporaryFile
 from unittest import TestCase
 
 from pcs.lib import xml_tools as lib
@@ -197,3 +199,35 @@ class RemoveWhenPointless(TestCase):
 
     def test_remove_when_only_id(self):
         self.assert_remove("with-only-id")
+
+class GetRelaxng(TestCase):
+    schema = """
+        <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+            <start><element name="{0}"><empty/></element></start>
+        </grammar>
+    """
+
+    def setUp(self):
+        self.schema_file = NamedTemporaryFile("w", suffix=".rng")
+        self.addCleanup(self.schema_file.close)
+
+    def write_schema(self, element_name, mtime):
+        self.schema_file.seek(0)
+        self.schema_file.truncate()
+        self.schema_file.write(self.schema.format(element_name))
+        self.schema_file.flush()
+        os.utime(self.schema_file.name, (mtime, mtime))
+
+    def test_compiled_once(self):
+        self.write_schema("a", 1000)
+        schema = lib.get_relaxng(self.schema_file.name)
+        self.assertTrue(schema.validate(etree.fromstring("<a/>")))
+        self.assertIs(schema, lib.get_relaxng(self.schema_file.name))
+
+    def test_compiled_again_when_changed(self):
+        self.write_schema("a", 1000)
+        schema = lib.get_relaxng(self.schema_file.name)
+        self.write_schema("b", 2000)
+        new_schema = lib.get_relaxng(self.schema_file.name)
+        self.assertIsNot(schema, new_schema)
+        self.assertTrue(new_schema.validate(etree.fromstring("<b/>")))
@@ -1,5 +1,28 @@
+import os
+
 from lxml import etree
 
+
+# compiled RelaxNG schemas by their paths, see get_relaxng
+_relaxng_cache = {}
+
+def get_relaxng(path):
+    """
+    Return a compiled RelaxNG schema, compile it only if the file has changed
+    since the last call
+
+    Compiling a schema takes much more time than validating a document.
+
+    string path -- path to the schema file
+    """
+    stat = os.stat(path)
+    file_version = (stat.st_mtime, stat.st_size)
+    cached = _relaxng_cache.get(path)
+    if cached is None or cached[0] != file_version:
+        cached = (file_version, etree.RelaxNG(file=path))
+        _relaxng_cache[path] = cached
+    return cached[1]
+
 def get_root(tree):
     # ElementTree has getroot, Elemet has getroottree
     return tree.getroot() if hasattr(tree, "getroot") else tree.getroottree()
@@ -1,31 +1,39 @@
 import sys
 import xml.dom.minidom
-from xml.dom.minidom import parseString
 import re
 import textwrap
 import time
 import json
 
 from pcs import (
+    settings,
     usage,
     utils,
     constraint,
 )
 from pcs.settings import pacemaker_wait_timeout_status as \
     PACEMAKER_WAIT_TIMEOUT_STATUS
+from pcs.cli.common import lxml_dom
 from pcs.cli.common.console_report import error, warn
 from pcs.cli.common.errors import CmdLineInputError
 from pcs.cli.common.parse_args import prepare_options
 from pcs.cli.resource.parse_args import (
+    parse_bulk_create,
     parse_bundle_create_options,
     parse_bundle_update_options,
     parse_create as parse_create_args,
 )
 import pcs.lib.cib.acl as lib_acl
+from pcs.lib.cib import fencing_topology
 from pcs.lib.cib.resource import (
     bundle,
+    clone,
+    common as resource_common,
+    group,
     guest_node,
+    remote_node,
 )
+from pcs.lib.cib.tools import get_resources
 from pcs.lib.commands.resource import(
     _validate_guest_change,
     _get_nodes_to_validate_against,
@@ -86,6 +94,8 @@ def resource_cmd(lib, argv, modifiers):
             resource_list_options(lib, argv_next, modifiers)
         elif sub_cmd == "create":
             resource_create(lib, argv_next, modifiers)
+        elif sub_cmd == "bulk-create":
+            resource_bulk_create_cmd(lib, argv_next, modifiers)
         elif sub_cmd == "move":
             resource_move(lib, argv_next, modifiers)
         elif sub_cmd == "ban":
@@ -98,6 +108,8 @@ def resource_cmd(lib, argv, modifiers):
             resource_providers(lib, argv_next, modifiers)
         elif sub_cmd == "agents":
             resource_agents(lib, argv_next, modifiers)
+        elif sub_cmd == "metadata-cache":
+            resource_metadata_cache_cmd(lib, argv_next, modifiers)
         elif sub_cmd == "update":
             resource_update(lib, argv_next, modifiers)
         elif sub_cmd == "meta":
@@ -174,6 +186,8 @@ def resource_cmd(lib, argv, modifiers):
                 set_resource_utilization(argv_next.pop(0), argv_next)
         elif sub_cmd == "get_resource_agent_info":
             get_resource_agent_info(lib, argv_next, modifiers)
+        elif sub_cmd == "get_all_agents_info":
+            get_all_agents_info(lib, argv_next, modifiers)
         elif sub_cmd == "bundle":
             resource_bundle_cmd(lib, argv_next, modifiers)
         else:
@@ -278,15 +292,23 @@ def resource_list_available(lib, argv, modifiers):
     """
     Options:
       * --nodesc - don't display description
+      * --full - display options of agents as well
     """
-    modifiers.ensure_only_supported("--nodesc")
+    modifiers.ensure_only_supported("--nodesc", "--full")
     if len(argv) > 1:
         raise CmdLineInputError()
+    if modifiers.get("--nodesc") and modifiers.get("--full"):
+        utils.err("you cannot specify both --nodesc and --full")
 
     search = argv[0] if argv else None
-    agent_list = lib.resource_agent.list_agents(
-        not modifiers.get("--nodesc"), search
-    )
+    if modifiers.get("--full"):
+        agent_list = lib.resource_agent.get_all_agents_with_metadata(
+            search, include_stonith=False
+        )["resource_agents"]
+    else:
+        agent_list = lib.resource_agent.list_agents(
+            not modifiers.get("--nodesc"), search
+        )
 
     if not agent_list:
         if search:
@@ -296,6 +318,13 @@ def resource_list_available(lib, argv, modifiers):
             "Do you have resource agents installed?"
         )
 
+    if modifiers.get("--full"):
+        print("\n\n".join(
+            _format_agent_description(agent_info, show_all=True)
+            for agent_info in agent_list
+        ))
+        return
+
     for agent_info in agent_list:
         name = agent_info["name"]
         shortdesc = agent_info["shortdesc"]
@@ -439,6 +468,44 @@ def _format_desc(indent, desc):
 
     return output.rstrip()
 
+def resource_bulk_create_cmd(lib, argv, modifiers):
+    """
+    Options:
+      * --force - allow not existing agents, invalid operations, invalid
+        instance attributes, invalid bundle options, allow not suitable command
+      * --disabled - created resources will be disabled
+      * --no-default-ops - do not add default operations
+      * --wait
+      * -f - CIB file
+    """
+    modifiers.ensure_only_supported(
+        "--force", "--disabled", "--no-default-ops", "--wait", "-f",
+    )
+    if len(argv) != 1:
+        raise CmdLineInputError()
+    file_path = argv[0]
+    try:
+        with open(file_path) as bulk_file:
+            document = bulk_file.read()
+    except EnvironmentError as e:
+        utils.err("Unable to read file '{0}': {1}".format(
+            file_path, e.strerror
+        ))
+    lib.resource.bulk_create(
+        parse_bulk_create(
+            document, use_yaml=file_path.endswith((".yaml", ".yml"))
+        ),
+        allow_absent_agent=modifiers.get("--force"),
+        allow_invalid_operation=modifiers.get("--force"),
+        allow_invalid_instance_attributes=modifiers.get("--force"),
+        use_default_operations=not modifiers.get("--no-default-ops"),
+        ensure_disabled=modifiers.get("--disabled"),
+        wait=modifiers.get("--wait"),
+        allow_not_suitable_command=modifiers.get("--force"),
+        allow_not_accessible_resource=modifiers.get("--force"),
+        force_options=modifiers.get("--force"),
+    )
+
 def resource_create(lib, argv, modifiers):
     """
     Options:
@@ -853,6 +920,24 @@ def resource_agents(lib, argv, modifiers):
             " for {0}".format(argv[0]) if argv else ""
         ))
 
+def resource_metadata_cache_cmd(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if len(argv) != 1 or argv[0] not in ("clear", "refresh"):
+        raise CmdLineInputError()
+    if not settings.agent_metadata_cache_dir:
+        utils.err("Agent metadata cache is disabled")
+
+    if argv[0] == "clear":
+        lib.resource_agent.clear_metadata_cache()
+        return
+    agent_names = lib.resource_agent.refresh_metadata_cache()
+    print("Metadata of {0} agent{1} cached".format(
+        len(agent_names), "" if len(agent_names) == 1 else "s"
+    ))
+
 # Update a resource, removing any args that are empty and adding/updating
 # args that are not empty
 def resource_update(dummy_lib, args, modifiers, deal_with_guest_change=True):
@@ -1638,240 +1723,46 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
       * --wait - is supported by resource_disable but waiting for resource to
         stop is handled also in this function
     """
-    def is_bundle_running(bundle_id):
-        roles_with_nodes = _get_primitive_roles_with_nodes(
-            _get_primitives_for_state_check(
-                get_cluster_state_dom(
-                    lib_pacemaker.get_cluster_status_xml(utils.cmd_runner())
-                ),
-                bundle_id,
-                expected_running=True
-            )
-        )
-        return True if roles_with_nodes else False
+    # All the changes are done in one loaded CIB which is pushed at once. Only
+    # stopping the resource, if needed, is done before that.
+    lib_env, cib = utils.get_lib_env_with_cib()
+    resource_el = _find_resource_to_remove(cib, resource_id)
+    resource_id = resource_el.get("id")
 
-    dom = utils.get_cib_dom()
-    # if resource is a clone or a master, work with its child instead
-    cloned_resource = utils.dom_get_clone_ms_resource(dom, resource_id)
-    if cloned_resource:
-        resource_id = cloned_resource.getAttribute("id")
-
-    bundle = utils.dom_get_bundle(dom, resource_id)
-    if bundle is not None:
-        primitive_el = utils.dom_get_resource_bundle(bundle)
+    if bundle.is_bundle(resource_el):
+        primitive_el = bundle.get_inner_resource(resource_el)
         if primitive_el is None:
             print("Deleting bundle '{0}'".format(resource_id))
         else:
             print(
                 "Deleting bundle '{0}' and its inner resource '{1}'".format(
                     resource_id,
-                    primitive_el.getAttribute("id")
+                    primitive_el.get("id")
                 )
             )
-
-        if (
-            "--force" not in utils.pcs_options
-            and
-            not utils.usefile
-            and
-            is_bundle_running(resource_id)
-        ):
-            sys.stdout.write("Stopping bundle '{0}'... ".format(resource_id))
-            sys.stdout.flush()
-            lib = utils.get_library_wrapper()
-            lib.resource.disable([resource_id], False)
-            output, retval = utils.run(["crm_resource", "--wait"])
-            # pacemaker which supports bundles supports --wait as well
-            if is_bundle_running(resource_id):
-                msg = [
-                    "Unable to stop: %s before deleting "
-                    "(re-run with --force to force deletion)"
-                    % resource_id
-                ]
-                if retval != 0 and output:
-                    msg.append("\n" + output)
-                utils.err("\n".join(msg).strip())
-            print("Stopped")
-
-        if primitive_el is not None:
-            resource_remove(primitive_el.getAttribute("id"))
-        utils.replace_cib_configuration(
-            remove_resource_references(utils.get_cib_dom(), resource_id, output)
+    elif group.is_group(resource_el):
+        print(
+            "Removing group: " + resource_id
+            +
+            " (and all resources within group)"
         )
-        args = [
-            "cibadmin", "-o", "resources", "-D", "--xpath",
-            "//bundle[@id='{0}']".format(resource_id)
-        ]
-        dummy_cmdoutput, retVal = utils.run(args)
-        if retVal != 0:
-            utils.err("Unable to remove resource '{0}'".format(resource_id))
-        return True
-
-    if utils.does_exist('//group[@id="'+resource_id+'"]'):
-        print("Removing group: " + resource_id + " (and all resources within group)")
-        group = utils.get_cib_xpath('//group[@id="'+resource_id+'"]')
-        group_dom = parseString(group)
         print("Stopping all resources in group: %s..." % resource_id)
-        resource_disable([resource_id])
-        if "--force" not in utils.pcs_options and not utils.usefile:
-            output, retval = utils.run(["crm_resource", "--wait"])
-            if retval != 0 and "unrecognized option '--wait'" in output:
-                output = ""
-                retval = 0
-                for res in reversed(
-                    group_dom.documentElement.getElementsByTagName("primitive")
-                ):
-                    res_id = res.getAttribute("id")
-                    res_stopped = False
-                    for _ in range(15):
-                        time.sleep(1)
-                        if not utils.resource_running_on(res_id)["is_running"]:
-                            res_stopped = True
-                            break
-                    if not res_stopped:
-                        break
-            stopped = True
-            state = utils.getClusterState()
-            for res in group_dom.documentElement.getElementsByTagName("primitive"):
-                res_id = res.getAttribute("id")
-                if utils.resource_running_on(res_id, state)["is_running"]:
-                    stopped = False
-                    break
-            if not stopped:
-                msg = [
-                    "Unable to stop group: %s before deleting "
-                    "(re-run with --force to force deletion)"
-                    % resource_id
-                ]
-                if retval != 0 and output:
-                    msg.append("\n" + output)
-                utils.err("\n".join(msg).strip())
-        for res in group_dom.documentElement.getElementsByTagName("primitive"):
-            resource_remove(res.getAttribute("id"))
-        sys.exit(0)
-
-    # now we know resource is not a group, a clone, a master nor a bundle
-    # because of the conditions above
-    if not utils.does_exist('//resources/descendant::primitive[@id="'+resource_id+'"]'):
-        utils.err("Resource '{0}' does not exist.".format(resource_id))
-
-    group_xpath = '//group/primitive[@id="'+resource_id+'"]/..'
-    group = utils.get_cib_xpath(group_xpath)
-    num_resources_in_group = 0
-
-    if (group != ""):
-        num_resources_in_group = len(parseString(group).documentElement.getElementsByTagName("primitive"))
 
     if (
         "--force" not in utils.pcs_options
         and
         not utils.usefile
         and
-        utils.resource_running_on(resource_id)["is_running"]
+        _stop_resource_before_removal(resource_el)
     ):
-        sys.stdout.write("Attempting to stop: "+ resource_id + "... ")
-        sys.stdout.flush()
-        lib = utils.get_library_wrapper()
-        # we are not using wait from disable command, because if wait is not
-        # supported in pacemaker, we don't want error message but we try to
-        # simulate wait by waiting for resource to stop
-        lib.resource.disable([resource_id], False)
-        output, retval = utils.run(["crm_resource", "--wait"])
-        if retval != 0 and "unrecognized option '--wait'" in output:
-            output = ""
-            retval = 0
-            for _ in range(15):
-                time.sleep(1)
-                if not utils.resource_running_on(resource_id)["is_running"]:
-                    break
-        if utils.resource_running_on(resource_id)["is_running"]:
-            msg = [
-                "Unable to stop: %s before deleting "
-                "(re-run with --force to force deletion)"
-                % resource_id
-            ]
-            if retval != 0 and output:
-                msg.append("\n" + output)
-            utils.err("\n".join(msg).strip())
-        print("Stopped")
-
-    utils.replace_cib_configuration(
-        remove_resource_references(utils.get_cib_dom(), resource_id, output)
-    )
-    dom = utils.get_cib_dom()
-    resource_el = utils.dom_get_resource(dom, resource_id)
-    remote_node_name = None
-    if resource_el:
-        remote_node_name = utils.dom_get_resource_remote_node_name(resource_el)
-        if remote_node_name:
-            dom = constraint.remove_constraints_containing_node(
-                dom, remote_node_name, output
-            )
-            utils.replace_cib_configuration(dom)
-            dom = utils.get_cib_dom()
-
-    if (group == "" or num_resources_in_group > 1):
-        master_xpath = '//master/primitive[@id="'+resource_id+'"]/..'
-        clone_xpath = '//clone/primitive[@id="'+resource_id+'"]/..'
-        if utils.get_cib_xpath(clone_xpath) != "":
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", clone_xpath]
-        elif utils.get_cib_xpath(master_xpath) != "":
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", master_xpath]
-        else:
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", "//primitive[@id='"+resource_id+"']"]
-        if output == True:
-            print("Deleting Resource - " + resource_id)
-        output,retVal = utils.run(args)
-        if retVal != 0:
-            utils.err("unable to remove resource: %s, it may still be referenced in constraints." % resource_id)
-    else:
-        top_master_xpath = '//master/group/primitive[@id="'+resource_id+'"]/../..'
-        top_clone_xpath = '//clone/group/primitive[@id="'+resource_id+'"]/../..'
-        top_master = utils.get_cib_xpath(top_master_xpath)
-        top_clone = utils.get_cib_xpath(top_clone_xpath)
-        if top_master != "":
-            to_remove_xpath = top_master_xpath
-            msg = "and group and M/S"
-            to_remove_dom = parseString(top_master).getElementsByTagName("master")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
-            utils.replace_cib_configuration(
-                remove_resource_references(
-                    utils.get_cib_dom(),
-                    to_remove_dom[0].getElementsByTagName("group")[0].getAttribute("id")
-                )
-            )
-        elif top_clone != "":
-            to_remove_xpath = top_clone_xpath
-            msg = "and group and clone"
-            to_remove_dom = parseString(top_clone).getElementsByTagName("clone")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
-            utils.replace_cib_configuration(
-                remove_resource_references(
-                    utils.get_cib_dom(),
-                    to_remove_dom[0].getElementsByTagName("group")[0].getAttribute("id")
-                )
-            )
-        else:
-            to_remove_xpath = group_xpath
-            msg = "and group"
-            to_remove_dom = parseString(group).getElementsByTagName("group")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
+        # the resource has been disabled in the CIB, work with the new one
+        lib_env, cib = utils.get_lib_env_with_cib()
+        resource_el = _find_resource_to_remove(cib, resource_id)
 
-        utils.replace_cib_configuration(
-            remove_resource_references(
-                utils.get_cib_dom(), to_remove_id, output
-            )
-        )
+    remote_node_name_list = cib_remove_resource(cib, resource_el, output)
+    utils.push_lib_env_cib(lib_env)
 
-        args = ["cibadmin", "-o", "resources", "-D", "--xpath", to_remove_xpath]
-        if output == True:
-            print("Deleting Resource ("+msg+") - " + resource_id)
-        dummy_cmdoutput,retVal = utils.run(args)
-        if retVal != 0:
-            if output == True:
-                utils.err("Unable to remove resource '%s' (do constraints exist?)" % (resource_id))
-            return False
-    if remote_node_name and not utils.usefile:
+    if remote_node_name_list and not utils.usefile:
         if not is_remove_remote_context:
             warn(
                 "This command is not sufficient for removing remote and guest "
@@ -1879,11 +1770,193 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
                 "stop and disable pacemaker_remote on the node(s) manually."
             )
         output, retval = utils.run(["crm_resource", "--wait"])
-        output, retval = utils.run([
-            "crm_node", "--force", "--remove", remote_node_name
-        ])
+        for remote_node_name in remote_node_name_list:
+            output, retval = utils.run([
+                "crm_node", "--force", "--remove", remote_node_name
+            ])
+    return True
+
+def _find_resource_to_remove(cib, resource_id):
+    """
+    Commandline options: no options
+    """
+    for resource_el in get_resources(cib).iter(
+        "primitive", "group", "clone", "master", "bundle"
+    ):
+        if resource_el.get("id") == resource_id:
+            # if resource is a clone or a master, work with its child instead
+            if clone.is_any_clone(resource_el):
+                return clone.get_inner_resource(resource_el)
+            return resource_el
+    utils.err("Resource '{0}' does not exist.".format(resource_id))
+
+def _is_bundle_running(bundle_id):
+    """
+    Commandline options: no options
+    """
+    roles_with_nodes = _get_primitive_roles_with_nodes(
+        _get_primitives_for_state_check(
+            get_cluster_state_dom(
+                lib_pacemaker.get_cluster_status_xml(utils.cmd_runner())
+            ),
+            bundle_id,
+            expected_running=True
+        )
+    )
+    return True if roles_with_nodes else False
+
+def _stop_resource_before_removal(resource_el):
+    """
+    Stop a resource and wait for it, return False if it was not running
+
+    Commandline options: no options
+    """
+    resource_id = resource_el.get("id")
+    primitive_id_list = [
+        primitive_el.get("id")
+        for primitive_el in resource_common.find_primitives(resource_el)
+    ]
+
+    def is_running():
+        if bundle.is_bundle(resource_el):
+            return _is_bundle_running(resource_id)
+        state = utils.getClusterState()
+        return any(
+            utils.resource_running_on(primitive_id, state)["is_running"]
+            for primitive_id in primitive_id_list
+        )
+
+    if not is_running():
+        return False
+
+    if bundle.is_bundle(resource_el):
+        sys.stdout.write("Stopping bundle '{0}'... ".format(resource_id))
+        sys.stdout.flush()
+    elif not group.is_group(resource_el):
+        sys.stdout.write("Attempting to stop: "+ resource_id + "... ")
+        sys.stdout.flush()
+    lib = utils.get_library_wrapper()
+    # we are not using wait from disable command, because if wait is not
+    # supported in pacemaker, we don't want error message but we try to
+    # simulate wait by waiting for resource to stop
+    lib.resource.disable([resource_id], False)
+    output, retval = utils.run(["crm_resource", "--wait"])
+    if retval != 0 and "unrecognized option '--wait'" in output:
+        output = ""
+        retval = 0
+        for _ in range(15 * len(primitive_id_list)):
+            time.sleep(1)
+            if not is_running():
+                break
+    if is_running():
+        msg = [
+            "Unable to stop{0}: {1} before deleting "
+            "(re-run with --force to force deletion)".format(
+                " group" if group.is_group(resource_el) else "",
+                resource_id
+            )
+        ]
+        if retval != 0 and output:
+            msg.append("\n" + output)
+        utils.err("\n".join(msg).strip())
+    if not group.is_group(resource_el):
+        print("Stopped")
     return True
 
+def cib_remove_resource(cib, resource_el, output=True):
+    """
+    Remove a resource and everything referencing it from a CIB, return names
+    of remote and guest nodes defined by the removed resources
+
+    Commandline options: no options
+
+    etree cib -- the whole CIB to remove the resource from
+    etree resource_el -- a primitive, a group or a bundle to remove
+    bool output -- print what is being removed
+    """
+    if bundle.is_bundle(resource_el):
+        primitive_el = bundle.get_inner_resource(resource_el)
+        remote_node_name_list = []
+        if primitive_el is not None:
+            remote_node_name_list = _cib_remove_primitive(
+                cib, primitive_el, output
+            )
+        cib_remove_resource_references(cib, resource_el.get("id"), output)
+        resource_el.getparent().remove(resource_el)
+        return remote_node_name_list
+
+    if group.is_group(resource_el):
+        remote_node_name_list = []
+        for primitive_el in group.get_inner_resources(resource_el):
+            remote_node_name_list.extend(
+                _cib_remove_primitive(cib, primitive_el, output)
+            )
+        return remote_node_name_list
+
+    return _cib_remove_primitive(cib, resource_el, output)
+
+def _cib_remove_primitive(cib, primitive_el, output):
+    """
+    Commandline options: no options
+    """
+    resource_id = primitive_el.get("id")
+    parent_el = primitive_el.getparent()
+    if clone.is_any_clone(parent_el):
+        cib_remove_resource_references(cib, parent_el.get("id"), output)
+    cib_remove_resource_references(cib, resource_id, output)
+
+    remote_node_name = (
+        remote_node.get_node_name_from_resource(primitive_el)
+        or
+        guest_node.get_node_name_from_resource(primitive_el)
+    )
+    if remote_node_name:
+        constraint.cib_remove_constraints_containing_node(
+            cib, remote_node_name, output
+        )
+
+    to_remove_el = primitive_el
+    message = "Deleting Resource - " + resource_id
+    if clone.is_any_clone(parent_el):
+        to_remove_el = parent_el
+    elif (
+        group.is_group(parent_el)
+        and
+        len(group.get_inner_resources(parent_el)) == 1
+    ):
+        # the last resource in a group, remove the group and its clone as well
+        cib_remove_resource_references(cib, parent_el.get("id"), output)
+        to_remove_el = parent_el
+        msg = "and group"
+        top_el = parent_el.getparent()
+        if clone.is_any_clone(top_el):
+            cib_remove_resource_references(cib, top_el.get("id"), output)
+            to_remove_el = top_el
+            msg = (
+                "and group and M/S" if clone.is_master(top_el)
+                else "and group and clone"
+            )
+        message = "Deleting Resource (" + msg + ") - " + resource_id
+    if output == True:
+        print(message)
+    to_remove_el.getparent().remove(to_remove_el)
+    return [remote_node_name] if remote_node_name else []
+
+def cib_remove_resource_references(cib, resource_id, output=False):
+    """
+    Remove constraints, fencing levels and acl permissions referencing
+    a resource from a CIB
+
+    Commandline options: no options
+    """
+    constraint.cib_remove_constraints_containing(cib, resource_id, output)
+    topology_el = cib.find("configuration/fencing-topology")
+    if topology_el is not None:
+        fencing_topology.remove_device_from_all_levels(topology_el, resource_id)
+        if topology_el.find("fencing-level") is None:
+            topology_el.getparent().remove(topology_el)
+    lib_acl.remove_permissions_referencing(cib, resource_id)
+
 # moved to pcs.lib.cib.fencing_topology.remove_device_from_all_levels
 def stonith_level_rm_device(cib_dom, stn_id):
     """
@@ -2095,7 +2168,7 @@ def resource_group_list(lib, argv, modifiers):
     if (group_xml == ""):
         return
 
-    element = parseString(group_xml).documentElement
+    element = lxml_dom.parse_string(group_xml).documentElement
     # If there is more than one group returned it's wrapped in an xpath-query
     # element
     if element.tagName == "xpath-query":
@@ -3148,6 +3221,16 @@ def print_resources_utilization():
         print(" {0}: {1}".format(resource, utilization[resource]))
 
 
+# This is used only by pcsd, will be removed in new architecture
+def get_all_agents_info(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if argv:
+        utils.err("No parameters expected")
+    print(json.dumps(lib.resource_agent.get_all_agents_with_metadata()))
+
 # This is used only by pcsd, will be removed in new architecture
 def get_resource_agent_info(dummy_lib, argv, modifiers):
     """
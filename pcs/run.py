@@ -5,20 +5,111 @@ created by setuptools (see setup.py).
 This module deals with some bundled python dependencies that are installed in
 a pcs-specific location rather than in a standard system location for the python
 packages.
+
+Entry points import what they need when they are called. Shell completion runs
+pcs on every TAB press and must not pay for importing the daemon or the rest of
+pcs.
 """
+import os
+import subprocess
 import sys
 
 from pcs import settings
+from pcs.cli.common import completion
 
 if settings.pcs_bundled_pacakges_dir not in sys.path:
     sys.path.insert(0, settings.pcs_bundled_pacakges_dir)
 
-# pylint: disable=unused-import
-from pcs.daemon.run import main as daemon
-try:
+USAGE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "usage.py")
+
+def pcs():
+    if completion.has_applicable_environment(os.environ):
+        print_completion_suggestions(os.environ)
+        sys.exit()
+    from pcs import app
+    app.main(sys.argv[1:])
+
+def daemon():
+    from pcs.daemon.run import main
+    main()
+
+def pcs_snmp_agent():
     # It is possible the package `pcs.snmp` is not installed. `pcsd` does not
     # require on pcs.snmp. `pcs.snmp` should be installed when `pcs_snmp_agent`
     # is called.
-    from pcs.snmp.pcs_snmp_agent import main as pcs_snmp_agent
-except ImportError:
-    pass
+    from pcs.snmp.pcs_snmp_agent import main
+    main()
+
+def print_completion_suggestions(environment):
+    """
+    dict environment -- very likely os.environ
+    """
+    print(completion.make_suggestions(
+        environment,
+        completion.get_suggestion_tree(
+            get_completion_cache_path(),
+            _generate_completion_tree,
+        ),
+        _get_dynamic_completion_words,
+    ))
+
+def get_completion_cache_path():
+    """
+    Return a path to a completion tree cache file or None if disabled
+
+    The tree is generated from the usage. Each version of pcs has its own cache
+    file. The time the usage has been changed is a part of the key as well so
+    the tree is regenerated when running pcs from a source tree.
+    """
+    if not settings.completion_cache_dir:
+        return None
+    try:
+        usage_mtime = int(os.stat(USAGE_FILE).st_mtime)
+    except EnvironmentError:
+        usage_mtime = 0
+    return os.path.join(
+        settings.completion_cache_dir,
+        "completion-{0}-{1}.json".format(settings.pcs_version, usage_mtime)
+    )
+
+def _generate_completion_tree():
+    from pcs import usage
+    return usage.generate_completion_tree_from_usage()
+
+def _get_dynamic_completion_words(key):
+    if key in (completion.RESOURCE_AGENT, completion.STONITH_AGENT):
+        return _get_completion_words_from_agent_cache(key)
+    return _get_completion_words_from_cib(key)
+
+def _get_completion_words_from_agent_cache(key):
+    # Agents are not listed by pacemaker, it would take too long.
+    if not settings.agent_metadata_cache_dir:
+        return []
+    from pcs.lib.agent_metadata_cache import AgentMetadataCache
+    return completion.get_dynamic_words_from_agent_names(
+        AgentMetadataCache(settings.agent_metadata_cache_dir).get_agent_names()
+    ).get(key, [])
+
+def _get_completion_words_from_cib(key):
+    cib_xml = _get_live_cib_xml()
+    if not cib_xml:
+        return []
+    return completion.get_dynamic_words_from_cib(cib_xml).get(key, [])
+
+def _get_live_cib_xml():
+    # Pacemaker answers a local query quickly. If it does not, e.g. the cluster
+    # is not running or the user is not allowed to read the CIB, nothing is
+    # completed rather than making the shell wait.
+    try:
+        completed = subprocess.run(
+            [settings.cibadmin, "--local", "--query"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=settings.completion_cib_query_timeout,
+        )
+    except (EnvironmentError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.decode("utf-8", "replace")
@@ -25,6 +25,8 @@ pacemaker_authkey_file = "/etc/pacemaker/authkey"
 booth_authkey_file_mode = 0o600
 cluster_conf_file = "/etc/cluster/cluster.conf"
 fence_agent_binaries = "/usr/sbin/"
+ocf_root = "/usr/lib/ocf"
+lsb_agent_binaries = "/etc/init.d/"
 pacemaker_schedulerd = "/usr/libexec/pacemaker/pacemaker-schedulerd"
 pacemaker_controld = "/usr/libexec/pacemaker/pacemaker-controld"
 pacemaker_based = "/usr/libexec/pacemaker/pacemaker-based"
@@ -39,6 +41,7 @@ pcsd_cert_location = "/var/lib/pcsd/pcsd.crt"
 pcsd_key_location = "/var/lib/pcsd/pcsd.key"
 pcsd_users_conf_location = "/var/lib/pcsd/pcs_users.conf"
 pcsd_settings_conf_location = "/var/lib/pcsd/pcs_settings.conf"
+pcsd_known_hosts_location = "/var/lib/pcsd/known-hosts"
 pcsd_exec_location = "/usr/lib/pcsd/"
 pcsd_log_location = "/var/log/pcsd/pcsd.log"
 pcsd_default_port = 2224
@@ -56,6 +59,27 @@ pacemaker_wait_timeout_status = 124
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# max number of requests to other nodes running at once
+default_request_parallelism = 64
+# delay in seconds before probing the next address of a node with more
+# addresses when looking for a reachable one, e.g. 0.3; None disables address
+# racing, requests then try the addresses one by one
+address_racing_stagger = None
+# how to create CIB diffs: "native" - in pcs falling back to crm_diff if the
+# CIB cannot be diffed natively, "crm_diff" - always run crm_diff,
+# "cross-check" - run both, push the crm_diff result and log differences
+cib_diff_mode = "native"
+# directory to cache the shell completion tree in, None disables the cache
+completion_cache_dir = os.path.expanduser("~/.cache/pcs")
+# max time in seconds to wait for the CIB when completing resource ids and node
+# names
+completion_cib_query_timeout = 0.5
+# directory to cache resource and stonith agents' metadata in, None disables
+# the cache
+agent_metadata_cache_dir = "/var/lib/pcsd/agent_metadata"
+# max number of processes listing agents or getting their metadata running at
+# once
+agent_metadata_parallelism = 8
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
 
@@ -81,3 +105,20 @@ pcsd_gem_path = "vendor/bundle/ruby"
 ruby_executable = "/usr/bin/ruby"
 
 gui_session_lifetime_seconds=60 * 60
+# Number of long-lived ruby processes serving pcsd requests, 0 means a new ruby
+# process for each request.
+pcsd_ruby_workers = 4
+# A ruby worker is restarted after serving this number of requests.
+pcsd_ruby_worker_max_requests = 500
+# Number of requests allowed to wait for a free ruby worker.
+pcsd_ruby_worker_max_queued = 100
+# A ruby worker not answering a request in this number of seconds is killed
+# and replaced by a new one, None means no limit.
+pcsd_ruby_worker_request_timeout = 3600
+# Number of seconds a local pacemaker node status is reused by pcsd.
+pcsd_node_status_cache_ttl = 2
+# Maximal number of processes authenticating users in pcsd.
+pcsd_auth_workers = 4
+# Number of seconds pcsd reuses groups of a logged in user, 0 means the groups
+# are checked on every request.
+pcsd_auth_groups_cache_ttl = 0
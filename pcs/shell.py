@@ -0,0 +1,154 @@
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
+import io
+import json
+import shlex
+import sys
+import traceback
+
+from pcs import app, settings, usage, utils
+from pcs.cli.common.errors import CmdLineInputError
+
+
+PROMPT = "pcs> "
+EXIT_COMMANDS = ("exit", "quit")
+
+def shell_cmd(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    try:
+        if argv and argv[0] == "help":
+            usage.shell(argv[1:])
+            return
+        modifiers.ensure_only_supported()
+        if argv:
+            raise CmdLineInputError()
+    except CmdLineInputError as e:
+        utils.exit_on_cmdline_input_errror(e, "shell", "")
+    sys.exit(run_shell(
+        app.main,
+        sys.stdin,
+        sys.stdout,
+        interactive=sys.stdin.isatty(),
+    ))
+
+def run_shell(run_command, input_stream, output_stream, interactive):
+    """
+    Run pcs commands read line by line, return 0 if all of them succeeded
+
+    callable run_command -- runs one command specified by a list of arguments,
+        exits (raises SystemExit) on failure
+    input_stream -- commands are read from it
+    output_stream -- results of commands are written to it
+    bool interactive -- if True, prompt for commands and let them write their
+        output directly, otherwise write a JSON object with a command, its
+        return code and outputs on one line for each command
+    """
+    exit_code = 0
+    while True:
+        line = _read_line(input_stream, output_stream, interactive)
+        if line is None:
+            break
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            argv = [line]
+            result = _error_result(
+                argv, "Unable to parse command: {0}".format(e)
+            )
+        else:
+            if not argv:
+                continue
+            if argv[0] in EXIT_COMMANDS:
+                break
+            if argv[0] == "shell":
+                result = _error_result(argv, "Cannot start a shell in a shell")
+            else:
+                result = run_shell_command(
+                    run_command, argv, capture=not interactive
+                )
+        if result["returncode"] != 0:
+            exit_code = 1
+        _write_result(output_stream, result, interactive)
+    return exit_code
+
+def run_shell_command(run_command, argv, capture):
+    """
+    Run one command, return a dict with its return code and outputs
+
+    callable run_command -- runs one command specified by a list of arguments
+    list argv -- the command and its arguments
+    bool capture -- if True, capture stdout and stderr of the command and
+        give it an empty stdin
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    # commands overwrite the path when --corosync_conf is specified
+    corosync_conf_file = settings.corosync_conf_file
+    returncode = 0
+    with ExitStack() as stack:
+        if capture:
+            stack.enter_context(redirect_stdout(stdout))
+            stack.enter_context(redirect_stderr(stderr))
+            # Without a terminal, stdin is the stream of the shell's commands.
+            # Commands asking for input (e.g. a password) must not read the
+            # next commands as their input.
+            stack.callback(setattr, sys, "stdin", sys.stdin)
+            sys.stdin = io.StringIO()
+        try:
+            run_command(list(argv))
+        except SystemExit as e:
+            returncode = _get_exit_code(e.code)
+        except Exception:
+            # do not let a bug in one command end the whole session
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            settings.corosync_conf_file = corosync_conf_file
+    return {
+        "command": argv,
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+def _get_exit_code(code):
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit(message) prints the message to stderr
+    print(code, file=sys.stderr)
+    return 1
+
+def _error_result(argv, message):
+    return {
+        "command": argv,
+        "returncode": 1,
+        "stdout": "",
+        "stderr": "Error: {0}\n".format(message),
+    }
+
+def _read_line(input_stream, output_stream, interactive):
+    if interactive:
+        output_stream.write(PROMPT)
+        output_stream.flush()
+    try:
+        line = input_stream.readline()
+    except KeyboardInterrupt:
+        output_stream.write("\n")
+        return ""
+    if not line:
+        if interactive:
+            output_stream.write("\n")
+        return None
+    return line
+
+def _write_result(output_stream, result, interactive):
+    if interactive:
+        # the command has already written its outputs
+        if result["stderr"]:
+            sys.stderr.write(result["stderr"])
+        return
+    output_stream.write(json.dumps(result) + "\n")
+    output_stream.flush()
@@ -145,42 +145,26 @@ def status_stonith_check(modifiers):
     stonith_devices_id_method_cycle = []
     sbd_running = False
 
-    cib = utils.get_cib_dom()
-    for conf in cib.getElementsByTagName("configuration"):
-        for crm_config in conf.getElementsByTagName("crm_config"):
-            for nvpair in crm_config.getElementsByTagName("nvpair"):
-                if (
-                    nvpair.getAttribute("name") == "stonith-enabled"
-                    and
-                    is_false(nvpair.getAttribute("value"))
-                ):
-                    stonith_enabled = False
-                    break
-            if not stonith_enabled:
-                break
-        for resource in conf.getElementsByTagName("primitive"):
-            if resource.getAttribute("class") == "stonith":
-                stonith_devices.append(resource)
-                for attribs in resource.getElementsByTagName(
-                    "instance_attributes"
-                ):
-                    for nvpair in attribs.getElementsByTagName("nvpair"):
-                        if (
-                            nvpair.getAttribute("name") == "action"
-                            and
-                            nvpair.getAttribute("value")
-                        ):
-                            stonith_devices_id_action.append(
-                                resource.getAttribute("id")
-                            )
-                        if (
-                            nvpair.getAttribute("name") == "method"
-                            and
-                            nvpair.getAttribute("value") == "cycle"
-                        ):
-                            stonith_devices_id_method_cycle.append(
-                                resource.getAttribute("id")
-                            )
+    cib = utils.get_cib_etree()
+    for nvpair in cib.xpath(
+        "./configuration/crm_config//nvpair[@name='stonith-enabled']"
+    ):
+        if is_false(nvpair.get("value", "")):
+            stonith_enabled = False
+            break
+    for resource in cib.xpath(
+        "./configuration//primitive[@class='stonith']"
+    ):
+        stonith_devices.append(resource)
+        for nvpair in resource.xpath(".//instance_attributes//nvpair"):
+            if nvpair.get("name") == "action" and nvpair.get("value"):
+                stonith_devices_id_action.append(resource.get("id", ""))
+            if (
+                nvpair.get("name") == "method"
+                and
+                nvpair.get("value") == "cycle"
+            ):
+                stonith_devices_id_method_cycle.append(resource.get("id", ""))
 
     if not modifiers.is_specified("-f"):
         # check if SBD daemon is running
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Measure how long pcs takes to start and run commands which do not need a
+cluster, e.g. displaying help or shell completion.
+
+Every command runs in a new python process so the measured time covers the
+start of the interpreter and importing pcs modules. Run it before and after a
+change to see its impact on the start-up of pcs.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+RUN_PCS = "import sys; from pcs import app; app.main(sys.argv[1:])"
+
+COMMAND_LIST = [
+    "--version",
+    "help",
+    "resource help",
+    "cluster help",
+    "status help",
+    "constraint help",
+    "stonith help",
+]
+
+def completion_env(typed):
+    word_list = ["pcs"] + typed.split()
+    return {
+        "PCS_AUTO_COMPLETE": "1",
+        "COMP_WORDS": " ".join(word_list),
+        "COMP_LENGTHS": " ".join(str(len(word)) for word in word_list),
+        "COMP_CWORD": str(len(word_list)),
+    }
+
+COMPLETION_LIST = [
+    "",
+    "resource",
+    "constraint colocation",
+]
+
+def measure(python, code, argv=(), extra_env=None, repeat=10):
+    """
+    Return a list of durations of runs of a python code in seconds
+
+    string python -- python interpreter to run the code
+    string code -- python code to run
+    iterable argv -- arguments of the code
+    dict extra_env -- environment variables to add to the current environment
+    int repeat -- how many times to run the code
+    """
+    env = dict(os.environ, PYTHONPATH=PACKAGE_DIR)
+    env.update(extra_env or {})
+    duration_list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [python, "-c", code] + list(argv),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        duration_list.append(time.perf_counter() - start)
+    return duration_list
+
+def format_line(label, duration_list):
+    return "{0:<40} {1:>8.1f} {2:>8.1f} {3:>8.1f}".format(
+        label,
+        1000 * min(duration_list),
+        1000 * statistics.median(duration_list),
+        1000 * max(duration_list),
+    )
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--python", default=sys.executable,
+        help="python interpreter to run pcs with"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10,
+        help="how many times to run each command"
+    )
+    parser.add_argument(
+        "command", nargs="*",
+        help="pcs commands to measure, e.g. 'resource help'"
+    )
+    args = parser.parse_args(argv)
+
+    print("{0:<40} {1:>8} {2:>8} {3:>8}".format(
+        "command [ms]", "min", "median", "max"
+    ))
+    print(format_line(
+        "(python start)",
+        measure(args.python, "pass", repeat=args.repeat)
+    ))
+    print(format_line(
+        "(import pcs.app)",
+        measure(args.python, "import pcs.app", repeat=args.repeat)
+    ))
+    for command in args.command or COMMAND_LIST:
+        print(format_line(
+            command,
+            measure(
+                args.python, RUN_PCS, command.split(), repeat=args.repeat
+            )
+        ))
+    if args.command:
+        return
+    for typed in COMPLETION_LIST:
+        print(format_line(
+            "completion: pcs {0}".format(typed),
+            measure(
+                args.python,
+                RUN_PCS,
+                extra_env=completion_env(typed),
+                repeat=args.repeat,
+            )
+        ))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,201 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs import resource
+from pcs.test.tools.assertions import assert_xml_equal
+from pcs.test.tools.misc import outdent
+
+
+def fixture_cib_for_removal(resources="", constraints="", configuration=""):
+    return etree.fromstring("""
+        <cib>
+            <configuration>
+                <resources>{0}</resources>
+                <constraints>{1}</constraints>
+                {2}
+            </configuration>
+        </cib>
+    """.format(resources, constraints, configuration))
+
+class CibRemoveResource(TestCase):
+    def remove(self, cib, resource_id):
+        resource_el = cib.find(".//*[@id='{0}']".format(resource_id))
+        output = StringIO()
+        with redirect_stdout(output):
+            node_list = resource.cib_remove_resource(cib, resource_el)
+        return node_list, output.getvalue()
+
+    def test_group_with_references(self):
+        cib = fixture_cib_for_removal(
+            resources="""
+                <clone id="G-clone">
+                    <group id="G">
+                        <primitive id="A" class="ocf" provider="pacemaker"
+                            type="Dummy"
+                        />
+                        <primitive id="B" class="ocf" provider="pacemaker"
+                            type="Dummy"
+                        />
+                    </group>
+                </clone>
+                <primitive id="C" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            """,
+            constraints="""
+                <rsc_location id="L-A" rsc="A" node="n1" score="10"/>
+                <rsc_location id="L-C" rsc="C" node="n1" score="10"/>
+                <rsc_order id="O-clone" first="G-clone" then="C"/>
+                <rsc_colocation id="S">
+                    <resource_set id="S-1">
+                        <resource_ref id="A"/>
+                        <resource_ref id="B"/>
+                    </resource_set>
+                    <resource_set id="S-2">
+                        <resource_ref id="C"/>
+                    </resource_set>
+                </rsc_colocation>
+            """,
+            configuration="""
+                <fencing-topology>
+                    <fencing-level id="F1" index="1" target="n1"
+                        devices="B"
+                    />
+                </fencing-topology>
+                <acls>
+                    <acl_role id="R">
+                        <acl_permission id="P-G" kind="read" reference="G"/>
+                        <acl_permission id="P-C" kind="read" reference="C"/>
+                    </acl_role>
+                </acls>
+            """
+        )
+        node_list, output = self.remove(cib, "G")
+        self.assertEqual([], node_list)
+        self.assertEqual(
+            outdent("""\
+                Removing Constraint - L-A
+                Removing A from set S-1
+                Deleting Resource - A
+                Removing B from set S-1
+                Removing set S-1
+                Removing Constraint - O-clone
+                Deleting Resource (and group and clone) - B
+                """
+            ),
+            output
+        )
+        assert_xml_equal(
+            etree.tostring(fixture_cib_for_removal(
+                resources="""
+                    <primitive id="C" class="ocf" provider="pacemaker"
+                        type="Dummy"
+                    />
+                """,
+                constraints="""
+                    <rsc_location id="L-C" rsc="C" node="n1" score="10"/>
+                    <rsc_colocation id="S">
+                        <resource_set id="S-2">
+                            <resource_ref id="C"/>
+                        </resource_set>
+                    </rsc_colocation>
+                """,
+                configuration="""
+                    <acls>
+                        <acl_role id="R">
+                            <acl_permission id="P-C" kind="read"
+                                reference="C"
+                            />
+                        </acl_role>
+                    </acls>
+                """
+            )).decode(),
+            etree.tostring(cib).decode()
+        )
+
+    def test_cloned_primitive(self):
+        cib = fixture_cib_for_removal(
+            resources="""
+                <master id="A-master">
+                    <primitive id="A" class="ocf" provider="pacemaker"
+                        type="Stateful"
+                    />
+                </master>
+            """,
+            constraints="""
+                <rsc_location id="L-A" rsc="A" node="n1" score="10"/>
+                <rsc_location id="L-master" rsc="A-master" node="n1"
+                    score="10"
+                />
+            """,
+        )
+        node_list, output = self.remove(cib, "A")
+        self.assertEqual([], node_list)
+        self.assertEqual(
+            outdent("""\
+                Removing Constraint - L-master
+                Removing Constraint - L-A
+                Deleting Resource - A
+                """
+            ),
+            output
+        )
+        assert_xml_equal(
+            etree.tostring(fixture_cib_for_removal()).decode(),
+            etree.tostring(cib).decode()
+        )
+
+    def test_guest_node(self):
+        cib = fixture_cib_for_removal(
+            resources="""
+                <primitive id="VM" class="ocf" provider="heartbeat"
+                    type="VirtualDomain"
+                >
+                    <meta_attributes id="VM-meta">
+                        <nvpair id="VM-meta-node" name="remote-node"
+                            value="guest1"
+                        />
+                    </meta_attributes>
+                </primitive>
+                <primitive id="D" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            """,
+            constraints="""
+                <rsc_location id="L-D" rsc="D" node="guest1" score="10"/>
+            """,
+        )
+        node_list, output = self.remove(cib, "VM")
+        self.assertEqual(["guest1"], node_list)
+        self.assertEqual(
+            "Removing Constraint - L-D\nDeleting Resource - VM\n",
+            output
+        )
+
+    def test_bundle(self):
+        cib = fixture_cib_for_removal(
+            resources="""
+                <bundle id="B">
+                    <docker image="pcs:test"/>
+                    <primitive id="R" class="ocf" provider="pacemaker"
+                        type="Dummy"
+                    />
+                </bundle>
+            """,
+            constraints="""
+                <rsc_location id="L-B" rsc="B" node="n1" score="10"/>
+            """,
+        )
+        node_list, output = self.remove(cib, "B")
+        self.assertEqual([], node_list)
+        self.assertEqual(
+            "Deleting Resource - R\nRemoving Constraint - L-B\n",
+            output
+        )
+        assert_xml_equal(
+            etree.tostring(fixture_cib_for_removal()).decode(),
+            etree.tostring(cib).decode()
+        )
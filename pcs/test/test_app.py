@@ -0,0 +1,45 @@
+import json
+import os.path
+import subprocess
+import sys
+from unittest import TestCase
+
+from pcs import app
+from pcs.test.tools.misc import testdir
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(testdir))
+
+def get_modules_imported_by(code):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport json, sys\nprint(json.dumps(list(sys.modules)))",
+        ],
+        cwd=PACKAGE_DIR,
+    )
+    return set(json.loads(output.decode("utf-8").splitlines()[-1]))
+
+class LazyImports(TestCase):
+    def test_commands_not_imported_at_start(self):
+        module_set = get_modules_imported_by("import pcs.app")
+        for module_name, _ in app.COMMAND_MAP.values():
+            self.assertNotIn(module_name, module_set)
+        self.assertEqual(
+            [],
+            [
+                name for name in module_set
+                if name.startswith("pcs.lib.commands.")
+            ]
+        )
+
+    def test_completion_entry_point_is_light(self):
+        module_set = get_modules_imported_by("import pcs.run")
+        self.assertNotIn("pcs.app", module_set)
+        self.assertNotIn("pcs.usage", module_set)
+        self.assertNotIn("lxml", module_set)
+
+    def test_all_commands_exist(self):
+        for command in app.COMMAND_MAP:
+            self.assertTrue(callable(app._get_command(command)))
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+from unittest import TestCase
+
+from pcs.batch import get_required_cib_version
+from pcs.common.tools import Version
+from pcs.test.tools.assertions import AssertPcsMixin
+from pcs.test.tools.misc import (
+    get_test_resource as rc,
+    outdent,
+)
+from pcs.test.tools.pcs_runner import PcsRunner
+
+
+empty_cib = rc("cib-empty-2.5.xml")
+temp_cib = rc("temp-cib.xml")
+batch_file = rc("temp-batch.json")
+
+
+def create_alert(alert_id, path):
+    return {
+        "command": "alert.create_alert",
+        "params": {
+            "alert_id": alert_id,
+            "path": path,
+            "instance_attribute_dict": {},
+            "meta_attribute_dict": {},
+        },
+    }
+
+class Batch(TestCase, AssertPcsMixin):
+    def setUp(self):
+        shutil.copy(empty_cib, temp_cib)
+        self.pcs_runner = PcsRunner(temp_cib)
+
+    def tearDown(self):
+        if os.path.exists(batch_file):
+            os.unlink(batch_file)
+
+    @staticmethod
+    def write_batch(batch):
+        with open(batch_file, "w") as a_file:
+            json.dump(batch, a_file)
+
+    def assert_no_alerts(self):
+        self.assert_pcs_success(
+            "alert config",
+            outdent("""\
+                Alerts:
+                 No alerts defined
+                """
+            )
+        )
+
+    def test_success(self):
+        self.write_batch([
+            create_alert("alert1", "path1"),
+            create_alert("alert2", "path2"),
+        ])
+        self.assert_pcs_success("batch {0}".format(batch_file), "")
+        self.assert_pcs_success(
+            "alert config",
+            outdent("""\
+                Alerts:
+                 Alert: alert1 (path=path1)
+                 Alert: alert2 (path=path2)
+                """
+            )
+        )
+
+    def test_nothing_changed_on_error(self):
+        self.write_batch([
+            create_alert("alert1", "path1"),
+            create_alert("alert1", "path2"),
+        ])
+        self.assert_pcs_fail(
+            "batch {0}".format(batch_file),
+            "Error: 'alert1' already exists\n"
+        )
+        self.assert_no_alerts()
+
+    def test_unsupported_command(self):
+        self.write_batch([
+            create_alert("alert1", "path1"),
+            {"command": "cluster.setup", "params": {}},
+        ])
+        self.assert_pcs_fail(
+            "batch {0}".format(batch_file),
+            "Error: Command 'cluster.setup' cannot be run in a batch\n"
+        )
+        self.assert_no_alerts()
+
+    def test_bad_params(self):
+        self.write_batch([
+            {"command": "alert.create_alert", "params": {"path": "path1"}},
+        ])
+        self.assert_pcs_fail(
+            "batch {0}".format(batch_file),
+            "Error: Invalid parameters of command 'alert.create_alert': "
+                "missing a required argument: 'alert_id'\n"
+        )
+
+    def test_wait_in_command(self):
+        self.write_batch([
+            {"command": "resource.create", "params": {"wait": "10"}},
+        ])
+        self.assert_pcs_fail(
+            "batch {0}".format(batch_file),
+            "Error: Commands in a batch cannot wait, use --wait for the whole "
+                "batch\n"
+        )
+
+    def test_not_a_list(self):
+        self.write_batch(create_alert("alert1", "path1"))
+        self.assert_pcs_fail(
+            "batch {0}".format(batch_file),
+            "Error: The batch must be a list of commands\n"
+        )
+
+
+class GetRequiredCibVersion(TestCase):
+    def test_no_version_needed(self):
+        self.assertIsNone(get_required_cib_version([
+            ("resource.create", {}),
+            ("constraint_ticket.add", {}),
+        ]))
+
+    def test_highest_version(self):
+        self.assertEqual(
+            Version(2, 8, 0),
+            get_required_cib_version([
+                ("acl.create_role", {}),
+                ("resource.create_into_bundle", {}),
+                ("alert.create_alert", {}),
+            ])
+        )
+
+    def test_version_by_params(self):
+        self.assertEqual(
+            Version(3, 0, 0),
+            get_required_cib_version([
+                ("fencing_topology.add_level", {"target_type": "regexp"}),
+                (
+                    "resource.bundle_update",
+                    {"container_options": {"promoted-max": "1"}}
+                ),
+            ])
+        )
+
+    def test_optional_params_missing(self):
+        self.assertEqual(
+            Version(2, 8, 0),
+            get_required_cib_version([
+                ("fencing_topology.add_level", {}),
+                ("resource.bundle_update", {}),
+            ])
+        )
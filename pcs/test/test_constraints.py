@@ -1,10 +1,15 @@
+from contextlib import redirect_stdout
+from io import StringIO
 from lxml import etree
 import os
 import shutil
 import unittest
+from unittest import mock
 
+from pcs.cli.common.parse_args import InputModifiers
 from pcs.test.tools.assertions import (
     ac,
+    assert_xml_equal,
     AssertPcsMixin,
     console_report,
 )
@@ -23,6 +28,7 @@ from pcs.test.tools.misc import (
 )
 from pcs.test.tools.pcs_runner import pcs, PcsRunner
 
+from pcs import constraint
 from pcs.constraint import LOCATION_NODE_VALIDATION_SKIP_MSG
 
 LOCATION_NODE_VALIDATION_SKIP_WARNING = f"Warning: {LOCATION_NODE_VALIDATION_SKIP_MSG}\n"
@@ -3205,3 +3211,128 @@ class BundleTicket(Bundle):
             "Warning: R is a bundle resource, you should use the bundle id: B "
                 "when adding constraints\n"
         )
+
+
+class CibRemoveConstraint(unittest.TestCase):
+    def setUp(self):
+        self.constraints_el = etree.fromstring("""
+            <constraints>
+                <rsc_location id="L1" rsc="A" node="n1" score="10"/>
+                <rsc_location id="L2" rsc="A">
+                    <rule id="L2-rule1" score="10">
+                        <expression id="L2-rule1-expr" attribute="#uname"
+                            operation="eq" value="n1"
+                        />
+                    </rule>
+                    <rule id="L2-rule2" score="10">
+                        <expression id="L2-rule2-expr" attribute="#uname"
+                            operation="eq" value="n2"
+                        />
+                    </rule>
+                </rsc_location>
+            </constraints>
+        """)
+
+    def assert_constraint_ids(self, id_list):
+        self.assertEqual(
+            id_list,
+            [el.get("id") for el in self.constraints_el]
+        )
+
+    def test_remove_constraint(self):
+        self.assertTrue(
+            constraint.cib_remove_constraint(self.constraints_el, "L1")
+        )
+        self.assert_constraint_ids(["L2"])
+
+    def test_remove_rules(self):
+        self.assertTrue(
+            constraint.cib_remove_constraint(self.constraints_el, "L2-rule1")
+        )
+        self.assert_constraint_ids(["L1", "L2"])
+        self.assertTrue(
+            constraint.cib_remove_constraint(self.constraints_el, "L2-rule2")
+        )
+        self.assert_constraint_ids(["L1"])
+
+    def test_not_found(self):
+        self.assertFalse(
+            constraint.cib_remove_constraint(self.constraints_el, "L3")
+        )
+        self.assert_constraint_ids(["L1", "L2"])
+
+
+@mock.patch("pcs.utils.replace_cib_configuration")
+@mock.patch("pcs.utils.get_cib")
+class ConstraintRuleRemoveLxml(unittest.TestCase):
+    # utils.get_cib_etree returns an lxml tree, the command must work with it
+    # the same way it did with xml.etree
+    cib = """
+        <cib>
+            <configuration>
+                <resources/>
+                <constraints>
+                    <!-- comments are not elements -->
+                    <rsc_location id="L" rsc="A">
+                        <!-- comments are not elements -->
+                        <rule id="R1" score="INFINITY">
+                            <expression id="R1-e" attribute="a"
+                                operation="defined"
+                            />
+                        </rule>
+                        <rule id="R2" score="INFINITY">
+                            <expression id="R2-e" attribute="b"
+                                operation="defined"
+                            />
+                        </rule>
+                    </rsc_location>
+                </constraints>
+            </configuration>
+        </cib>
+    """
+
+    def remove(self, rule_id):
+        output = StringIO()
+        with redirect_stdout(output):
+            constraint.constraint_rule(
+                None, ["remove", rule_id], InputModifiers({})
+            )
+        return output.getvalue()
+
+    def test_remove_rule(self, mock_get_cib, mock_replace):
+        mock_get_cib.return_value = self.cib
+        self.assertEqual("Removing Rule: R1\n", self.remove("R1"))
+        cib = mock_replace.call_args[0][0]
+        self.assertIsInstance(cib, etree._Element)
+        assert_xml_equal(
+            """
+                <constraints>
+                    <rsc_location id="L" rsc="A">
+                        <rule id="R2" score="INFINITY">
+                            <expression id="R2-e" attribute="b"
+                                operation="defined"
+                            />
+                        </rule>
+                    </rsc_location>
+                </constraints>
+            """,
+            etree.tostring(cib.find("configuration/constraints")).decode()
+        )
+
+    def test_remove_last_rule(self, mock_get_cib, mock_replace):
+        mock_get_cib.return_value = self.cib.replace(
+            """
+                        <rule id="R2" score="INFINITY">
+                            <expression id="R2-e" attribute="b"
+                                operation="defined"
+                            />
+                        </rule>""",
+            ""
+        )
+        self.assertEqual("Removing Constraint: L\n", self.remove("R1"))
+        assert_xml_equal(
+            "<constraints/>",
+            etree.tostring(
+                mock_replace.call_args[0][0].find("configuration/constraints")
+            ).decode()
+        )
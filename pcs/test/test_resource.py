@@ -1,3 +1,5 @@
+from contextlib import redirect_stdout
+from io import StringIO
 from lxml import etree
 import os
 import re
@@ -6,6 +8,7 @@ import shutil
 from textwrap import dedent
 from unittest import mock, skip, TestCase
 
+from pcs.cli.common.parse_args import InputModifiers
 from pcs.test.cib_resource.common import ResourceTest
 from pcs.test.tools.assertions import (
     ac,
@@ -6243,3 +6246,70 @@ class FailcountShow(TestCase):
             operation="monitor",
             full=True
         )
+
+
+@mock.patch("pcs.utils.get_cib")
+class ResourceConfigLxml(TestCase):
+    # utils.get_cib_etree returns an lxml tree, the command must work with it
+    # the same way it did with xml.etree
+    cib = """
+        <cib>
+            <configuration>
+                <resources>
+                    <!-- comments are not resources -->
+                    <group id="G">
+                        <!-- comments are not resources -->
+                        <primitive id="A" class="ocf" provider="heartbeat"
+                            type="Dummy"
+                        >
+                            <operations>
+                                <op id="A-monitor" name="monitor"
+                                    interval="10s"
+                                />
+                            </operations>
+                        </primitive>
+                    </group>
+                    <primitive id="S" class="stonith" type="fence_xvm"/>
+                </resources>
+                <constraints/>
+            </configuration>
+        </cib>
+    """
+
+    def config(self, argv, stonith=False):
+        output = StringIO()
+        with redirect_stdout(output):
+            resource.resource_config(
+                None, argv, InputModifiers({}), stonith=stonith
+            )
+        return output.getvalue()
+
+    def test_all_resources(self, mock_get_cib):
+        mock_get_cib.return_value = self.cib
+        self.assertEqual(
+            outdent("""\
+                 Group: G
+                  Resource: A (class=ocf provider=heartbeat type=Dummy)
+                   Operations: monitor interval=10s (A-monitor)
+                """
+            ),
+            self.config([])
+        )
+
+    def test_one_resource(self, mock_get_cib):
+        mock_get_cib.return_value = self.cib
+        self.assertEqual(
+            outdent("""\
+                 Resource: A (class=ocf provider=heartbeat type=Dummy)
+                  Operations: monitor interval=10s (A-monitor)
+                """
+            ),
+            self.config(["A"])
+        )
+
+    def test_stonith(self, mock_get_cib):
+        mock_get_cib.return_value = self.cib
+        self.assertEqual(
+            " Resource: S (class=stonith type=fence_xvm)\n",
+            self.config([], stonith=True)
+        )
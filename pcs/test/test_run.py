@@ -0,0 +1,57 @@
+import subprocess
+from unittest import mock, TestCase
+
+from pcs import run
+from pcs.cli.common import completion
+
+
+CIB = """
+<cib epoch="1" num_updates="0" admin_epoch="0">
+  <configuration>
+    <nodes>
+      <node id="1" uname="node1"/>
+    </nodes>
+    <resources>
+      <primitive id="R1" class="ocf" provider="heartbeat" type="Dummy"/>
+    </resources>
+  </configuration>
+</cib>
+"""
+
+@mock.patch("pcs.run.settings.cibadmin", "/usr/sbin/cibadmin")
+@mock.patch("pcs.run.settings.completion_cib_query_timeout", 0.5)
+@mock.patch("pcs.run.subprocess.run")
+class GetCompletionWordsFromCib(TestCase):
+    def test_live_cib(self, mock_run):
+        mock_run.return_value = mock.Mock(
+            returncode=0, stdout=CIB.encode("utf-8")
+        )
+        self.assertEqual(
+            ["R1"], run._get_dynamic_completion_words(completion.RESOURCE_ID)
+        )
+        self.assertEqual(
+            ["node1"], run._get_dynamic_completion_words(completion.NODE_NAME)
+        )
+        self.assertEqual(
+            ["/usr/sbin/cibadmin", "--local", "--query"],
+            mock_run.call_args[0][0]
+        )
+        self.assertEqual(0.5, mock_run.call_args[1]["timeout"])
+
+    def test_pacemaker_error(self, mock_run):
+        mock_run.return_value = mock.Mock(returncode=1, stdout=b"")
+        self.assertEqual(
+            [], run._get_dynamic_completion_words(completion.RESOURCE_ID)
+        )
+
+    def test_pacemaker_too_slow(self, mock_run):
+        mock_run.side_effect = subprocess.TimeoutExpired("cibadmin", 0.5)
+        self.assertEqual(
+            [], run._get_dynamic_completion_words(completion.RESOURCE_ID)
+        )
+
+    def test_no_pacemaker(self, mock_run):
+        mock_run.side_effect = FileNotFoundError("cibadmin")
+        self.assertEqual(
+            [], run._get_dynamic_completion_words(completion.RESOURCE_ID)
+        )
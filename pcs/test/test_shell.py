@@ -0,0 +1,136 @@
+from contextlib import redirect_stdout
+from io import StringIO
+import json
+import sys
+from unittest import mock, TestCase
+
+from pcs import settings, shell
+
+
+class FakeCommand(object):
+    def __init__(self):
+        self.argv_list = []
+
+    def __call__(self, argv):
+        self.argv_list.append(argv)
+        if argv[0] == "fail":
+            sys.stderr.write("Error: failed\n")
+            sys.exit(1)
+        if argv[0] == "message":
+            sys.exit("Error: message")
+        if argv[0] == "bug":
+            raise Exception("bug")
+        if argv[0] == "corosync":
+            settings.corosync_conf_file = argv[1]
+        if argv[0] == "read":
+            print("read: '{0}'".format(sys.stdin.readline()))
+            return
+        print(" ".join(argv))
+
+class RunShell(TestCase):
+    def setUp(self):
+        self.command = FakeCommand()
+        self.output = StringIO()
+
+    def run_shell(self, input_text):
+        return shell.run_shell(
+            self.command,
+            StringIO(input_text),
+            self.output,
+            interactive=False,
+        )
+
+    def get_results(self):
+        return [
+            json.loads(line) for line in self.output.getvalue().splitlines()
+        ]
+
+    def test_success(self):
+        self.assertEqual(
+            0,
+            self.run_shell("resource config\n\n# comment\nstatus 'a b'\n")
+        )
+        self.assertEqual(
+            [["resource", "config"], ["status", "a b"]],
+            self.command.argv_list
+        )
+        self.assertEqual(
+            [
+                {
+                    "command": ["resource", "config"],
+                    "returncode": 0,
+                    "stdout": "resource config\n",
+                    "stderr": "",
+                },
+                {
+                    "command": ["status", "a b"],
+                    "returncode": 0,
+                    "stdout": "status a b\n",
+                    "stderr": "",
+                },
+            ],
+            self.get_results()
+        )
+
+    def test_failures(self):
+        self.assertEqual(1, self.run_shell("fail\nmessage\nbug\nstatus\n"))
+        results = self.get_results()
+        self.assertEqual(
+            [1, 1, 1, 0],
+            [result["returncode"] for result in results]
+        )
+        self.assertEqual("Error: failed\n", results[0]["stderr"])
+        self.assertEqual("Error: message\n", results[1]["stderr"])
+        self.assertIn("Exception: bug", results[2]["stderr"])
+
+    def test_exit(self):
+        self.assertEqual(0, self.run_shell("status\nexit\nstatus\n"))
+        self.assertEqual([["status"]], self.command.argv_list)
+
+    def test_nested_shell(self):
+        self.assertEqual(1, self.run_shell("shell\n"))
+        self.assertEqual([], self.command.argv_list)
+        self.assertEqual(
+            "Error: Cannot start a shell in a shell\n",
+            self.get_results()[0]["stderr"]
+        )
+
+    def test_unparsable_line(self):
+        self.assertEqual(1, self.run_shell("status 'a\n"))
+        self.assertEqual([], self.command.argv_list)
+        self.assertEqual(
+            "Error: Unable to parse command: No closing quotation\n",
+            self.get_results()[0]["stderr"]
+        )
+
+    def test_commands_do_not_read_commands(self):
+        input_stream = StringIO("read\nstatus\n")
+        with mock.patch("sys.stdin", input_stream):
+            self.assertEqual(
+                0,
+                shell.run_shell(
+                    self.command, input_stream, self.output, interactive=False
+                )
+            )
+            self.assertIs(input_stream, sys.stdin)
+        self.assertEqual([["read"], ["status"]], self.command.argv_list)
+        self.assertEqual("read: ''\n", self.get_results()[0]["stdout"])
+
+    @mock.patch("pcs.shell.settings.corosync_conf_file", "/corosync.conf")
+    def test_settings_restored(self):
+        self.run_shell("corosync /other.conf\n")
+        self.assertEqual("/corosync.conf", settings.corosync_conf_file)
+
+    def test_interactive(self):
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            exit_code = shell.run_shell(
+                self.command,
+                StringIO("status\n"),
+                self.output,
+                interactive=True,
+            )
+        self.assertEqual(0, exit_code)
+        self.assertEqual([["status"]], self.command.argv_list)
+        self.assertEqual("status\n", stdout.getvalue())
+        self.assertEqual("pcs> pcs> \n", self.output.getvalue())
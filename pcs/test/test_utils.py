@@ -9,6 +9,7 @@ from pcs.test.tools.xml import dom_get_child_elements
 from pcs.test.tools.misc import get_test_resource as rc
 
 from pcs import utils
+from pcs.cli.common import lxml_dom
 
 cib_with_nodes = rc("cib-empty-withnodes.xml")
 empty_cib = rc("cib-empty.xml")
@@ -1884,3 +1885,64 @@ class TouchCibFile(TestCase):
         err.assert_called_once_with(
             "Unable to write to file: '/fake/filename': 'some message'"
         )
+
+
+@mock.patch("pcs.utils.host.get_known_hosts_file_path", lambda: "/known")
+@mock.patch("pcs.utils.host.read_known_hosts_file")
+class ReadKnownHostsFile(TestCase):
+    def test_success(self, mock_read):
+        known_hosts = {"node1": mock.Mock()}
+        mock_read.return_value = mock.Mock(known_hosts=known_hosts)
+        self.assertEqual(known_hosts, utils.read_known_hosts_file())
+        mock_read.assert_called_once_with("/known")
+
+    @mock.patch("pcs.utils.print")
+    def test_parse_error(self, mock_print, mock_read):
+        mock_read.side_effect = ValueError("invalid")
+        self.assertEqual({}, utils.read_known_hosts_file())
+        mock_print.assert_called_once_with(
+            "Warning: Unable to parse known host file."
+        )
+
+    @mock.patch("pcs.utils.print")
+    def test_read_error(self, mock_print, mock_read):
+        mock_read.side_effect = EnvironmentError(13, "Permission denied", "/k")
+        self.assertEqual({}, utils.read_known_hosts_file())
+        mock_print.assert_called_once_with(
+            "Warning: Unable to read known host file: Permission denied: '/k'"
+        )
+
+
+class DoesIdExistLxml(TestCase):
+    cib = """
+        <cib>
+            <configuration>
+                <resources>
+                    <group id="G">
+                        <primitive id="A"/>
+                    </group>
+                </resources>
+            </configuration>
+            <status>
+                <node_state id="S"/>
+            </status>
+        </cib>
+    """
+
+    def test_lxml_dom(self):
+        dom = lxml_dom.parse_string(self.cib)
+        for element in (dom, dom.getElementsByTagName("group")[0]):
+            self.assertTrue(utils.does_id_exist(element, "G"))
+            self.assertTrue(utils.does_id_exist(element, "A"))
+            self.assertFalse(utils.does_id_exist(element, "S"))
+            self.assertFalse(utils.does_id_exist(element, "X"))
+
+    def test_not_a_cib(self):
+        dom = lxml_dom.parse_string('<resources><group id="G"/></resources>')
+        self.assertTrue(utils.does_id_exist(dom, "G"))
+        self.assertFalse(utils.does_id_exist(dom, "X"))
+
+    def test_find_unique_id(self):
+        dom = lxml_dom.parse_string(self.cib)
+        self.assertEqual("A-1", utils.find_unique_id(dom, "A"))
+        self.assertEqual("S", utils.find_unique_id(dom, "S"))
@@ -47,7 +47,7 @@ def patch_env(call_queue, config, init_env):
     mock_communicator_factory = mock.Mock(spec_set=NodeCommunicatorFactory)
     mock_communicator_factory.get_communicator = (
         # TODO: use request_timeout
-        lambda request_timeout=None:
+        lambda request_timeout=None, retry_unreachable=False:
             NodeCommunicator(call_queue) if not config.spy
             else spy.NodeCommunicator(get_node_communicator())
     )
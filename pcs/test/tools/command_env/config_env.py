@@ -1,3 +1,4 @@
+from pcs.test.tools.command_env.config_runner_cib import get_loaded_cib
 from pcs.test.tools.command_env.mock_push_cib import Call as PushCibCall
 from pcs.test.tools.command_env.mock_push_corosync_conf import (
     Call as PushCorosyncConfCall,
@@ -103,7 +104,7 @@ class EnvConfig(object):
             here)
         """
         cib_xml = modify_cib(
-            self.__calls.get(load_key).stdout,
+            get_loaded_cib(self.__calls.get(load_key)),
             modifiers,
             **modifier_shortcuts
         )
@@ -1,13 +1,22 @@
+from lxml import etree
+
 from pcs.test.tools.command_env.mock_runner import(
     Call as RunnerCall,
     create_check_stdin_xml,
 )
 from pcs.test.tools.fixture_cib import modify_cib
 from pcs.test.tools.misc import get_test_resource as rc
+from pcs.test.tools.xml import etree_to_str
 
 
 CIB_FILENAME = "cib-empty.xml"
 
+def get_loaded_cib(load_call):
+    """
+    Return the CIB loaded by a call created by CibShortcuts.load
+    """
+    return getattr(load_call, "loaded_cib", load_call.stdout)
+
 
 class CibShortcuts(object):
     def __init__(self, calls):
@@ -25,6 +34,7 @@ class CibShortcuts(object):
         before=None,
         returncode=0,
         stderr=None,
+        scope_list=None,
         **modifier_shortcuts
     ):
         """
@@ -35,6 +45,9 @@ class CibShortcuts(object):
             returns new etree.Element with desired modification.
         string filename -- points to file with cib in the content
         string before -- key of call before which this new call is to be placed
+        iterable scope_list -- load only these sections of the cib element, the
+            cib element is loaded by the call with the key name, the sections
+            by calls with keys name.section
         dict modifier_shortcuts -- a new modifier is generated from each
             modifier shortcut.
             As key there can be keys of MODIFIER_GENERATORS.
@@ -65,9 +78,35 @@ class CibShortcuts(object):
                 **modifier_shortcuts
             )
             call = RunnerCall(command, stdout=cib)
+            if scope_list:
+                self.__place_scoped_load(name, cib, scope_list, before)
+                return
 
         self.__calls.place(name, call, before=before)
 
+    def __place_scoped_load(self, name, cib, scope_list, before):
+        cib_el = etree.fromstring(cib)
+        root_el = etree.Element(cib_el.tag, cib_el.attrib)
+        call = RunnerCall(
+            "cibadmin --local --query --xpath=/cib --no-children",
+            stdout=etree_to_str(root_el),
+        )
+        section_call_list = []
+        for scope in scope_list:
+            section_el = cib_el.find(scope)
+            root_el.append(etree.fromstring(etree_to_str(section_el)))
+            section_call_list.append((
+                "{0}.{1}".format(name, scope),
+                RunnerCall(
+                    "cibadmin --local --query --scope={0}".format(scope),
+                    stdout=etree_to_str(section_el),
+                )
+            ))
+        call.loaded_cib = etree_to_str(root_el)
+        self.__calls.place(name, call, before=before)
+        for section_name, section_call in section_call_list:
+            self.__calls.place(section_name, section_call, before=before)
+
     def load_content(
         self,
         cib,
@@ -124,7 +163,7 @@ class CibShortcuts(object):
             here)
         """
         cib = modify_cib(
-            self.__calls.get(load_key).stdout,
+            get_loaded_cib(self.__calls.get(load_key)),
             modifiers,
             **modifier_shortcuts
         )
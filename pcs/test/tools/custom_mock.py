@@ -90,6 +90,9 @@ class MockCurl(object):
     def reset(self):
         self._opts = {}
 
+    def close(self):
+        pass
+
     def setopt(self, opt, val):
         if isinstance(val, list):
            # in tests we use set operations (e.g. assertLessEqual) which
@@ -1,5 +1,7 @@
 import re
 
+from pcs.cli.common import completion
+
 
 examples = ""
 def full_usage():
@@ -21,6 +23,8 @@ def full_usage():
     out += strip_extras(host([],False))
     out += strip_extras(alert([], False))
     out += strip_extras(client([], False))
+    out += strip_extras(batch([], False))
+    out += strip_extras(shell([], False))
     print(out.strip())
     print("Examples:\n" + examples.replace(" \ ",""))
 
@@ -115,6 +119,8 @@ def generate_completion_tree_from_usage():
     tree["alert"] = generate_tree(alert([], False))
     tree["booth"] = generate_tree(booth([], False))
     tree["client"] = generate_tree(client([], False))
+    tree["batch"] = generate_tree(batch([], False))
+    tree["shell"] = generate_tree(shell([], False))
     return tree
 
 def generate_tree(usage_txt):
@@ -137,14 +143,43 @@ def generate_tree(usage_txt):
             if not arg in ret_hash:
                 ret_hash[arg] = {}
             cur_hash = ret_hash[arg]
-            for arg in args:
-                if arg.startswith('[') or arg.startswith('<'):
+            index = 0
+            while index < len(args):
+                arg = args[index]
+                if arg.startswith('<') or arg.startswith('[<'):
+                    # names from the cluster can be completed here
+                    placeholder = _get_placeholder(args[index:])
+                    placeholder_key = completion.get_placeholder_key(
+                        placeholder
+                    )
+                    if not placeholder_key:
+                        break
+                    cur_hash = cur_hash.setdefault(placeholder_key, {})
+                    index += len(placeholder.split())
+                    # a placeholder directly following a completed one can be
+                    # completed as well, e.g. an agent after a resource id
+                    if index < len(args) and args[index].startswith(
+                        ('<', '[<')
+                    ):
+                        continue
+                    break
+                if arg.startswith('['):
                     break
                 if not arg in cur_hash:
                     cur_hash[arg] = {}
                 cur_hash = cur_hash[arg]
+                index += 1
     return ret_hash
 
+def _get_placeholder(arg_list):
+    # a placeholder may consist of more words, e.g. "<resource id>"
+    placeholder_part_list = []
+    for arg in arg_list:
+        placeholder_part_list.append(arg)
+        if ">" in arg:
+            break
+    return " ".join(placeholder_part_list)
+
 def main(pout=True):
     output =  """
 Usage: pcs [-f file] [-h] [commands]...
@@ -158,6 +193,9 @@ Options:
                        --full is specified.
     --request-timeout  Timeout for each outgoing request to another node in
                        seconds. Default is 60s.
+    --request-parallelism
+                       Maximal number of outgoing requests to other nodes
+                       running at once. Default is 64.
     --force            Override checks and errors, the exact behavior depends on
                        the command. WARNING: Using the --force option is
                        strongly discouraged unless you know what you are doing.
@@ -179,6 +217,8 @@ Commands:
     node        Manage cluster nodes.
     alert       Manage pacemaker alerts.
     client      Manage pcsd client configuration.
+    batch       Run several configuration commands at once.
+    shell       Run pcs commands in one session.
 """
 # Advanced usage to possibly add later
 #  --corosync_conf=<corosync file> Specify alternative corosync.conf file
@@ -202,10 +242,11 @@ Commands:
         Show options of all currently configured resources or if resource ids
         are specified show the options for the specified resource ids.
 
-    list [filter] [--nodesc]
+    list [filter] [--nodesc | --full]
         Show list of all available resource agents (if filter is provided then
         only resource agents matching the filter will be shown). If --nodesc is
-        used then descriptions of resource agents are not printed.
+        used then descriptions of resource agents are not printed. If --full is
+        used then all options of resource agents are printed as well.
 
     describe [<standard>:[<provider>:]]<type> [--full]
         Show options for the specified resource. If --full is specified, all
@@ -237,6 +278,28 @@ Commands:
                 ip=192.168.0.99 cidr_netmask=32 nic=eth2 \\
                 op monitor interval=30s
 
+    bulk-create <file> [--disabled] [--no-default-ops] [--wait[=n]]
+        Create resources described in the specified file at once. The file
+        contains a JSON array (or YAML list if python3-PyYAML is installed) of
+        objects. Each object has a key 'type' and keys specific to the type:
+          primitive: id, agent, instance_attributes, meta_attributes,
+            operations (array of objects with operation options)
+          group: id, meta_attributes, resources (array of primitives)
+          clone: meta_attributes, resource (a primitive or a group)
+          bundle: id, container_type, container_options, network_options,
+            port_map, storage_map, meta_attributes, resource (a primitive)
+        All the resources are created in one CIB change. If --disabled is
+        specified the resources are not started automatically. If
+        --no-default-ops is specified, only monitor operations are created
+        for the resources. If --wait is specified, pcs will wait up to 'n'
+        seconds for the resources to start and then return 0 if they are
+        started, or 1 if they have not yet started. If 'n' is not specified it
+        defaults to 60 minutes.
+        Example: [{"type": "primitive", "id": "VirtualIP",
+            "agent": "ocf:heartbeat:IPaddr2",
+            "instance_attributes": {"ip": "192.168.0.99"},
+            "operations": [{"name": "monitor", "interval": "30s"}]}]
+
     delete <resource id|group id|bundle id|clone id>
         Deletes the resource, group, bundle or clone (and all resources within
         the group/bundle/clone).
@@ -351,6 +414,15 @@ Commands:
     agents [standard[:provider]]
         List available agents optionally filtered by standard and provider.
 
+    metadata-cache clear
+        Remove metadata of all resource and stonith agents from the agent
+        metadata cache. Metadata are cached on the local host when they are
+        loaded for the first time and reloaded when an agent changes.
+
+    metadata-cache refresh
+        Load metadata of all resource and stonith agents available on the
+        local host to the agent metadata cache.
+
     update <resource id> [resource options] [op [<operation action>
            <operation options>]...] [meta <meta operations>...] [--wait[=n]]
         Add/Change options to specified resource, clone or multi-state
@@ -1913,10 +1985,57 @@ Commands:
         return output
 
 
+def batch(args=[], pout=True):
+    output = """
+Usage: pcs batch <file>
+Run several configuration commands at once.
+
+Commands:
+    <file> [--wait[=n]]
+        Run commands specified in a JSON file against one CIB and push the CIB
+        to the cluster once all the commands succeeded. If any of the commands
+        fails, the CIB is not changed at all. If any of the commands needs
+        a newer CIB schema, the CIB is upgraded before the commands run. The
+        file contains a list of commands, each command is an object with
+        a command name and its parameters, e.g.
+        {"command": "resource.create", "params": {...}}.
+        Commands creating and configuring resources, stonith devices,
+        constraints with sets, fencing levels, acls, alerts and defaults are
+        supported. If --wait is specified, pcs will wait up to 'n' seconds
+        for the changes to take effect and then return 0 if the changes have
+        been processed or 1 otherwise. If 'n' is not specified it defaults to
+        60 minutes.
+"""
+    if pout:
+        print(sub_usage(args, output))
+    else:
+        return output
+
+def shell(args=[], pout=True):
+    output = """
+Usage: pcs shell
+Run pcs commands in one session.
+
+Read pcs commands, one per line, without the leading 'pcs' and run them one by
+one in one pcs process. This saves the start-up of pcs for each command and
+lets the commands share cached data such as known hosts and the CIB. If the
+input is a terminal, prompt for commands. Otherwise print a JSON object with
+the command, its return code, standard output and standard error output on one
+line for each command. Commands are given an empty standard input in that
+case, so they cannot prompt for anything. End the session by 'exit', 'quit' or
+end of the input. Return 0 if all the commands succeeded or 1 otherwise.
+"""
+    if pout:
+        print(sub_usage(args, output))
+    else:
+        return output
+
+
 def show(main_usage_name, rest_usage_names):
     usage_map = {
         "acl": acl,
         "alert": alert,
+        "batch": batch,
         "booth": booth,
         "client": client,
         "cluster": cluster,
@@ -1929,6 +2048,7 @@ def show(main_usage_name, rest_usage_names):
         "qdevice": qdevice,
         "quorum": quorum,
         "resource": resource,
+        "shell": shell,
         "status": status,
         "stonith": stonith,
     }
@@ -2,7 +2,6 @@ import os
 import sys
 import subprocess
 import xml.dom.minidom
-from xml.dom.minidom import parseString
 import xml.etree.ElementTree as ET
 import re
 import json
@@ -20,14 +19,18 @@ from functools import lru_cache
 from pcs import settings, usage
 
 from pcs.common import (
+    host,
     pcs_pycurl as pycurl,
     report_codes,
 )
-from pcs.common.host import PcsKnownHost
-from pcs.common.tools import join_multilines
+from pcs.common.tools import (
+    format_environment_error,
+    join_multilines,
+)
 
 from pcs.cli.common import (
     console_report,
+    lxml_dom,
     middleware,
 )
 from pcs.cli.common.env_cli import Env
@@ -58,6 +61,7 @@ from pcs.lib.external import (
 )
 import pcs.lib.corosync.config_parser as corosync_conf_parser
 from pcs.lib.corosync.config_facade import ConfigFacade as corosync_conf_facade
+from pcs.lib.pacemaker import cib_cache
 from pcs.lib.pacemaker.live import has_wait_for_idle_support
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.pacemaker.values import(
@@ -69,6 +73,8 @@ from pcs.lib.pacemaker.values import(
 
 from urllib.parse import urlencode
 
+from lxml import etree
+
 
 # usefile & filename variables are set in pcs module
 usefile = False
@@ -252,25 +258,17 @@ def read_known_hosts_file():
     """
     Commandline options: no options
     """
-    output, retval = run_pcsdcli("read_known_hosts")
-    data = {}
-    if (
-        retval == 0
-        and
-        output['status'] == 'ok'
-        and
-        output['data']
-        and
-        output['data'].get('known_hosts')
-    ):
-        try:
-            data = {
-                name: PcsKnownHost.from_known_host_file_dict(name, host)
-                for name, host in output['data']['known_hosts'].items()
-            }
-        except KeyError:
-            print("Warning: Unable to parse known host file.")
-    return data
+    try:
+        return host.read_known_hosts_file(
+            host.get_known_hosts_file_path()
+        ).known_hosts
+    except EnvironmentError as e:
+        print("Warning: Unable to read known host file: {0}".format(
+            format_environment_error(e)
+        ))
+    except ValueError:
+        print("Warning: Unable to parse known host file.")
+    return {}
 
 def repeat_if_timeout(send_http_request_function, repeat_count=15):
     """
@@ -481,9 +479,10 @@ def sendHTTPRequest(
     handler.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handler.setopt(pycurl.URL, url.encode("utf-8"))
     handler.setopt(pycurl.WRITEFUNCTION, output.write)
-    handler.setopt(pycurl.VERBOSE, 1)
     handler.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
-    handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if "--debug" in pcs_options:
+        handler.setopt(pycurl.VERBOSE, 1)
+        handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handler.setopt(pycurl.TIMEOUT_MS, int(timeout * 1000))
     handler.setopt(pycurl.SSL_VERIFYHOST, 0)
     handler.setopt(pycurl.SSL_VERIFYPEER, 0)
@@ -1315,7 +1314,7 @@ def dom_get_parent_by_tag_names(dom_el, tag_names):
     """
     parent = dom_el.parentNode
     while parent:
-        if not isinstance(parent, xml.dom.minidom.Element):
+        if parent.nodeType != xml.dom.minidom.Node.ELEMENT_NODE:
             return None
         if parent.tagName in tag_names:
             return parent
@@ -1477,6 +1476,15 @@ def get_cib(scope=None):
     Commandline options:
       * -f - CIB file
     """
+    # only the whole CIB is cached, scopes do not contain the CIB version
+    cache = (
+        None if scope or usefile else cib_cache.get_cache(os.environ)
+    )
+    if cache is not None:
+        cib_user = os.environ.get("CIB_user")
+        output = cache.get(cib_user, get_cib_identity)
+        if output is not None:
+            return output
     command = ["cibadmin", "-l", "-Q"]
     if scope:
         command.append("--scope=%s" % scope)
@@ -1486,26 +1494,54 @@ def get_cib(scope=None):
             err("unable to get cib, scope '%s' not present in cib" % scope)
         else:
             err("unable to get cib")
+    if cache is not None:
+        cache.put(cib_user, output)
     return output
 
+def get_cib_identity():
+    """
+    Return attributes of the cib element of the live CIB identifying its
+        content or None if they are not known
+
+    Commandline options: no options
+    """
+    output, retval = run(
+        ["cibadmin", "-l", "-Q", "--xpath=/cib", "--no-children"]
+    )
+    if retval != 0:
+        return None
+    return cib_cache.get_identity_from_xml(output)
+
+# DEPRECATED, use get_cib_etree in new code
 def get_cib_dom():
     """
+    Return the CIB as a minidom-like document backed by lxml
+
     Commandline options:
       * -f - CIB file
     """
     try:
-        dom = parseString(get_cib())
+        dom = lxml_dom.parse_string(get_cib())
         return dom
     except:
         err("unable to get cib")
 
 def get_cib_etree():
     """
+    Return the CIB as an lxml element, comments are not included
+
+    This used to return xml.etree.ElementTree.Element. The lxml element has
+    the same interface for the code using it, but it is not an instance of
+    the ElementTree class, use is_etree to recognize both of them.
+
     Commandline options:
       * -f - CIB file
     """
     try:
-        root = ET.fromstring(get_cib())
+        root = etree.fromstring(
+            get_cib().encode("utf-8"),
+            etree.XMLParser(huge_tree=True, remove_comments=True)
+        )
         return root
     except:
         err("unable to get cib")
@@ -1514,7 +1550,11 @@ def is_etree(var):
     """
     Commandline options: no options
     """
-    return var.__class__ == xml.etree.ElementTree.Element
+    return (
+        var.__class__ == xml.etree.ElementTree.Element
+        or
+        isinstance(var, etree._Element)
+    )
 
 # Replace only configuration section of cib with dom passed
 def replace_cib_configuration(dom):
@@ -1527,7 +1567,10 @@ def replace_cib_configuration(dom):
         #python 3 removed .encode() from byte strings
         #run(...) calls subprocess.Popen.communicate which calls encode...
         #so there is bytes to str conversion
-        new_dom = ET.tostring(dom).decode()
+        if isinstance(dom, etree._Element):
+            new_dom = etree.tostring(dom).decode()
+        else:
+            new_dom = ET.tostring(dom).decode()
     elif hasattr(dom, "toxml"):
         new_dom = dom.toxml()
     else:
@@ -1554,6 +1597,20 @@ def does_id_exist(dom, check_id):
     """
     # do not search in /cib/status, it may contain references to previously
     # existing and deleted resources and thus preventing creating them again
+    if lxml_dom.unwrap(dom) is not None:
+        # search the underlying lxml tree instead of wrapping all its elements
+        dom = lxml_dom.unwrap(dom)
+    if isinstance(dom, etree._Element):
+        return len(dom.xpath(
+            """
+                (
+                    /cib/*[name()!="status"]//*
+                    |
+                    /*[name()!="cib"]/descendant-or-self::*
+                )[@id=$check_id]
+            """,
+            check_id=check_id
+        )) > 0
     if is_etree(dom):
         for elem in dom.findall(str(
             '(/cib/*[name()!="status"]|/*[name()!="cib"])/*'
@@ -1563,7 +1620,7 @@ def does_id_exist(dom, check_id):
     else:
         document = (
             dom
-            if isinstance(dom, xml.dom.minidom.Document)
+            if dom.nodeType == xml.dom.minidom.Node.DOCUMENT_NODE
             else dom.ownerDocument
         )
         cib_found = False
@@ -1657,7 +1714,7 @@ def get_node_attributes(filter_node=None, filter_attr=None):
     node_config = get_cib_xpath("//nodes")
     if (node_config == ""):
         err("unable to get crm_config, is pacemaker running?")
-    dom = parseString(node_config).documentElement
+    dom = lxml_dom.parse_string(node_config).documentElement
     nas = dict()
     for node in dom.getElementsByTagName("node"):
         nodename = node.getAttribute("uname")
@@ -1712,7 +1769,7 @@ def set_cib_property(prop, value, cib_dom=None):
         crm_config = get_cib_xpath("//crm_config")
         if crm_config == "":
             err("unable to get crm_config, is pacemaker running?")
-        crm_config = parseString(crm_config).documentElement
+        crm_config = lxml_dom.parse_string(crm_config).documentElement
     else:
         document = cib_dom.getElementsByTagName("crm_config")
         if len(document) == 0:
@@ -1795,7 +1852,7 @@ def getClusterState():
     Commandline options:
       * -f - CIB file
     """
-    return parseString(getClusterStateXml())
+    return lxml_dom.parse_string(getClusterStateXml())
 
 # DEPRECATED, please use lib.pacemaker.live.get_cluster_status_xml in new code
 def getClusterStateXml():
@@ -2089,10 +2146,10 @@ def simulate_cib(cib_dom):
         transitions_file.seek(0)
         return (
             output,
-            parseString(transitions_file.read()),
-            parseString(new_cib_file.read()),
+            lxml_dom.parse_string(transitions_file.read()),
+            lxml_dom.parse_string(new_cib_file.read()),
         )
-    except (EnvironmentError, xml.parsers.expat.ExpatError) as e:
+    except (EnvironmentError, etree.XMLSyntaxError) as e:
         err("Unable to run crm_simulate:\n%s" % e)
     except xml.etree.ElementTree.ParseError as e:
         err("Unable to run crm_simulate:\n%s" % e)
@@ -2453,6 +2510,8 @@ def get_lib_env():
       * -f - CIB file
       * --corosync_conf - corosync.conf file
       * --request-timeout - timeout of HTTP requests
+      * --debug - gather debug info of HTTP requests
+      * --request-parallelism - max number of HTTP requests running at once
     """
     user = None
     groups = None
@@ -2486,8 +2545,47 @@ def get_lib_env():
         corosync_conf_data,
         known_hosts_getter=read_known_hosts_file,
         request_timeout=pcs_options.get("--request-timeout"),
+        debug=("--debug" in pcs_options),
+        request_parallelism=pcs_options.get("--request-parallelism"),
     )
 
+def get_lib_env_with_cib():
+    """
+    Return a library environment and a CIB (etree) loaded in it for modifying
+
+    Commandline options:
+      * -f - CIB file
+      * --corosync_conf - corosync.conf file
+      * --request-timeout - timeout of HTTP requests
+      * --debug - gather debug info of HTTP requests
+      * --request-parallelism - max number of HTTP requests running at once
+    """
+    lib_env = get_lib_env()
+    try:
+        return lib_env, lib_env.get_cib()
+    except LibraryError as e:
+        process_library_reports(e.args)
+
+def push_lib_env_cib(lib_env):
+    """
+    Push a CIB loaded by get_lib_env_with_cib in one step
+
+    Commandline options:
+      * -f - CIB file
+    """
+    try:
+        lib_env.push_cib()
+    except LibraryError as e:
+        process_library_reports(e.args)
+    if usefile:
+        try:
+            with open(filename, "w") as cib_file:
+                cib_file.write(lib_env.final_mocked_cib_content)
+        except EnvironmentError as e:
+            err(
+                "Unable to write to file: '{0}': '{1}'".format(filename, str(e))
+            )
+
 def get_cib_user_groups():
     """
     Commandline options: no options
@@ -2509,12 +2607,15 @@ def get_cli_env():
     Commandline options:
       * --debug
       * --request-timeout
+      * --request-parallelism
     """
     env = Env()
     env.user, env.groups = get_cib_user_groups()
     env.known_hosts_getter = read_known_hosts_file
     env.report_processor = get_report_processor()
     env.request_timeout = pcs_options.get("--request-timeout")
+    env.debug = "--debug" in pcs_options
+    env.request_parallelism = pcs_options.get("--request-parallelism")
     return env
 
 def get_middleware_factory():
@@ -2571,7 +2672,7 @@ def get_set_properties(prop_name=None, defaults=None):
     (output, retVal) = run(["cibadmin","-Q","--scope", "crm_config"])
     if retVal != 0:
         err("unable to get crm_config\n"+output)
-    dom = parseString(output)
+    dom = lxml_dom.parse_string(output)
     de = dom.documentElement
     crm_config_properties = de.getElementsByTagName("nvpair")
     for prop in crm_config_properties:
@@ -121,6 +121,7 @@ def remote(params, request, auth_user)
       :set_node_utilization => method(:set_node_utilization),
       :get_resource_agent_metadata => method(:get_resource_agent_metadata),
       :get_fence_agent_metadata => method(:get_fence_agent_metadata),
+      :get_all_agents_metadata => method(:get_all_agents_metadata),
       :manage_resource => method(:manage_resource),
       :unmanage_resource => method(:unmanage_resource),
       :create_alert => method(:create_alert),
@@ -2104,6 +2105,19 @@ def get_fence_agent_metadata(params, request, auth_user)
   return [200, stdout.join("\n")]
 end
 
+def get_all_agents_metadata(params, request, auth_user)
+  unless allowed_for_local_cluster(auth_user, Permissions::READ)
+    return 403, 'Permission denied'
+  end
+  stdout, stderr, retval = run_cmd(
+    auth_user, PCS, 'resource', 'get_all_agents_info'
+  )
+  if retval != 0
+    return [400, stderr.join("\n")]
+  end
+  return [200, stdout.join("\n")]
+end
+
 def check_sbd(param, request, auth_user)
   unless allowed_for_local_cluster(auth_user, Permissions::READ)
     return 403, 'Permission denied'
@@ -32,7 +32,7 @@ setup(
     zip_safe=False,
     entry_points={
         'console_scripts': [
-            'pcs = pcs.app:main',
+            'pcs = pcs.run:pcs',
             'pcsd = pcs.run:daemon',
             'pcs_snmp_agent = pcs.run:pcs_snmp_agent',
             'pcs_internal = pcs.pcs_internal:main',